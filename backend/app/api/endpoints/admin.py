@@ -1,11 +1,12 @@
 """
-Admin-only endpoints for user management.
+Admin-only endpoints for user management and operational metrics.
 
 Every route in this module requires the ``require_admin`` dependency,
 which ensures only authenticated admins (role='admin') can access them.
 """
 
 import logging
+from typing import Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
@@ -17,7 +18,10 @@ from app.models.auth_schemas import (
     UserPublic,
     UserUpdate,
 )
+from app.models.schemas import HttpPoolStats
 from app.services.user_manager import user_manager
+from app.services.vikunja_service import vikunja_http_pool
+from app.services.vikunja_outbox import vikunja_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +36,7 @@ def _to_public(user: User) -> UserPublic:
         role=user.role,
         created_at=user.created_at,
         is_active=user.is_active,
+        default_project_id=user.default_project_id,
     )
 
 
@@ -52,8 +57,9 @@ async def list_users():
 @router.post("/users", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
 async def create_user(payload: UserCreate):
     """Create a new user account."""
+    hashed = await user_manager.hash_password_async(payload.password)
     try:
-        user = user_manager.create_user(payload)
+        user = user_manager.create_user(payload, hashed_password=hashed)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -99,9 +105,26 @@ async def delete_user(user_id: str):
 @router.post("/users/{user_id}/reset-password", status_code=status.HTTP_200_OK)
 async def reset_password(user_id: str, payload: PasswordReset):
     """Allow an admin to set a new password for any user."""
-    if not user_manager.reset_password(user_id, payload.new_password):
+    hashed = await user_manager.hash_password_async(payload.new_password)
+    if not user_manager.reset_password(user_id, payload.new_password, hashed_password=hashed):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     return {"detail": "Password reset successfully"}
+
+
+# -----------------------------------------------------------------------
+# METRICS
+# -----------------------------------------------------------------------
+
+@router.get("/metrics/vikunja-pool", response_model=HttpPoolStats)
+async def vikunja_pool_metrics():
+    """Usage of the shared Vikunja HTTP connection pool."""
+    return vikunja_http_pool.stats()
+
+
+@router.get("/metrics/vikunja-outbox", response_model=Dict[str, int])
+async def vikunja_outbox_metrics():
+    """Queued Vikunja writes by status (pending, sending, delivered, dead)."""
+    return vikunja_outbox.stats()
@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 
 from app.core.security import create_access_token, get_current_user
 from app.models.auth_schemas import (
@@ -9,6 +9,7 @@ from app.models.auth_schemas import (
     UserLogin,
     UserPublic,
 )
+from app.services.password_hasher import LoginThrottled, login_throttle
 from app.services.user_manager import user_manager
 
 logger = logging.getLogger(__name__)
@@ -17,11 +18,27 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(payload: UserLogin):
-    """Authenticate a user and return a JWT access token."""
-    user = user_manager.get_user(payload.username)
+async def login(payload: UserLogin, request: Request):
+    """Authenticate a user and return a JWT access token.
 
-    if user is None or not user_manager.verify_password(payload.password, user.hashed_password):
+    The bcrypt check runs on the password hashing pool; attempts beyond the
+    per-username / per-client concurrency limits get 429 without hashing.
+    """
+    client = request.client.host if request.client else None
+    try:
+        with login_throttle.slot(payload.username, client):
+            user = user_manager.get_user(payload.username)
+            valid = user is not None and await user_manager.verify_password_async(
+                payload.password, user.hashed_password
+            )
+    except LoginThrottled:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent login attempts",
+            headers={"Retry-After": "1"},
+        )
+
+    if not valid:
         logger.warning("Failed login attempt for username: %s", payload.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -44,6 +61,7 @@ async def login(payload: UserLogin):
             role=user.role,
             created_at=user.created_at,
             is_active=user.is_active,
+            default_project_id=user.default_project_id,
         ),
     )
 
@@ -57,4 +75,5 @@ async def get_me(current_user: User = Depends(get_current_user)):
         role=current_user.role,
         created_at=current_user.created_at,
         is_active=current_user.is_active,
+        default_project_id=current_user.default_project_id,
     )
@@ -1,12 +1,16 @@
+import json
+import asyncio
 import logging
 from typing import List
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from app.core.security import get_current_user
 from app.models.auth_schemas import User
-from app.models.schemas import AnalysisResponse, SyncRequest, SyncResponse, SyncDetail
+from app.models.schemas import AnalysisResponse, OutboxStatus, SyncRequest, SyncResponse, SyncDetail
 from app.services.task_processor import TaskProcessor
-from app.services.vikunja_service import VikunjaService
+from app.services.vikunja_service import VikunjaService, select_project_id
 from app.services.history_manager import HistoryManager
+from app.services.vikunja_outbox import active_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +23,16 @@ history_manager = HistoryManager()
 async def analyze_meeting(
     files: List[UploadFile] = File(default=[]),
     text_context: str | None = Form(None),
+    chunked: bool | None = Form(None),
+    compress: bool | None = Form(None),
     current_user: User = Depends(get_current_user),
 ):
     """
     Analyze one or more meeting transcript/notes files and extract tasks.
     Multiple files are treated as fragments of the same meeting.
     Alternatively, raw transcript text can be pasted via text_context.
+    Long transcripts are analyzed in chunks automatically; `chunked` forces it on or off.
+    `compress` overrides the filler/duplicate pre-compression setting for this request.
     """
     try:
         has_files = bool(files and any(f.filename for f in files))
@@ -39,6 +47,8 @@ async def analyze_meeting(
         result = await processor.process_files(
             files if has_files else [],
             text_context=text_context if has_text else None,
+            chunked=chunked,
+            compress=compress,
         )
 
         # Phase 3c: Persist result (fire-and-forget, never blocks response)
@@ -53,31 +63,136 @@ async def analyze_meeting(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/analyze/stream")
+async def analyze_meeting_stream(
+    files: List[UploadFile] = File(default=[]),
+    text_context: str | None = Form(None),
+    compress: bool | None = Form(None),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Streaming variant of /analyze over Server-Sent Events.
+    Emits one `task` event per extracted task as soon as it validates, then a
+    final `summary` event with token_count and processing_time (or `error`).
+    """
+    has_files = bool(files and any(f.filename for f in files))
+    has_text = bool(text_context and text_context.strip())
+
+    if not has_files and not has_text:
+        raise HTTPException(
+            status_code=400,
+            detail="Must provide either files or text context",
+        )
+
+    async def event_stream():
+        try:
+            async for kind, payload in processor.process_files_stream(
+                files if has_files else [],
+                text_context=text_context if has_text else None,
+                compress=compress,
+            ):
+                if kind == "task":
+                    yield _sse("task", payload.model_dump())
+                    continue
+
+                try:
+                    history_manager.save(payload, owner_id=current_user.id)
+                except Exception:
+                    logger.exception("History save failed — response unaffected")
+                yield _sse("summary", {
+                    "token_count": payload.token_count,
+                    "processing_time": payload.processing_time,
+                    "file_count": payload.file_count,
+                    "file_names": payload.file_names,
+                    "task_count": len(payload.tasks),
+                    "cached": payload.cached,
+                    "compression": payload.compression.model_dump() if payload.compression else None,
+                })
+        except ValueError as e:
+            yield _sse("error", {"status": 400, "detail": str(e)})
+        except Exception as e:
+            logger.error("Streaming analysis failed", exc_info=True)
+            yield _sse("error", {"status": 500, "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.post("/sync", response_model=SyncResponse)
 async def sync_tasks(request: SyncRequest, current_user: User = Depends(get_current_user)):
     """
     Sync a list of tasks to Vikunja.
+    With the outbox enabled the tasks are queued and delivered in the background
+    (details carry outbox_id, see GET /sync/outbox); otherwise they are created
+    inline, concurrently (bounded, rate limited). Details keep request order.
+    Target project: request.project_id, else the user's default project.
     """
-    success_count = 0
-    failed_count = 0
-    details = []
+    project_id = select_project_id(request.project_id, current_user.default_project_id)
 
-    for task in request.tasks:
+    outbox = active_outbox()
+    if outbox is not None:
+        key = f"sync:{current_user.id}:{request.idempotency_key}" if request.idempotency_key else None
         try:
-            result = await vikunja_service.create_task(task, created_by=current_user.username)
-            if result:
-                success_count += 1
-                details.append(SyncDetail(title=task.title, status="success"))
-            else:
-                failed_count += 1
-                details.append(SyncDetail(title=task.title, status="error", error="Failed to create task"))
+            # SQLite write transaction: keep it off the event loop
+            ids = await asyncio.to_thread(
+                outbox.enqueue, request.tasks, project_id, created_by=current_user.username, idempotency_key=key
+            )
         except Exception as e:
-            failed_count += 1
-            details.append(SyncDetail(title=task.title, status="error", error=str(e)))
+            logger.error("Vikunja outbox enqueue failed", exc_info=True)
+            raise HTTPException(status_code=503, detail=f"Could not queue tasks: {e}")
+        return SyncResponse(
+            total=len(request.tasks),
+            success=0,
+            failed=0,
+            queued=len(ids),
+            details=[
+                SyncDetail(title=task.title, status="queued", outbox_id=entry_id)
+                for task, entry_id in zip(request.tasks, ids)
+            ],
+            project_id=project_id,
+        )
+
+    results = await vikunja_service.create_tasks(
+        request.tasks, created_by=current_user.username, project_id=project_id
+    )
+
+    details = []
+    for task, result in zip(request.tasks, results):
+        if result.ok:
+            details.append(SyncDetail(title=task.title, status="success"))
+        else:
+            details.append(SyncDetail(title=task.title, status="error", error=result.error))
 
+    success_count = sum(1 for result in results if result.ok)
     return SyncResponse(
         total=len(request.tasks),
         success=success_count,
-        failed=failed_count,
-        details=details
+        failed=len(request.tasks) - success_count,
+        details=details,
+        project_id=project_id,
     )
+
+
+@router.get("/sync/outbox", response_model=List[OutboxStatus])
+async def sync_outbox_status(
+    ids: List[int] = Query(..., description="outbox_id values returned by /sync"),
+    current_user: User = Depends(get_current_user),
+):
+    """Delivery status of queued tasks. Users only see entries they queued."""
+    outbox = active_outbox()
+    if outbox is None:
+        return []
+    entries = await asyncio.to_thread(outbox.get_many, ids)
+    if current_user.role != "admin":
+        entries = [e for e in entries if e.created_by == current_user.username]
+    return [
+        OutboxStatus(id=e.id, title=e.task.title, status=e.status, attempts=e.attempts, last_error=e.last_error)
+        for e in entries
+    ]
@@ -1,13 +1,18 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from app.core.security import get_current_user
 from app.models.auth_schemas import User
 from app.models.schemas import HistorySummary, HistoryDetail
 from app.services.history_manager import HistoryManager
+from app.services.record_index import timestamp_bound
 
 router = APIRouter()
 history_manager = HistoryManager()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 def _owner_filter(user: User) -> str | None:
     """Return owner_id for regular users, None for admins (see-all bypass)."""
@@ -15,9 +20,40 @@ def _owner_filter(user: User) -> str | None:
 
 
 @router.get("/history", response_model=List[HistorySummary])
-async def list_history(current_user: User = Depends(get_current_user)):
-    """Return lightweight summaries of all saved analyses, newest first."""
-    return history_manager.list_all(owner_id=_owner_filter(current_user))
+async def list_history(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    since: Optional[datetime] = Query(None, description="Only records at or after this date/time"),
+    until: Optional[datetime] = Query(None, description="Only records before this date/time"),
+    q: Optional[str] = Query(None, max_length=200, description="Substring of source file names and task titles"),
+    order: Literal["desc", "asc"] = "desc",
+    owner_id: Optional[str] = Query(None, description="Admins only: restrict to one owner"),
+    current_user: User = Depends(get_current_user),
+):
+    """Return one page of analysis summaries, newest first by default.
+
+    The cursor for the next page is sent in the ``X-Next-Cursor`` header
+    (absent on the last page).
+    """
+    owner = _owner_filter(current_user)
+    if owner is None:
+        owner = owner_id
+    try:
+        items, next_cursor = history_manager.list_page(
+            owner_id=owner,
+            since=timestamp_bound(since),
+            until=timestamp_bound(until),
+            query=q,
+            cursor=cursor,
+            limit=limit,
+            ascending=order == "asc",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.get("/history/{history_id}", response_model=HistoryDetail)
@@ -1,10 +1,10 @@
 import logging
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
-from app.core.security import get_current_user, decode_access_token
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from app.core.security import authenticate_token, get_current_user
 from app.models.auth_schemas import User
 from app.services.live_session import GeminiLiveSession
 from app.services.persistence_service import save_conversation
-from app.services.user_manager import user_manager
+from app.services.vikunja_outbox import active_outbox
 from app.models.schemas import (
     SaveConversationRequest,
     SaveConversationResponse,
@@ -27,16 +27,10 @@ async def _authenticate_websocket(websocket: WebSocket) -> User | None:
         logger.warning("WebSocket connection missing 'token' query parameter")
         return None
     try:
-        payload = decode_access_token(token)
-        username = payload.get("sub")
-        if not username:
-            logger.warning("WebSocket JWT missing 'sub' claim")
-            return None
-        user = user_manager.get_user(username)
-        if user is None or not user.is_active:
-            logger.warning("WebSocket JWT refers to invalid/inactive user: %s", username)
-            return None
-        return user
+        return authenticate_token(token)
+    except HTTPException as e:
+        logger.warning("WebSocket JWT rejected: %s", e.detail)
+        return None
     except Exception:
         logger.warning("WebSocket JWT validation failed", exc_info=True)
         return None
@@ -63,4 +57,6 @@ async def save_live_conversation(request: SaveConversationRequest, current_user:
         agent_type="live",
         agent_version=_LIVE_MODEL_ID,
         user_id=current_user.id,
+        default_project_id=current_user.default_project_id,
+        outbox=active_outbox(),
     )
@@ -0,0 +1,34 @@
+import logging
+from typing import List
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.endpoints.batch import vikunja_service
+from app.core.security import get_current_user
+from app.models.auth_schemas import User
+from app.models.schemas import VikunjaLabel, VikunjaProject
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/vikunja/projects", response_model=List[VikunjaProject])
+async def list_projects(current_user: User = Depends(get_current_user)):
+    """Projects the sync token can target (cached, see VIKUNJA_PROJECT_METADATA_TTL_SECONDS)."""
+    try:
+        return await vikunja_service.list_projects()
+    except httpx.HTTPError as e:
+        logger.error("Failed to list Vikunja projects: %s", e)
+        raise HTTPException(status_code=502, detail="Vikunja unavailable")
+
+
+@router.get("/vikunja/labels", response_model=List[VikunjaLabel])
+async def list_labels(current_user: User = Depends(get_current_user)):
+    """Labels visible to the sync token (account-wide in Vikunja, cached)."""
+    try:
+        return await vikunja_service.list_labels()
+    except httpx.HTTPError as e:
+        logger.error("Failed to list Vikunja labels: %s", e)
+        raise HTTPException(status_code=502, detail="Vikunja unavailable")
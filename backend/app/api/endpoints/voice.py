@@ -8,6 +8,7 @@ from app.core.security import get_current_user
 from app.models.auth_schemas import User
 from app.services.voice_service import VoiceService
 from app.services.persistence_service import save_conversation
+from app.services.vikunja_outbox import active_outbox
 from app.models.schemas import (
     SaveConversationRequest,
     SaveConversationResponse,
@@ -102,4 +103,6 @@ async def save_standard_conversation(request: SaveConversationRequest, current_u
         agent_type="standard",
         agent_version=f"{service.nlu_model} + {service.tts_model}",
         user_id=current_user.id,
+        default_project_id=current_user.default_project_id,
+        outbox=active_outbox(),
     )
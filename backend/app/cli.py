@@ -0,0 +1,191 @@
+"""
+Maintenance commands for the backend's on-disk data.
+
+Usage (from the backend directory):
+    python -m app.cli rebuild-history-index
+    python -m app.cli rebuild-conversation-index
+    python -m app.cli migrate-records [--compact] [--compression gzip] [--dry-run]
+    python -m app.cli benchmark-record-formats
+    python -m app.cli partition-records
+    python -m app.cli benchmark-login [--attempts 32] [--concurrency 8]
+    python -m app.cli import-users [--from data/users.json]
+"""
+
+import asyncio
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.conversation_manager import ConversationManager
+from app.services.history_manager import HistoryManager
+from app.services.password_hasher import PasswordHasher, benchmark_logins
+from app.services.record_codec import (
+    COMPRESSIONS,
+    RecordCodec,
+    benchmark_codecs,
+    benchmark_variants,
+    migrate_directory,
+    read_record,
+)
+from app.services.record_index import iter_record_paths, partition_directory, partition_dirs
+from app.services.user_manager import UserManager
+from app.services.user_store import SqliteUserStore, import_json_users
+
+
+def _record_dirs(which: str) -> dict:
+    dirs = {"history": HistoryManager.HISTORY_DIR, "conversations": ConversationManager.CONVERSATIONS_DIR}
+    return dirs if which == "all" else {which: dirs[which]}
+
+
+def rebuild_history_index(args: argparse.Namespace) -> int:
+    count = HistoryManager().rebuild_index()
+    print(f"History index rebuilt: {count} record(s) from {HistoryManager.HISTORY_DIR}")
+    return 0
+
+
+def rebuild_conversation_index(args: argparse.Namespace) -> int:
+    count = ConversationManager().rebuild_index()
+    print(f"Conversation index rebuilt: {count} record(s) from {ConversationManager.CONVERSATIONS_DIR}")
+    return 0
+
+
+def migrate_records(args: argparse.Namespace) -> int:
+    codec = RecordCodec(compact=args.compact, compression=args.compression, min_bytes=args.min_bytes)
+    for name, directory in _record_dirs(args.only).items():
+        reports = [migrate_directory(d, codec, dry_run=args.dry_run) for d in [directory] + partition_dirs(directory)]
+        files, rewritten, skipped, before, after = (sum(column) for column in zip(*reports))
+        verb = "would rewrite" if args.dry_run else "rewrote"
+        print(f"{name}: {files} file(s), {verb} {rewritten}, {skipped} unreadable; {before:,} -> {after:,} bytes")
+        if not args.dry_run and rewritten:
+            manager = HistoryManager() if name == "history" else ConversationManager()
+            manager.rebuild_index()
+    return 0
+
+
+def benchmark_record_formats(args: argparse.Namespace) -> int:
+    records = []
+    for directory in _record_dirs(args.only).values():
+        for path in iter_record_paths(directory):
+            try:
+                records.append(read_record(path))
+            except Exception:
+                continue
+    if not records:
+        print("No records found to benchmark.")
+        return 1
+    print(f"{len(records)} record(s), best of {args.repeat} read(s)")
+    print(f"{'format':<18} {'bytes on disk':>14} {'parse ms':>10}")
+    for row in benchmark_codecs(records, benchmark_variants(), repeat=args.repeat):
+        print(f"{row.variant:<18} {row.bytes_on_disk:>14,} {row.parse_ms:>10.2f}")
+    return 0
+
+
+def partition_records(args: argparse.Namespace) -> int:
+    for name, directory in _record_dirs(args.only).items():
+        report = partition_directory(directory)
+        print(
+            f"{name}: moved {report.moved} record(s) into owner partitions, "
+            f"{report.unowned} without owner left at the root, {report.skipped} unreadable"
+        )
+        if report.moved:
+            manager = HistoryManager() if name == "history" else ConversationManager()
+            manager.rebuild_index()
+    return 0
+
+
+def benchmark_login(args: argparse.Namespace) -> int:
+    hasher = PasswordHasher(rounds=args.rounds, max_workers=args.workers)
+    try:
+        rows = asyncio.run(benchmark_logins(hasher, attempts=args.attempts, concurrency=args.concurrency))
+    finally:
+        hasher.shutdown()
+    print(f"bcrypt cost {args.rounds}, {args.attempts} attempt(s), {args.concurrency} concurrent")
+    print(f"{'mode':<22} {'seconds':>8} {'logins/s':>9} {'max loop lag ms':>16}")
+    for row in rows:
+        print(f"{row.mode:<22} {row.seconds:>8.2f} {row.per_second:>9.1f} {row.max_loop_lag_ms:>16.1f}")
+    return 0
+
+
+def import_users(args: argparse.Namespace) -> int:
+    source = Path(args.source) if args.source else UserManager.USERS_FILE
+    if not source.exists():
+        print(f"{source} not found.")
+        return 1
+    store = SqliteUserStore(UserManager.USERS_DB)
+    try:
+        report = import_json_users(source, store)
+    finally:
+        store.close()
+    print(
+        f"Imported {report.imported} user(s) into {UserManager.USERS_DB.name}; "
+        f"{report.existing} already present, {report.invalid} invalid"
+    )
+    if settings.USER_STORE_BACKEND != "sqlite":
+        print("Set USER_STORE_BACKEND=sqlite to use it.")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "rebuild-history-index", help="Re-create data/history/_index.sqlite3 from the JSON records"
+    ).set_defaults(handler=rebuild_history_index)
+    commands.add_parser(
+        "rebuild-conversation-index", help="Re-create data/conversations/_index.sqlite3 from the JSON records"
+    ).set_defaults(handler=rebuild_conversation_index)
+
+    migrate = commands.add_parser(
+        "migrate-records", help="Re-encode history/conversation files (defaults: the RECORD_* settings)"
+    )
+    migrate.add_argument("--only", choices=("all", "history", "conversations"), default="all")
+    migrate.add_argument(
+        "--compact", action=argparse.BooleanOptionalAction, default=settings.RECORD_COMPACT_JSON,
+        help="minified JSON instead of indent=2",
+    )
+    migrate.add_argument("--compression", choices=COMPRESSIONS, default=settings.RECORD_COMPRESSION)
+    migrate.add_argument(
+        "--min-bytes", type=int, default=settings.RECORD_COMPRESSION_MIN_BYTES,
+        help="only compress records at least this large once serialized",
+    )
+    migrate.add_argument("--dry-run", action="store_true", help="report sizes without writing")
+    migrate.set_defaults(handler=migrate_records)
+
+    bench = commands.add_parser(
+        "benchmark-record-formats", help="Compare bytes on disk and parse time of the record encodings"
+    )
+    bench.add_argument("--only", choices=("all", "history", "conversations"), default="all")
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.set_defaults(handler=benchmark_record_formats)
+
+    partition = commands.add_parser(
+        "partition-records", help="Move flat history/conversation files into per-owner subdirectories"
+    )
+    partition.add_argument("--only", choices=("all", "history", "conversations"), default="all")
+    partition.set_defaults(handler=partition_records)
+
+    login = commands.add_parser(
+        "benchmark-login", help="Measure password-check throughput and event-loop lag under concurrent logins"
+    )
+    login.add_argument("--attempts", type=int, default=32)
+    login.add_argument("--concurrency", type=int, default=8)
+    login.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS, help="bcrypt cost factor")
+    login.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_MAX_WORKERS)
+    login.set_defaults(handler=benchmark_login)
+
+    users = commands.add_parser(
+        "import-users", help="Copy users.json accounts into the SQLite user store (skips existing ones)"
+    )
+    users.add_argument("--from", dest="source", help="JSON file to import (default: data/users.json)")
+    users.set_defaults(handler=import_users)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -11,11 +12,78 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "CHANGE_ME_IN_PRODUCTION"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
+    # Resolved principals per token hash, so polling endpoints skip decode + lookup
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 1024  # 0 disables the cache
+    # Password hashing: bcrypt cost factor (existing hashes keep verifying at their own cost)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_WORKERS: int = 2
+    # Concurrent password checks allowed per username / client address (0 = unlimited)
+    LOGIN_MAX_CONCURRENT_PER_USERNAME: int = 2
+    LOGIN_MAX_CONCURRENT_PER_CLIENT: int = 8
+
+    # Where accounts are stored: "json" (data/users.json) or "sqlite" (data/users.sqlite3,
+    # imported from users.json on first start; see `python -m app.cli import-users`)
+    USER_STORE_BACKEND: str = "json"
 
     # Default admin credentials (used on first startup only)
     DEFAULT_ADMIN_USERNAME: str = "admin"
     DEFAULT_ADMIN_PASSWORD: str = "admin1234"
 
+    # Batch analysis
+    ANALYSIS_MAX_CONCURRENCY: int = 2
+    # Transcripts above this estimate are analyzed map-reduce style in chunks
+    ANALYSIS_CHUNK_TOKEN_BUDGET: int = 24000
+    # Content-addressed result cache (0 entries disables it)
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 256
+    ANALYSIS_CACHE_TTL_SECONDS: int = 86400
+    # Worker threads parsing uploaded .docx/.txt/.md/.vtt files
+    EXTRACTION_MAX_WORKERS: int = 4
+    # Deterministic filler/duplicate stripping before the LLM call
+    TRANSCRIPT_COMPRESSION_ENABLED: bool = True
+    TRANSCRIPT_FILLER_WORDS: Optional[List[str]] = None  # None = built-in pt-BR list
+    # Glossary: rewrite known misspellings before prompting (off by default: short
+    # variations such as "A pena" also match ordinary speech, e.g. "vale a pena")
+    GLOSSARY_LOCAL_NORMALIZATION: bool = False
+    # Opt-in: inject only the rules whose term or variations occur verbatim in the
+    # transcript (near-miss spellings then lose their rule; no match -> full set)
+    GLOSSARY_MATCHED_RULES_ONLY: bool = False
+    # How often glossary.json is stat'ed for hand edits (saves via the API apply at once)
+    GLOSSARY_RELOAD_CHECK_SECONDS: float = 1.0
+
+    # History / conversation record files (reads accept every encoding)
+    RECORD_COMPACT_JSON: bool = False  # minified JSON instead of indent=2
+    RECORD_COMPRESSION: str = "none"  # none | gzip | zstd (zstd needs the optional 'zstandard' package)
+    RECORD_COMPRESSION_MIN_BYTES: int = 4096  # smaller records stay plain .json
+
+    # Vikunja sync
+    # Target project when neither the request nor the user's profile picks one
+    VIKUNJA_DEFAULT_PROJECT_ID: int = 2
+    # Project list, labels and the token's own user are re-fetched after this
+    VIKUNJA_PROJECT_METADATA_TTL_SECONDS: int = 600
+    VIKUNJA_SYNC_CONCURRENCY: int = 5
+    VIKUNJA_RATE_LIMIT_PER_SECOND: float = 10.0  # 0 disables rate limiting
+    # Project members are re-fetched in the background once this old
+    VIKUNJA_USER_DIRECTORY_TTL_SECONDS: int = 300
+    # Memoized assignee-name resolutions (0 disables the memo)
+    VIKUNJA_ASSIGNEE_CACHE_SIZE: int = 512
+    # Durable outbox: /sync and conversation saves queue writes, a worker delivers them
+    VIKUNJA_OUTBOX_ENABLED: bool = True
+    VIKUNJA_OUTBOX_BATCH_SIZE: int = 20
+    VIKUNJA_OUTBOX_POLL_SECONDS: float = 5.0
+    VIKUNJA_OUTBOX_MAX_ATTEMPTS: int = 8
+    VIKUNJA_OUTBOX_BACKOFF_BASE_SECONDS: float = 2.0
+    VIKUNJA_OUTBOX_BACKOFF_MAX_SECONDS: float = 600.0
+    # Remember fingerprint -> task id so retries and re-syncs never duplicate tasks
+    VIKUNJA_IDEMPOTENCY_ENABLED: bool = True
+    # Ledger entries older than this are ignored (and pruned at startup)
+    VIKUNJA_IDEMPOTENCY_TTL_SECONDS: int = 30 * 24 * 3600
+    # Shared keep-alive client opened in the app lifespan
+    VIKUNJA_HTTP_MAX_CONNECTIONS: int = 20
+    VIKUNJA_HTTP_MAX_KEEPALIVE: int = 10
+    VIKUNJA_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    VIKUNJA_HTTP2: bool = True  # only used when the optional 'h2' package is installed
+
     class Config:
         env_file = (".env", "../.env")
         extra = "ignore"
@@ -1,6 +1,10 @@
+import time
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Dict, Optional, Set, Tuple
 
 import jwt
 from fastapi import Depends, HTTPException, status
@@ -23,6 +27,77 @@ def create_access_token(data: dict[str, Any]) -> str:
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
+class PrincipalCache:
+    """Short-lived LRU of token hash -> resolved, active-checked User.
+
+    Entries expire after ``ttl_seconds`` or at the token's own ``exp``,
+    whichever comes first. Raw tokens are never stored. UserManager drops a
+    user's entries as soon as it updates, deletes or resets that user.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[User]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, user: User, token_expires_at: Optional[float] = None) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        key = self.key(token)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (expires_at, user)
+            self._by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in self._by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_user.get(entry[1].id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[entry[1].id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     """Decode and validate a JWT. Raises HTTPException on failure."""
     try:
@@ -41,14 +116,20 @@ def decode_access_token(token: str) -> dict[str, Any]:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-) -> User:
-    """FastAPI dependency — resolve the authenticated User from the Bearer token."""
+def authenticate_token(token: str) -> User:
+    """Resolve a Bearer token to its active User. Raises HTTPException (401/403) otherwise.
+
+    Served from the user manager's PrincipalCache when the same token was
+    verified moments ago; misses decode the JWT and look the user up.
+    """
     # Lazy import to avoid circular dependency at module level
     from app.services.user_manager import user_manager
 
-    payload = decode_access_token(credentials.credentials)
+    cached = user_manager.principals.get(token)
+    if cached is not None:
+        return cached
+
+    payload = decode_access_token(token)
     username: str | None = payload.get("sub")
     if username is None:
         raise HTTPException(
@@ -68,9 +149,18 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive",
         )
+    exp = payload.get("exp")
+    user_manager.principals.put(token, user, float(exp) if isinstance(exp, (int, float)) else None)
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> User:
+    """FastAPI dependency — resolve the authenticated User from the Bearer token."""
+    return authenticate_token(credentials.credentials)
+
+
 async def require_admin(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -1,11 +1,16 @@
 import os
 import logging
+from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import batch, voice, live, glossary, history, conversations, auth, admin
+from app.api.endpoints import batch, voice, live, glossary, history, conversations, auth, admin, vikunja
+from app.services.password_hasher import password_hasher
 from app.services.user_manager import user_manager
+from app.services.vikunja_service import task_ledger, vikunja_http_pool
+from app.services.vikunja_outbox import outbox_worker, vikunja_outbox
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +23,28 @@ async def lifespan(app: FastAPI):
         user_manager.ensure_admin_exists()
     except Exception:
         logger.error("Failed to bootstrap admin user", exc_info=True)
-    yield
+    # Warm the batch analysis cache from persisted history
+    try:
+        cache = batch.processor.result_cache
+        if cache.max_entries > 0:
+            since = (datetime.now() - timedelta(seconds=cache.ttl_seconds)).isoformat()
+            cache.seed_from_history(batch.history_manager.iter_recent_records(since, cache.max_entries))
+    except Exception:
+        logger.error("Failed to seed analysis cache from history", exc_info=True)
+    # One keep-alive client for all Vikunja calls
+    await vikunja_http_pool.start()
+    # Background delivery of queued Vikunja writes (see VIKUNJA_OUTBOX_ENABLED)
+    if settings.VIKUNJA_OUTBOX_ENABLED:
+        await outbox_worker.start(batch.vikunja_service)
+    try:
+        yield
+    finally:
+        await outbox_worker.stop()
+        vikunja_outbox.close()
+        task_ledger.close()
+        await vikunja_http_pool.aclose()
+        password_hasher.shutdown()
+        user_manager.close()
 
 
 app = FastAPI(
@@ -42,6 +68,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paginated listings return the next page's cursor in a header
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include Routers
@@ -53,7 +81,7 @@ app.include_router(history.router, prefix="/api/v1", tags=["History"])
 app.include_router(conversations.router, prefix="/api/v1", tags=["Conversations"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
-# app.include_router(vikunja.router, prefix="/api/v1", tags=["Vikunja"]) # Placeholder/Commented out for Phase 1
+app.include_router(vikunja.router, prefix="/api/v1", tags=["Vikunja"])
 
 @app.get("/health")
 async def health_check():
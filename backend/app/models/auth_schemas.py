@@ -30,6 +30,7 @@ class UserPublic(UserBase):
     role: str
     created_at: str
     is_active: bool = True
+    default_project_id: Optional[int] = None
 
 
 class User(UserBase):
@@ -39,6 +40,7 @@ class User(UserBase):
     role: str = "user"
     is_active: bool = True
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    default_project_id: Optional[int] = Field(None, description="Vikunja project used when a request names none")
 
 
 class UserUpdate(BaseModel):
@@ -47,6 +49,9 @@ class UserUpdate(BaseModel):
 
     role: Optional[str] = Field(None, pattern="^(admin|user)$", description="New role")
     is_active: Optional[bool] = Field(None, description="Activate / deactivate the account")
+    default_project_id: Optional[int] = Field(
+        None, description="Default Vikunja project for this user; an explicit null clears it"
+    )
 
 
 class PasswordReset(BaseModel):
@@ -12,9 +12,24 @@ class TaskBase(BaseModel):
     assignee_id: Optional[int] = Field(None, description="Vikunja User ID (resolved)")
     priority: int = Field(3, ge=1, le=5, description="Priority scale 1 to 5")
     due_date: Optional[str] = Field(None, description="ISO Format YYYY-MM-DD")
+    source_timestamp: Optional[str] = Field(None, description="Transcript offset HH:MM:SS where the task was discussed")
 
 # --- Response Models ---
 
+class ChunkReport(BaseModel):
+    index: int
+    token_count: int
+    processing_time: float
+    task_count: int
+
+class CompressionReport(BaseModel):
+    tokens_before: int
+    tokens_after: int
+    tokens_saved: int
+    fillers_removed: int = 0
+    fragments_collapsed: int = 0
+    duplicate_lines_removed: int = 0
+
 class AnalysisResponse(BaseModel):
     model_config = ConfigDict(extra='forbid')
     
@@ -23,22 +38,60 @@ class AnalysisResponse(BaseModel):
     processing_time: float
     file_count: int = 1
     file_names: List[str] = []
+    chunks: List[ChunkReport] = []  # Populated only for chunked (map-reduce) analysis
+    compression: Optional[CompressionReport] = None  # Populated when pre-compression ran
+    cached: bool = False  # True when served from the analysis result cache
+    cache_key: Optional[str] = Field(None, exclude=True)  # Internal: persisted to history for cache seeding
 
 # --- Sync Models ---
 
 class SyncRequest(BaseModel):
     tasks: List[TaskBase]
+    project_id: Optional[int] = Field(None, description="Target Vikunja project (defaults to the user's)")
+    idempotency_key: Optional[str] = Field(None, max_length=128, description="Replaying a key never queues twice")
 
 class SyncDetail(BaseModel):
     title: str
-    status: str # 'success' or 'error'
+    status: str # 'success', 'error' or 'queued'
     error: Optional[str] = None
+    outbox_id: Optional[int] = None
 
 class SyncResponse(BaseModel):
     total: int
     success: int
     failed: int
     details: List[SyncDetail]
+    project_id: Optional[int] = None
+    queued: int = 0
+
+class OutboxStatus(BaseModel):
+    id: int
+    title: str
+    status: str  # 'pending', 'sending', 'delivered' or 'dead'
+    attempts: int
+    last_error: Optional[str] = None
+
+class VikunjaProject(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+
+class VikunjaLabel(BaseModel):
+    id: int
+    title: str
+    hex_color: Optional[str] = None
+
+class HttpPoolStats(BaseModel):
+    open: bool
+    http2: bool
+    max_connections: int
+    max_keepalive_connections: int
+    connections: int = 0
+    idle_connections: int = 0
+    requests_total: int = 0
+    requests_in_flight: int = 0
+    peak_in_flight: int = 0
+    ephemeral_clients: int = 0  # per-call clients opened while the pool was closed
 
 # --- History Models ---
 
@@ -89,9 +142,11 @@ class SaveConversationRequest(BaseModel):
     transcript: List[ConversationTurn]
     task_draft: ConversationTaskDraft
     sync_to_vikunja: bool = False
+    project_id: Optional[int] = None
 
 class SaveConversationResponse(BaseModel):
     conversation_id: str
     saved: bool
     synced: bool
     sync_error: Optional[str] = None
+    queued: bool = False
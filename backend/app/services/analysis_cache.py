@@ -0,0 +1,132 @@
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from app.models.schemas import AnalysisResponse, ChunkReport, CompressionReport, TaskBase
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Content-addressed, TTL + LRU bounded cache of batch analysis results.
+
+    Keys are SHA-256 digests of everything that influences the Gemini output
+    (see ``make_key``), so re-uploading the same transcript after a failed sync
+    is answered from memory instead of paying for a new analysis.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 86400.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, AnalysisResponse]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # --- Keying ---------------------------------------------------------------
+
+    @staticmethod
+    def normalize_transcript(text: str) -> str:
+        """Collapse whitespace so re-encoded copies of the same file share a key."""
+        return "\n".join(" ".join(line.split()) for line in text.strip().splitlines() if line.strip())
+
+    @classmethod
+    def make_key(
+        cls,
+        transcript: str,
+        custom_instructions: str,
+        meeting_date: datetime,
+        glossary_version: str,
+        model_id: str,
+        chunked: bool = False,
+    ) -> str:
+        material = json.dumps(
+            [
+                cls.normalize_transcript(transcript),
+                custom_instructions.strip(),
+                meeting_date.date().isoformat(),
+                glossary_version,
+                model_id,
+                # Map-reduce results carry chunk reports; never serve one for the other
+                "chunked" if chunked else "single",
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # --- Public API -----------------------------------------------------------
+
+    def get(self, key: str) -> Optional[AnalysisResponse]:
+        """Return a deep copy of the cached response, or None if absent/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, response = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response.model_copy(deep=True)
+
+    def put(self, key: str, response: AnalysisResponse, created_at: Optional[float] = None) -> bool:
+        """Store *response*; ``created_at`` (epoch seconds) backdates the TTL for seeded entries.
+
+        Returns False when the entry was not stored (cache disabled or already expired).
+        """
+        if self.max_entries <= 0:
+            return False
+        expires_at = (created_at if created_at is not None else time.time()) + self.ttl_seconds
+        if expires_at <= time.time():
+            return False
+        self._entries[key] = (expires_at, response.model_copy(deep=True))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def seed_from_history(self, records: Iterable[dict]) -> int:
+        """Warm the cache from persisted history records that carry a ``cache_key``.
+
+        Records are replayed oldest-first so the LRU bound keeps the most recent
+        ones; records older than the TTL are skipped, and so are records saved
+        before chunk/compression reports were persisted (a hit on those would
+        lack them). Returns the number stored.
+        """
+        seeded = sorted(
+            (r for r in records if r.get("cache_key") and "chunks" in r),
+            key=lambda r: r.get("timestamp", ""),
+        )
+        count = 0
+        for record in seeded:
+            try:
+                created_at = datetime.fromisoformat(record["timestamp"]).timestamp()
+                response = AnalysisResponse(
+                    tasks=[TaskBase(**t) for t in record.get("analysis", {}).get("tasks", [])],
+                    token_count=record.get("token_count", 0),
+                    processing_time=record.get("processing_time", 0.0),
+                    file_count=record.get("file_count", 1),
+                    file_names=record.get("source_files", []),
+                    chunks=[ChunkReport(**c) for c in record["chunks"]],
+                    compression=CompressionReport(**record["compression"]) if record.get("compression") else None,
+                    cache_key=record["cache_key"],
+                )
+            except Exception:
+                logger.warning("Skipping unusable history record for cache seed: %s", record.get("id"))
+                continue
+            if self.put(record["cache_key"], response, created_at=created_at):
+                count += 1
+        count = min(count, len(self._entries))
+        logger.info("Analysis cache seeded with %d record(s)", count)
+        return count
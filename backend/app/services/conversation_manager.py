@@ -1,46 +1,45 @@
 import os
 import re
-import json
 import logging
 from pathlib import Path
 from datetime import datetime
 
+from app.services.record_codec import RecordCodec, find_record_file, read_record, record_stem
+from app.services.record_index import RecordIndex, partition_for
+
 logger = logging.getLogger(__name__)
 
 
 class ConversationManager:
-    """Persists Live Agent conversation logs to disk as JSON files."""
+    """Persists Live Agent conversation logs to disk as JSON files, one subdirectory per owner."""
 
     CONVERSATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "conversations"
 
+    def __init__(self, codec: RecordCodec | None = None):
+        self.codec = codec or RecordCodec.from_settings()
+        self._indexes: dict[Path, RecordIndex] = {}
+
     def save(self, record: dict) -> Path:
         """
         Persist a conversation record to disk.
         Returns the Path of the saved file.
         Raises on failure (caller is responsible for catching).
         """
-        os.makedirs(self.CONVERSATIONS_DIR, exist_ok=True)
+        folder = self.CONVERSATIONS_DIR / partition_for(record.get("owner_id"))
+        os.makedirs(folder, exist_ok=True)
 
-        filename = self._generate_filename(record)
-        target_path = self.CONVERSATIONS_DIR / filename
+        stem = record_stem(self._generate_filename(record))
 
         # Handle unlikely collision
-        if target_path.exists():
-            stem = target_path.stem
+        if find_record_file(folder, stem) is not None:
             for i in range(1, 100):
-                candidate = self.CONVERSATIONS_DIR / f"{stem}_{i}.json"
-                if not candidate.exists():
-                    target_path = candidate
+                if find_record_file(folder, f"{stem}_{i}") is None:
+                    stem = f"{stem}_{i}"
                     break
 
-        # Atomic write: write to .tmp then rename
-        tmp_path = target_path.with_suffix(".tmp")
-        tmp_path.write_text(
-            json.dumps(record, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-        # os.replace is atomic on Windows (Path.rename fails if target exists)
-        os.replace(tmp_path, target_path)
+        # Atomic write (encoding and suffix per RECORD_* settings)
+        target_path = self.codec.write(folder, stem, record)
+        self._index().add(record, target_path)
 
         logger.info("Conversation saved: %s", target_path.name)
         return target_path
@@ -60,55 +59,111 @@ class ConversationManager:
         cleaned = re.sub(r"_+", "_", cleaned).strip("_")
         return cleaned[:50] if cleaned else "unnamed"
 
+    @staticmethod
+    def _summarize(data: dict, path: Path) -> dict:
+        """ConversationSummary payload stored in the index."""
+        task_draft = data.get("task_draft") or {}
+        return {
+            "id": data.get("id", record_stem(path.name)),
+            "timestamp": data.get("timestamp", ""),
+            "agent_type": data.get("agent_type", "live"),
+            "synced_to_vikunja": data.get("synced_to_vikunja", False),
+            "task_title": task_draft.get("title", ""),
+            "turn_count": len(data.get("transcript", [])),
+        }
+
+    @staticmethod
+    def _search_fields(data: dict) -> list[str]:
+        """Task title, matched by the listing ``q`` filter."""
+        return [(data.get("task_draft") or {}).get("title", "")]
+
+    @staticmethod
+    def _agent_type(data: dict) -> str:
+        """Agent that produced the record, matched by the listing ``agent_type`` filter."""
+        return data.get("agent_type", "live")
+
+    def _index(self) -> RecordIndex:
+        """Summary index of the current CONVERSATIONS_DIR (tests repoint the directory)."""
+        index = self._indexes.get(self.CONVERSATIONS_DIR)
+        if index is None:
+            index = RecordIndex(self.CONVERSATIONS_DIR, self._summarize, self._search_fields, self._agent_type)
+            self._indexes[self.CONVERSATIONS_DIR] = index
+        return index
+
+    def rebuild_index(self) -> int:
+        """Re-index every conversation file from scratch. Returns the number of records indexed."""
+        return self._index().rebuild()
+
     def list_all(self, owner_id: str | None = None) -> list[dict]:
         """Return lightweight summaries of all saved conversations, newest first.
-        
+
+        Served from the summary index; record files are not opened.
+
         Args:
             owner_id: If provided, only return records belonging to this user.
                       If None, return all records (admin bypass).
         """
-        if not self.CONVERSATIONS_DIR.exists():
-            return []
-
-        items = []
-        for path in self.CONVERSATIONS_DIR.glob("*.json"):
-            try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-                if owner_id is not None and data.get("owner_id") != owner_id:
-                    continue
-                task_draft = data.get("task_draft", {})
-                items.append({
-                    "id": data.get("id", path.stem),
-                    "timestamp": data.get("timestamp", ""),
-                    "agent_type": data.get("agent_type", "live"),
-                    "synced_to_vikunja": data.get("synced_to_vikunja", False),
-                    "task_title": task_draft.get("title", ""),
-                    "turn_count": len(data.get("transcript", [])),
-                })
-            except Exception:
-                logger.warning("Skipping corrupt conversation file: %s", path.name)
-
-        items.sort(key=lambda x: x["timestamp"], reverse=True)
-        return items
+        return self._index().list(owner_id=owner_id)
+
+    def list_page(
+        self,
+        owner_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        query: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        ascending: bool = False,
+        agent_type: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Return one page of summaries and the cursor for the next page (None when done).
+
+        ``query`` matches the task title, ``agent_type`` ("live"/"standard") the
+        agent. See RecordIndex.page.
+        """
+        return self._index().page(
+            owner_id=owner_id, since=since, until=until, query=query,
+            cursor=cursor, limit=limit, ascending=ascending, kind=agent_type,
+        )
 
     def get_by_id(self, conversation_id: str, owner_id: str | None = None) -> dict | None:
         """Return full conversation JSON, or None if not found.
-        
+
+        The id -> file mapping comes from the summary index, restricted to
+        *owner_id*'s records, so only the matching file is parsed.
+
         Args:
             conversation_id: The conversation ID or filename stem to look up.
             owner_id: If provided, only return the record if it belongs to this user.
                       If None, return regardless of owner (admin bypass).
         """
-        if not self.CONVERSATIONS_DIR.exists():
+        path = self._index().find_path(conversation_id, owner_id=owner_id)
+        if path is None:
             return None
+        data = self._read(path)
+        if data is None:
+            return None
+        if owner_id is not None and data.get("owner_id") != owner_id:
+            return None
+        return data
+
+    def update(self, conversation_id: str, fields: dict) -> bool:
+        """Merge *fields* into a saved conversation (atomic rewrite). Returns False if not found."""
+        path = self._index().find_path(conversation_id)
+        if path is None:
+            return False
+        data = self._read(path)
+        if data is None:
+            return False
+        data.update(fields)
+        new_path = self.codec.write(path.parent, record_stem(path.name), data)
+        self._index().add(data, new_path)
+        return True
 
-        for path in self.CONVERSATIONS_DIR.glob("*.json"):
-            try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-                if data.get("id") == conversation_id or path.stem == conversation_id:
-                    if owner_id is not None and data.get("owner_id") != owner_id:
-                        return None
-                    return data
-            except Exception:
-                logger.warning("Skipping corrupt conversation file: %s", path.name)
-        return None
+    @staticmethod
+    def _read(path: Path) -> dict | None:
+        try:
+            return read_record(path)
+        except Exception:
+            logger.warning("Unreadable conversation file: %s", path.name)
+            return None
@@ -1,11 +1,21 @@
 import json
 import os
+import re
+import time
+import hashlib
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Distinct term selections remembered per glossary version (batch analyses
+# each match their own subset); the memo is simply reset when full
+_MAX_MEMOIZED_SUBSETS = 256
+
 # Default path: <project_root>/glossary.json (two levels up from this file)
 _DEFAULT_PATH = str(Path(__file__).resolve().parents[3] / "glossary.json")
 
@@ -20,13 +30,74 @@ SEED_DATA: Dict[str, List[str]] = {
 }
 
 
+def _copy(data: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Private copy for a snapshot, so callers keep ownership of what they pass in."""
+    return {term: list(variations) for term, variations in data.items()}
+
+
+class CompiledGlossary:
+    """One version of the glossary with everything derived from it.
+
+    ``version`` is the sha256 of the full prompt rules: equal contents give
+    equal versions across instances and restarts, so it can go straight
+    into cache keys. Rule subsets and the regex matcher are built at most
+    once per version.
+    """
+
+    def __init__(self, data: Dict[str, List[str]], signature: Optional[Tuple[int, int]]):
+        self.data = data
+        self.signature = signature
+        self.checked_at = time.monotonic()
+        self.rules = self._format(data.keys())
+        self.version = hashlib.sha256(self.rules.encode("utf-8")).hexdigest()
+        self._subsets: Dict[FrozenSet[str], str] = {}
+        self._subsets_lock = threading.Lock()
+        self._matcher: Optional[Tuple[Pattern[str], Dict[str, str]]] = None
+
+    def _format(self, terms: Iterable[str]) -> str:
+        return "\n".join(
+            f"- Se ouvir: {', '.join(self.data[term])} -> Escreva: {term}" for term in terms
+        )
+
+    def rules_for(self, terms: Iterable[str]) -> str:
+        wanted = frozenset(terms)
+        rules = self._subsets.get(wanted)
+        if rules is None:
+            rules = self._format(t for t in self.data if t in wanted)
+            with self._subsets_lock:
+                if len(self._subsets) >= _MAX_MEMOIZED_SUBSETS:
+                    self._subsets.clear()
+                self._subsets[wanted] = rules
+        return rules
+
+    def matcher(self) -> Tuple[Pattern[str], Dict[str, str]]:
+        if self._matcher is None:
+            lookup: Dict[str, str] = {}
+            for correct, variations in self.data.items():
+                for phrase in [correct, *variations]:
+                    key = phrase.strip().casefold()
+                    # First term wins when two entries share a variation
+                    if key and key not in lookup:
+                        lookup[key] = correct
+            alternation = "|".join(re.escape(k) for k in sorted(lookup, key=len, reverse=True))
+            pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE) if lookup else re.compile(r"(?!)")
+            self._matcher = (pattern, lookup)
+        return self._matcher
+
+
+# Current version per glossary file, shared by every GlossaryManager in the
+# process so a save through one (e.g. the glossary endpoint) is seen at once
+# by the others (voice, live and batch agents)
+_compiled: Dict[str, CompiledGlossary] = {}
+_compiled_lock = threading.Lock()
+
+
 class GlossaryManager:
     """Single source of truth for the phonetic glossary used by all agents."""
 
     def __init__(self, file_path: Optional[str] = None):
         self.file_path = file_path or _DEFAULT_PATH
-        self._cache: Optional[Dict[str, List[str]]] = None
-        self._mtime: float = 0.0
+        self._key = os.path.abspath(self.file_path)
 
         if not os.path.exists(self.file_path):
             os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
@@ -34,18 +105,14 @@ class GlossaryManager:
 
     # --- Public API -----------------------------------------------------------
 
+    @property
+    def version(self) -> str:
+        """Content hash of the current glossary; changes whenever any term or variation does."""
+        return self._current().version
+
     def load(self) -> Dict[str, List[str]]:
-        """Return glossary dict, reloading from disk only when the file has changed."""
-        try:
-            current_mtime = os.path.getmtime(self.file_path)
-            if self._cache is None or current_mtime != self._mtime:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
-                self._mtime = current_mtime
-            return self._cache  # type: ignore[return-value]
-        except Exception as e:
-            logger.warning("Failed to load glossary, using seed data: %s", e)
-            return dict(SEED_DATA)
+        """Return the glossary dict (shared: do not modify it; use save/add_term/remove_term)."""
+        return self._current().data
 
     def save(self, data: Dict[str, List[str]]) -> None:
         """Overwrite the entire glossary with *data* and refresh cache."""
@@ -54,34 +121,90 @@ class GlossaryManager:
     def add_term(self, term: str, variations: List[str]) -> Dict[str, List[str]]:
         """Add or update a single term. Returns the full updated glossary."""
         assert term and isinstance(variations, list), "term must be non-empty, variations must be a list"
-        data = self.load()
+        data = dict(self.load())
         data[term] = variations
         self._write(data)
         return data
 
     def remove_term(self, term: str) -> Dict[str, List[str]]:
         """Remove a term by key. Returns the full updated glossary."""
-        data = self.load()
+        data = dict(self.load())
         data.pop(term, None)
         self._write(data)
         return data
 
-    def get_prompt_rules(self) -> str:
-        """Format glossary as prompt injection rules for Gemini."""
-        data = self.load()
-        rules = []
-        for correct, variations in data.items():
-            vars_str = ", ".join(variations)
-            rules.append(f"- Se ouvir: {vars_str} -> Escreva: {correct}")
-        return "\n".join(rules)
+    def get_prompt_rules(self, terms: Optional[Iterable[str]] = None) -> str:
+        """Format glossary as prompt injection rules for Gemini (memoized per version).
+
+        Args:
+            terms: If provided, only emit rules for these canonical terms
+                   (e.g. the ones ``normalize_text`` found in a transcript).
+        """
+        compiled = self._current()
+        return compiled.rules if terms is None else compiled.rules_for(terms)
+
+    def normalize_text(self, text: str) -> Tuple[str, Set[str]]:
+        """Rewrite known misspellings to their canonical term in a single regex pass.
+
+        Matching is case-insensitive on whole words/phrases, longest variation
+        first. Returns the rewritten text and the set of canonical terms seen
+        (as a variation or already spelled correctly).
+        """
+        pattern, lookup = self._current().matcher()
+        matched: Set[str] = set()
+        if not lookup:
+            return text, matched
+
+        def replace(match: "re.Match[str]") -> str:
+            term = lookup.get(match.group(0).casefold(), match.group(0))
+            matched.add(term)
+            return term
+
+        return pattern.sub(replace, text), matched
 
     # --- Internal helpers -----------------------------------------------------
 
+    def _signature(self) -> Tuple[int, int]:
+        st = os.stat(self.file_path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _current(self) -> CompiledGlossary:
+        """The compiled glossary, re-reading the file only when it changed on disk.
+
+        Edits made outside this process (by hand) are noticed within
+        GLOSSARY_RELOAD_CHECK_SECONDS; saves through any manager immediately.
+        """
+        compiled = _compiled.get(self._key)
+        now = time.monotonic()
+        if compiled is not None and now - compiled.checked_at < settings.GLOSSARY_RELOAD_CHECK_SECONDS:
+            return compiled
+        signature: Optional[Tuple[int, int]] = None
+        try:
+            signature = self._signature()
+            if compiled is not None and signature == compiled.signature:
+                compiled.checked_at = now
+                return compiled
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                compiled = CompiledGlossary(json.load(f), signature)
+        except Exception as e:
+            if compiled is not None and compiled.signature is None and signature is None:
+                # Still missing: keep serving the fallback built last time
+                compiled.checked_at = now
+                return compiled
+            logger.warning("Failed to load glossary, using seed data: %s", e)
+            # A broken file's signature is kept, so it is not re-parsed until it changes
+            compiled = CompiledGlossary(_copy(SEED_DATA), signature)
+        with _compiled_lock:
+            _compiled[self._key] = compiled
+        return compiled
+
     def _write(self, data: Dict[str, List[str]]) -> None:
+        data = _copy(data)
         try:
             with open(self.file_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
-            self._cache = data
-            self._mtime = os.path.getmtime(self.file_path)
+            compiled = CompiledGlossary(data, self._signature())
+            with _compiled_lock:
+                _compiled[self._key] = compiled
         except Exception as e:
             logger.error("Failed to save glossary: %s", e)
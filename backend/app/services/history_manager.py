@@ -1,20 +1,25 @@
 import os
 import re
-import json
 import logging
 from pathlib import Path
 from datetime import datetime
 
 from app.models.schemas import AnalysisResponse
+from app.services.record_codec import RecordCodec, find_record_file, read_record, record_stem
+from app.services.record_index import RecordIndex, iter_record_paths, partition_for
 
 logger = logging.getLogger(__name__)
 
 
 class HistoryManager:
-    """Persists batch analysis results to disk as JSON files."""
+    """Persists batch analysis results to disk as JSON files, one subdirectory per owner."""
 
     HISTORY_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "history"
 
+    def __init__(self, codec: RecordCodec | None = None):
+        self.codec = codec or RecordCodec.from_settings()
+        self._indexes: dict[Path, RecordIndex] = {}
+
     def save(self, result: AnalysisResponse, model_used: str = "gemini-3-flash-preview", owner_id: str | None = None) -> Path:
         """
         Persist an AnalysisResponse to disk.
@@ -24,31 +29,23 @@ class HistoryManager:
         Args:
             owner_id: If provided, stored in the record for data-isolation filtering.
         """
-        os.makedirs(self.HISTORY_DIR, exist_ok=True)
-
         record = self._build_record(result, model_used)
         if owner_id is not None:
             record["owner_id"] = owner_id
-        filename = self._generate_filename(result)
-        target_path = self.HISTORY_DIR / filename
+        folder = self.HISTORY_DIR / partition_for(owner_id)
+        os.makedirs(folder, exist_ok=True)
+        stem = record_stem(self._generate_filename(result))
 
         # Handle unlikely collision
-        if target_path.exists():
-            stem = target_path.stem
+        if find_record_file(folder, stem) is not None:
             for i in range(1, 100):
-                candidate = self.HISTORY_DIR / f"{stem}_{i}.json"
-                if not candidate.exists():
-                    target_path = candidate
+                if find_record_file(folder, f"{stem}_{i}") is None:
+                    stem = f"{stem}_{i}"
                     break
 
-        # Atomic write: write to .tmp then rename
-        tmp_path = target_path.with_suffix(".tmp")
-        tmp_path.write_text(
-            json.dumps(record, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-        # os.replace is atomic on Windows (Path.rename fails if target exists)
-        os.replace(tmp_path, target_path)
+        # Atomic write (encoding and suffix per RECORD_* settings)
+        target_path = self.codec.write(folder, stem, record)
+        self._index().add(record, target_path)
 
         logger.info("History saved: %s", target_path.name)
         return target_path
@@ -74,57 +71,108 @@ class HistoryManager:
         cleaned = re.sub(r"_+", "_", cleaned).strip("_")
         return cleaned[:50] if cleaned else "unnamed"
 
+    @staticmethod
+    def _summarize(data: dict, path: Path) -> dict:
+        """Six-field HistorySummary payload stored in the index."""
+        return {
+            "id": data.get("id", record_stem(path.name)),
+            "timestamp": data.get("timestamp", ""),
+            "source_files": data.get("source_files", []),
+            "file_count": data.get("file_count", 0),
+            "task_count": len(data.get("analysis", {}).get("tasks", [])),
+            "model_used": data.get("model_used", ""),
+        }
+
+    @staticmethod
+    def _search_fields(data: dict) -> list[str]:
+        """Source file names and task titles, matched by the listing ``q`` filter."""
+        tasks = data.get("analysis", {}).get("tasks", [])
+        return list(data.get("source_files", [])) + [t.get("title", "") for t in tasks]
+
+    def _index(self) -> RecordIndex:
+        """Summary index of the current HISTORY_DIR (tests repoint the directory)."""
+        index = self._indexes.get(self.HISTORY_DIR)
+        if index is None:
+            index = RecordIndex(self.HISTORY_DIR, self._summarize, self._search_fields)
+            self._indexes[self.HISTORY_DIR] = index
+        return index
+
+    def rebuild_index(self) -> int:
+        """Re-index every history file from scratch. Returns the number of records indexed."""
+        return self._index().rebuild()
+
     def list_all(self, owner_id: str | None = None) -> list[dict]:
         """Return lightweight summaries of all saved analyses, newest first.
-        
+
+        Served from the summary index; record files are not opened.
+
         Args:
             owner_id: If provided, only return records belonging to this user.
                       If None, return all records (admin bypass).
         """
-        if not self.HISTORY_DIR.exists():
-            return []
+        return self._index().list(owner_id=owner_id)
+
+    def list_page(
+        self,
+        owner_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        query: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        ascending: bool = False,
+    ) -> tuple[list[dict], str | None]:
+        """Return one page of summaries and the cursor for the next page (None when done).
+
+        ``query`` matches source file names and task titles. See RecordIndex.page.
+        """
+        return self._index().page(
+            owner_id=owner_id, since=since, until=until, query=query,
+            cursor=cursor, limit=limit, ascending=ascending,
+        )
 
-        items = []
-        for path in self.HISTORY_DIR.glob("*.json"):
+    def iter_records(self):
+        """Yield every readable history record (full JSON), skipping corrupt files."""
+        for path in iter_record_paths(self.HISTORY_DIR):
             try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-                if owner_id is not None and data.get("owner_id") != owner_id:
-                    continue
-                items.append({
-                    "id": data.get("id", path.stem),
-                    "timestamp": data.get("timestamp", ""),
-                    "source_files": data.get("source_files", []),
-                    "file_count": data.get("file_count", 0),
-                    "task_count": len(data.get("analysis", {}).get("tasks", [])),
-                    "model_used": data.get("model_used", ""),
-                })
+                yield read_record(path)
             except Exception:
                 logger.warning("Skipping corrupt history file: %s", path.name)
-        
-        items.sort(key=lambda x: x["timestamp"], reverse=True)
-        return items
+
+    def iter_recent_records(self, since: str, limit: int):
+        """Yield the newest *limit* records saved at or after *since*, newest first.
+
+        The records are picked from the summary index, so only their files
+        are parsed, not the whole history.
+        """
+        summaries, _ = self._index().page(since=since, limit=limit)
+        for summary in summaries:
+            record = self.get_by_id(summary["id"])
+            if record is not None:
+                yield record
 
     def get_by_id(self, history_id: str, owner_id: str | None = None) -> dict | None:
         """Return full JSON content for a specific analysis, or None if not found.
-        
+
+        The id -> file mapping comes from the summary index, restricted to
+        *owner_id*'s records, so only the matching file is parsed.
+
         Args:
             history_id: The history record ID or filename stem to look up.
             owner_id: If provided, only return the record if it belongs to this user.
                       If None, return regardless of owner (admin bypass).
         """
-        if not self.HISTORY_DIR.exists():
+        path = self._index().find_path(history_id, owner_id=owner_id)
+        if path is None:
             return None
-
-        for path in self.HISTORY_DIR.glob("*.json"):
-            try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-                if data.get("id") == history_id or path.stem == history_id:
-                    if owner_id is not None and data.get("owner_id") != owner_id:
-                        return None
-                    return data
-            except Exception:
-                logger.warning("Skipping corrupt history file: %s", path.name)
-        return None
+        try:
+            data = read_record(path)
+        except Exception:
+            logger.warning("Unreadable history file: %s", path.name)
+            return None
+        if owner_id is not None and data.get("owner_id") != owner_id:
+            return None
+        return data
 
     @staticmethod
     def _build_record(result: AnalysisResponse, model_used: str) -> dict:
@@ -141,7 +189,7 @@ class HistoryManager:
         else:
             id_suffix = "unknown"
 
-        return {
+        record = {
             "id": f"{ts_prefix}-{id_suffix}",
             "timestamp": now.isoformat(),
             "source_files": result.file_names,
@@ -153,3 +201,10 @@ class HistoryManager:
                 "tasks": [t.model_dump() for t in result.tasks],
             },
         }
+        # Lets the analysis result cache be re-seeded from disk at startup,
+        # with the same chunk and compression reports a fresh run returns
+        if result.cache_key:
+            record["cache_key"] = result.cache_key
+            record["chunks"] = [c.model_dump() for c in result.chunks]
+            record["compression"] = result.compression.model_dump() if result.compression else None
+        return record
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 from datetime import datetime
 from app.services.conversation_manager import ConversationManager
-from app.services.vikunja_service import VikunjaService
+from app.services.vikunja_service import VikunjaService, select_project_id
+from app.services.vikunja_outbox import OutboxEntry, VikunjaOutbox, outbox_worker
 from app.models.schemas import (
     SaveConversationRequest,
     SaveConversationResponse,
@@ -16,6 +18,19 @@ _default_cm = ConversationManager()
 _default_vs = VikunjaService()
 
 
+def _on_outbox_result(entry: OutboxEntry, ok: bool, error: str | None) -> None:
+    """Reflect the final outbox outcome in the saved conversation record."""
+    conversation_id = entry.source.split(":", 1)[1]
+    sync_result = {"success": ok, "project_id": entry.project_id, "outbox_id": entry.id}
+    if error:
+        sync_result["error"] = error
+    if not _default_cm.update(conversation_id, {"synced_to_vikunja": ok, "sync_result": sync_result}):
+        logger.warning("Outbox delivered for unknown conversation %s", conversation_id)
+
+
+outbox_worker.add_listener("conversation", _on_outbox_result)
+
+
 def _map_draft_to_task(draft: ConversationTaskDraft) -> TaskBase:
     """Convert a ConversationTaskDraft into a TaskBase for Vikunja sync."""
     return TaskBase(
@@ -35,14 +50,20 @@ def _extract_sync_error(record: dict) -> str | None:
     return None
 
 
+def _is_queued(record: dict) -> bool:
+    return bool((record.get("sync_result") or {}).get("queued"))
+
+
 async def save_conversation(
     request: SaveConversationRequest,
     *,
     agent_type: str,
     agent_version: str,
     user_id: str | None = None,
+    default_project_id: int | None = None,
     conversation_manager: ConversationManager = _default_cm,
     vikunja_service: VikunjaService = _default_vs,
+    outbox: VikunjaOutbox | None = None,
 ) -> SaveConversationResponse:
     """
     Unified conversation persistence.
@@ -53,8 +74,11 @@ async def save_conversation(
         agent_type: "standard" or "live".
         agent_version: Model ID string(s) identifying the agent.
         user_id: Reserved for Phase 11 (auth/multi-tenancy). Stored in record when present.
+        default_project_id: The user's Vikunja project, used when the request names none.
         conversation_manager: Injectable for testing; defaults to module singleton.
         vikunja_service: Injectable for testing; defaults to module singleton.
+        outbox: When given, the task is queued for background delivery instead
+            of being created inline; the record is updated once it is delivered.
     """
     now = datetime.now()
     ts_prefix = now.strftime("%Y%m%d-%H%M%S")
@@ -79,13 +103,25 @@ async def save_conversation(
     # Sync to Vikunja if requested
     if request.sync_to_vikunja and request.task_draft.title:
         task = _map_draft_to_task(request.task_draft)
-        try:
-            success = await vikunja_service.create_task(task)
-            record["synced_to_vikunja"] = success
-            record["sync_result"] = {"success": success}
-        except Exception as e:
-            logger.error("Vikunja sync failed: %s", e, exc_info=True)
-            record["sync_result"] = {"success": False, "error": str(e)}
+        project_id = select_project_id(request.project_id, default_project_id)
+        if outbox is not None:
+            try:
+                source = f"conversation:{record['id']}"
+                [outbox_id] = await asyncio.to_thread(
+                    outbox.enqueue, [task], project_id, source=source, idempotency_key=source
+                )
+                record["sync_result"] = {"queued": True, "project_id": project_id, "outbox_id": outbox_id}
+            except Exception as e:
+                logger.error("Vikunja outbox enqueue failed: %s", e, exc_info=True)
+                record["sync_result"] = {"success": False, "error": str(e)}
+        else:
+            try:
+                success = await vikunja_service.create_task(task, project_id=project_id)
+                record["synced_to_vikunja"] = success
+                record["sync_result"] = {"success": success, "project_id": project_id}
+            except Exception as e:
+                logger.error("Vikunja sync failed: %s", e, exc_info=True)
+                record["sync_result"] = {"success": False, "error": str(e)}
 
     # Always save conversation to disk
     try:
@@ -97,6 +133,7 @@ async def save_conversation(
             saved=False,
             synced=record["synced_to_vikunja"],
             sync_error=_extract_sync_error(record),
+            queued=_is_queued(record),
         )
 
     return SaveConversationResponse(
@@ -104,4 +141,5 @@ async def save_conversation(
         saved=True,
         synced=record["synced_to_vikunja"],
         sync_error=_extract_sync_error(record),
+        queued=_is_queued(record),
     )
@@ -0,0 +1,209 @@
+import os
+import gzip
+import json
+import time
+import logging
+import importlib.util
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# zstd needs the optional 'zstandard' package (pip install zstandard)
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+# Longest first, so "x.json.gz" is not mistaken for a plain ".json" name
+_SUFFIXES: Tuple[Tuple[str, str], ...] = ((".json.zst", "zstd"), (".json.gz", "gzip"), (".json", "none"))
+_SUFFIX_BY_COMPRESSION = {compression: suffix for suffix, compression in _SUFFIXES}
+
+
+def record_stem(name: str) -> Optional[str]:
+    """Filename without its record suffix, or None when *name* is not a record file."""
+    for suffix, _ in _SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return None
+
+
+def record_files(directory: Path) -> Dict[str, Path]:
+    """Map stem -> file for every record in *directory* (missing directory -> empty)."""
+    files: Dict[str, Path] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return files
+    for entry in entries:
+        stem = record_stem(entry.name)
+        if stem is not None and entry.is_file():
+            files[stem] = Path(entry.path)
+    return files
+
+
+def find_record_file(directory: Path, stem: str) -> Optional[Path]:
+    """Existing file for *stem* in any supported encoding."""
+    for suffix, _ in _SUFFIXES:
+        path = directory / f"{stem}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def decode_record(data: bytes, name: str) -> dict:
+    """Parse the bytes of the record file called *name* (encoding taken from the suffix)."""
+    for suffix, compression in _SUFFIXES:
+        if name.endswith(suffix):
+            return json.loads(_decompress(data, compression).decode("utf-8"))
+    raise ValueError(f"Not a record file: {name}")
+
+
+def read_record(path: Path) -> dict:
+    """Read a record in any supported encoding; raises like json.loads on bad content."""
+    return decode_record(Path(path).read_bytes(), Path(path).name)
+
+
+class RecordCodec:
+    """How history and conversation records are written to disk.
+
+    The default (pretty JSON, no compression) is the original format.
+    ``compact`` drops the indentation; records whose serialized size reaches
+    ``min_bytes`` are additionally compressed and get a ``.json.gz`` /
+    ``.json.zst`` suffix. Reads dispatch on the suffix, so directories can
+    mix encodings and old files keep working.
+    """
+
+    def __init__(self, compact: bool = False, compression: str = "none", min_bytes: int = 4096):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown record compression {compression!r}; expected one of {COMPRESSIONS}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("RECORD_COMPRESSION=zstd but 'zstandard' is not installed; using gzip")
+            compression = "gzip"
+        self.compact = compact
+        self.compression = compression
+        self.min_bytes = min_bytes
+
+    @classmethod
+    def from_settings(cls) -> "RecordCodec":
+        return cls(
+            compact=settings.RECORD_COMPACT_JSON,
+            compression=settings.RECORD_COMPRESSION,
+            min_bytes=settings.RECORD_COMPRESSION_MIN_BYTES,
+        )
+
+    def encode(self, record: dict) -> Tuple[bytes, str]:
+        """Serialized bytes and the filename suffix they must be stored under."""
+        if self.compact:
+            text = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(record, ensure_ascii=False, indent=2)
+        data = text.encode("utf-8")
+        if self.compression != "none" and len(data) >= self.min_bytes:
+            return _compress(data, self.compression), _SUFFIX_BY_COMPRESSION[self.compression]
+        return data, ".json"
+
+    def write(self, directory: Path, stem: str, record: dict) -> Path:
+        """Atomically write *record* as *stem* and drop copies of it in other encodings."""
+        data, suffix = self.encode(record)
+        target = directory / f"{stem}{suffix}"
+        tmp_path = directory / f"{stem}{suffix}.tmp"
+        tmp_path.write_bytes(data)
+        # os.replace is atomic on Windows (Path.rename fails if target exists)
+        os.replace(tmp_path, target)
+        for other, _ in _SUFFIXES:
+            if other != suffix:
+                (directory / f"{stem}{other}").unlink(missing_ok=True)
+        return target
+
+
+class MigrationReport(NamedTuple):
+    files: int
+    rewritten: int
+    skipped: int  # unreadable files, left untouched
+    bytes_before: int
+    bytes_after: int
+
+
+def migrate_directory(directory: Path, codec: RecordCodec, dry_run: bool = False) -> MigrationReport:
+    """Re-encode every record in *directory* with *codec*.
+
+    Each file is rewritten atomically and its old-encoding copy removed only
+    after the new one is in place, so an interrupted run leaves every record
+    readable. With ``dry_run`` nothing is written and the report shows the
+    projected size.
+    """
+    files = rewritten = skipped = before = after = 0
+    for stem, path in sorted(record_files(directory).items()):
+        files += 1
+        raw = path.read_bytes()
+        try:
+            record = decode_record(raw, path.name)
+        except Exception:
+            logger.warning("Skipping unreadable record file: %s", path.name)
+            skipped += 1
+            continue
+        data, suffix = codec.encode(record)
+        before += len(raw)
+        after += len(data)
+        if data == raw and path.name == f"{stem}{suffix}":
+            continue
+        if not dry_run:
+            codec.write(directory, stem, record)
+        rewritten += 1
+    return MigrationReport(files, rewritten, skipped, before, after)
+
+
+class BenchmarkRow(NamedTuple):
+    variant: str
+    bytes_on_disk: int
+    parse_ms: float  # total time to decode + parse every record once (best of the repeats)
+
+
+def benchmark_codecs(records: List[dict], variants: Iterable[Tuple[str, RecordCodec]], repeat: int = 5) -> List[BenchmarkRow]:
+    """Encode *records* with each codec and time reading them back."""
+    rows: List[BenchmarkRow] = []
+    for label, codec in variants:
+        encoded = []
+        for record in records:
+            data, suffix = codec.encode(record)
+            encoded.append((data, f"r{suffix}"))
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            for data, name in encoded:
+                decode_record(data, name)
+            best = min(best, time.perf_counter() - start)
+        rows.append(BenchmarkRow(label, sum(len(d) for d, _ in encoded), best * 1000))
+    return rows
+
+
+def benchmark_variants() -> List[Tuple[str, RecordCodec]]:
+    """The encodings compared by ``python -m app.cli benchmark-record-formats``."""
+    variants = [
+        ("json (indent=2)", RecordCodec()),
+        ("json (compact)", RecordCodec(compact=True)),
+        ("gzip (compact)", RecordCodec(compact=True, compression="gzip", min_bytes=0)),
+    ]
+    if ZSTD_AVAILABLE:
+        variants.append(("zstd (compact)", RecordCodec(compact=True, compression="zstd", min_bytes=0)))
+    return variants
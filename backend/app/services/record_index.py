@@ -0,0 +1,422 @@
+import os
+import re
+import json
+import base64
+import hashlib
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.services.record_codec import find_record_file, read_record, record_files, record_stem
+
+logger = logging.getLogger(__name__)
+
+# Lives next to the JSON records; record suffixes never match it
+INDEX_FILENAME = "_index.sqlite3"
+
+# Record JSON + its file path -> the summary dict returned by list endpoints
+Summarizer = Callable[[dict, Path], dict]
+# Record JSON -> the strings the ``q`` filter of a listing matches against
+SearchFields = Callable[[dict], Iterable[str]]
+# Record JSON -> the value the ``kind`` filter of a listing matches exactly
+KindOf = Callable[[dict], Optional[str]]
+
+
+# Sentinel for "refresh every partition" (admin queries); None means ownerless
+_ALL = object()
+
+
+def partition_for(owner_id: str | None) -> str:
+    """Subdirectory holding *owner_id*'s records ("" = the root, for ownerless records).
+
+    User ids are UUIDs and map to themselves; anything else is sanitized and
+    suffixed with a short hash so two ids can never share a partition.
+    """
+    if not owner_id:
+        return ""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", owner_id)[:64]
+    if safe != owner_id or safe.startswith("_"):
+        safe = f"{safe}-{hashlib.sha1(owner_id.encode('utf-8')).hexdigest()[:8]}"
+    return safe
+
+
+def partition_dirs(directory: Path) -> List[Path]:
+    """Owner partitions present under *directory*."""
+    try:
+        return sorted(Path(e.path) for e in os.scandir(directory) if e.is_dir())
+    except FileNotFoundError:
+        return []
+
+
+def iter_record_paths(directory: Path) -> Iterator[Path]:
+    """Every record file: legacy/ownerless ones at the root, then each partition's."""
+    for folder in [Path(directory)] + partition_dirs(directory):
+        yield from record_files(folder).values()
+
+
+def encode_cursor(timestamp: str, key: str) -> str:
+    """Opaque keyset cursor pointing just past the row (timestamp, key)."""
+    raw = json.dumps([timestamp, key], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor; raises ValueError on anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, key = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(timestamp, str) or not isinstance(key, str):
+        raise ValueError("Invalid cursor")
+    return timestamp, key
+
+
+def timestamp_bound(value: datetime | None) -> str | None:
+    """Render a date filter comparable with stored timestamps (naive local ISO strings)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _partition_of(rel_path: str) -> str:
+    return rel_path.split("/", 1)[0] if "/" in rel_path else ""
+
+
+def _like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class RecordIndex:
+    """SQLite summary index over a directory of JSON records.
+
+    Records live in per-owner partitions (``<directory>/<partition_for(owner)>/``);
+    ownerless and not yet migrated records sit at the root. One index covers
+    the whole tree. Listing reads pre-built summaries through the
+    (owner_id, timestamp) index and lookups by id or filename stem are a
+    B-tree probe, so neither parses record files. ``page`` walks the
+    (timestamp, path) order with a keyset cursor, so every page costs the
+    same however deep it is.
+
+    The JSON files stay the source of truth: the index is derived data,
+    rebuilt from scratch when its schema version changes and reconciled per
+    partition whenever that directory's mtime moves (files added or removed
+    by another process, a restore, a manual copy). A query scoped to one
+    owner only checks the root and that owner's partition.
+    """
+
+    SCHEMA_VERSION = 5
+
+    def __init__(
+        self,
+        directory: Path,
+        summarize: Summarizer,
+        search_fields: SearchFields | None = None,
+        kind_of: KindOf | None = None,
+    ):
+        self.directory = Path(directory)
+        self.db_path = self.directory / INDEX_FILENAME
+        self._summarize = summarize
+        self._search_fields = search_fields
+        self._kind_of = kind_of
+        self._conn: Optional[sqlite3.Connection] = None
+        # Partition ("" = root) -> directory mtime_ns at its last reconcile
+        self._seen_mtime: Dict[str, int] = {}
+        # Unparseable files (relative path) -> their mtime_ns, re-read only once rewritten
+        self._unreadable: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    # --- Connection / freshness ------------------------------------------------
+
+    def _connect(self, owner_id=_ALL) -> Optional[sqlite3.Connection]:
+        """Open the index and pick up out-of-band changes visible to *owner_id*.
+
+        Returns None without a record directory.
+        """
+        if self._open() is not None:
+            self._refresh(owner_id)
+        return self._conn
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        """Open (or create) the index; None when the record directory does not exist."""
+        if self._conn is None:
+            if not self.directory.is_dir():
+                return None
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                conn.executescript(
+                    f"""
+                    DROP TABLE IF EXISTS records;
+                    CREATE TABLE records (
+                        path TEXT PRIMARY KEY,
+                        partition TEXT NOT NULL,
+                        stem TEXT NOT NULL,
+                        id TEXT NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        owner_id TEXT,
+                        search_text TEXT NOT NULL DEFAULT '',
+                        kind TEXT,
+                        summary TEXT NOT NULL
+                    );
+                    CREATE INDEX records_partition ON records (partition);
+                    CREATE INDEX records_stem ON records (stem);
+                    CREATE INDEX records_id ON records (id);
+                    CREATE INDEX records_ts ON records (timestamp, path);
+                    CREATE INDEX records_owner_ts ON records (owner_id, timestamp, path);
+                    PRAGMA user_version = {self.SCHEMA_VERSION};
+                    """
+                )
+            self._conn = conn
+        return self._conn
+
+    def _refresh(self, owner_id=_ALL) -> None:
+        # The root holds ownerless/legacy records and is where new partitions appear
+        partitions = [""]
+        if owner_id is _ALL:
+            on_disk = [p.name for p in partition_dirs(self.directory)]
+            partitions += on_disk
+            self._drop_missing_partitions(on_disk)
+        elif owner_id:
+            partitions.append(partition_for(owner_id))
+        for partition in partitions:
+            self._refresh_partition(partition)
+
+    def _refresh_partition(self, partition: str) -> None:
+        folder = self.directory / partition if partition else self.directory
+        try:
+            mtime = folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._seen_mtime.get(partition):
+            self._reconcile(partition, folder)
+            self._seen_mtime[partition] = mtime
+
+    def _drop_missing_partitions(self, on_disk: List[str]) -> None:
+        indexed = {row[0] for row in self._conn.execute("SELECT DISTINCT partition FROM records")}
+        for partition in indexed - set(on_disk) - {""}:
+            self._conn.execute("DELETE FROM records WHERE partition = ?", (partition,))
+            self._seen_mtime.pop(partition, None)
+
+    def _relative(self, path: Path) -> Tuple[str, str]:
+        """(partition, path relative to the index directory) for a record file."""
+        partition = "" if path.parent == self.directory else path.parent.name
+        return partition, f"{partition}/{path.name}" if partition else path.name
+
+    def _reconcile(self, partition: str, folder: Path) -> None:
+        """Index new (or re-encoded) files of one partition and drop rows whose file is gone."""
+        on_disk = {self._relative(p)[1]: p for p in record_files(folder).values()}
+        indexed = {row[0] for row in self._conn.execute("SELECT path FROM records WHERE partition = ?", (partition,))}
+        gone = indexed - set(on_disk)
+        new = sorted(set(on_disk) - indexed)
+        if gone:
+            self._conn.executemany("DELETE FROM records WHERE path = ?", [(p,) for p in gone])
+        for rel in [r for r in self._unreadable if _partition_of(r) == partition and r not in on_disk]:
+            del self._unreadable[rel]
+        for rel in new:
+            path = on_disk[rel]
+            try:
+                mtime = path.stat().st_mtime_ns
+                if self._unreadable.get(rel) == mtime:
+                    continue
+                record = read_record(path)
+            except Exception:
+                logger.warning("Skipping corrupt record file: %s", rel)
+                try:
+                    self._unreadable[rel] = path.stat().st_mtime_ns
+                except OSError:
+                    pass
+                continue
+            self._unreadable.pop(rel, None)
+            self._upsert(record, path)
+        if gone or new:
+            logger.info("Record index %s/%s: +%d / -%d", self.directory.name, partition, len(new), len(gone))
+
+    def _upsert(self, record: dict, path: Path) -> None:
+        partition, rel = self._relative(path)
+        stem = record_stem(path.name) or path.stem
+        summary = self._summarize(record, path)
+        search_text = ""
+        if self._search_fields is not None:
+            search_text = "\n".join(str(v) for v in self._search_fields(record) if v).casefold()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO records"
+            " (path, partition, stem, id, timestamp, owner_id, search_text, kind, summary)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                rel,
+                partition,
+                stem,
+                summary.get("id") or stem,
+                summary.get("timestamp") or "",
+                record.get("owner_id"),
+                search_text,
+                self._kind_of(record) if self._kind_of is not None else None,
+                json.dumps(summary, ensure_ascii=False),
+            ),
+        )
+        # A re-encoded record (".json" -> ".json.gz") replaces its old row
+        self._conn.execute(
+            "DELETE FROM records WHERE partition = ? AND stem = ? AND path != ?", (partition, stem, rel)
+        )
+
+    # --- Public API -------------------------------------------------------------
+
+    def add(self, record: dict, path: Path) -> None:
+        """Index a record just written by this process (before reconciling, so it is not re-read)."""
+        with self._lock:
+            if self._open() is not None:
+                self._upsert(record, path)
+                self._refresh_partition(self._relative(path)[0])
+
+    def rebuild(self) -> int:
+        """Drop every row and re-index all files. Returns the number indexed."""
+        with self._lock:
+            if self._open() is None:
+                return 0
+            self._conn.execute("DELETE FROM records")
+            self._seen_mtime.clear()
+            self._unreadable.clear()
+            self._refresh()
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def list(self, owner_id: str | None = None) -> List[Dict]:
+        """Summaries newest first, optionally restricted to one owner."""
+        with self._lock:
+            conn = self._connect(_ALL if owner_id is None else owner_id)
+            if conn is None:
+                return []
+            if owner_id is None:
+                rows = conn.execute("SELECT summary FROM records ORDER BY timestamp DESC, path DESC")
+            else:
+                rows = conn.execute(
+                    "SELECT summary FROM records WHERE owner_id = ? ORDER BY timestamp DESC, path DESC",
+                    (owner_id,),
+                )
+            return [json.loads(r[0]) for r in rows]
+
+    def page(
+        self,
+        owner_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        query: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        ascending: bool = False,
+        kind: str | None = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """One page of summaries plus the cursor of the next page (None on the last one).
+
+        ``since`` is inclusive and ``until`` exclusive, both compared against the
+        stored ISO timestamps. ``query`` is a case-insensitive substring match
+        over the record's search fields and its id; ``kind`` an exact match on
+        the ``kind_of`` value. Raises ValueError for a bad cursor.
+        """
+        clauses: List[str] = []
+        params: List = []
+        if owner_id is not None:
+            clauses.append("owner_id = ?")
+            params.append(owner_id)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if query and query.strip():
+            clauses.append("(search_text LIKE ? ESCAPE '\\' OR id LIKE ? ESCAPE '\\')")
+            params.extend([_like_pattern(query.strip().casefold())] * 2)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if cursor:
+            clauses.append(f"(timestamp, path) {'>' if ascending else '<'} (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        direction = "ASC" if ascending else "DESC"
+        sql = "SELECT timestamp, path, summary FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY timestamp {direction}, path {direction} LIMIT ?"
+        # One extra row tells us whether another page exists
+        params.append(limit + 1)
+
+        with self._lock:
+            conn = self._connect(_ALL if owner_id is None else owner_id)
+            if conn is None:
+                return [], None
+            rows = conn.execute(sql, params).fetchall()
+        next_cursor = encode_cursor(rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+        return [json.loads(r[2]) for r in rows[:limit]], next_cursor
+
+    def find_path(self, record_id: str, owner_id: str | None = None) -> Optional[Path]:
+        """File holding the record whose id or filename stem is *record_id*.
+
+        A stem probe, then the id index; no file is opened unless a partition
+        changed since the last call. With *owner_id*, only that owner's
+        records match and only their partition is checked for changes.
+        """
+        owner_clause = "" if owner_id is None else " AND owner_id = ?"
+        owner_params = () if owner_id is None else (owner_id,)
+        with self._lock:
+            conn = self._connect(_ALL if owner_id is None else owner_id)
+            if conn is None:
+                return None
+            row = conn.execute(
+                f"SELECT path FROM records WHERE stem = ?{owner_clause}"
+                f" UNION ALL SELECT path FROM records WHERE id = ?{owner_clause} LIMIT 1",
+                (record_id, *owner_params, record_id, *owner_params),
+            ).fetchone()
+        return self.directory / row[0] if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._seen_mtime.clear()
+                self._unreadable.clear()
+
+
+class PartitionReport(NamedTuple):
+    moved: int
+    unowned: int  # no owner_id: stays at the root
+    skipped: int  # unreadable, left in place
+
+
+def partition_directory(directory: Path) -> PartitionReport:
+    """Move root-level records that carry an ``owner_id`` into their owner's partition.
+
+    Each move is a same-filesystem rename, so an interrupted run leaves every
+    record readable in one place or the other; re-running finishes the job.
+    """
+    moved = unowned = skipped = 0
+    directory = Path(directory)
+    for stem, path in sorted(record_files(directory).items()):
+        try:
+            owner_id = read_record(path).get("owner_id")
+        except Exception:
+            logger.warning("Skipping unreadable record file: %s", path.name)
+            skipped += 1
+            continue
+        if not owner_id:
+            unowned += 1
+            continue
+        target_dir = directory / partition_for(owner_id)
+        target_dir.mkdir(exist_ok=True)
+        suffix = path.name[len(stem):]
+        target_stem = stem
+        for i in range(1, 100):
+            if find_record_file(target_dir, target_stem) is None:
+                break
+            target_stem = f"{stem}_{i}"
+        os.replace(path, target_dir / f"{target_stem}{suffix}")
+        moved += 1
+    return PartitionReport(moved, unowned, skipped)
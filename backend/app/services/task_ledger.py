@@ -0,0 +1,134 @@
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.core.config import settings
+from app.models.schemas import TaskBase
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"  # PUT sent, outcome unknown (timeout / crash)
+CREATED = "created"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    state TEXT NOT NULL,
+    task_id INTEGER,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class LedgerEntry(NamedTuple):
+    fingerprint: str
+    project_id: int
+    title: str
+    state: str
+    task_id: Optional[int]
+
+
+def _norm(value) -> str:
+    return " ".join(str(value).split()).casefold() if value is not None else ""
+
+
+class TaskLedger:
+    """Local fingerprint -> Vikunja task id index that makes task creation idempotent.
+
+    A fingerprint covers the target project and every user-visible task field,
+    so re-syncing the same history record, a client retry or an outbox
+    redelivery finds the task already created and skips the API call. Entries
+    left ``pending`` mark a PUT whose outcome is unknown; the service checks
+    Vikunja for that task before trying again.
+    """
+
+    DB_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "vikunja_tasks.sqlite3"
+
+    def __init__(self, db_path: Path | None = None, ttl_seconds: float | None = None):
+        if db_path is not None:
+            self.DB_PATH = Path(db_path)
+        # Past this age an entry no longer blocks a create (0 = keep forever)
+        self.ttl_seconds = settings.VIKUNJA_IDEMPOTENCY_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    @staticmethod
+    def fingerprint(task: TaskBase, project_id: int, created_by: str | None = None) -> str:
+        fields = [
+            project_id,
+            _norm(task.title),
+            _norm(task.description),
+            # The name wins: batch sync fills assignee_id in after resolving it
+            _norm(task.assignee_name) or task.assignee_id,
+            _norm(task.due_date),
+            task.priority,
+        ]
+        # Two users filing the same task each get their own (the author goes in the
+        # description); appended only when set so author-less keys stay as they were
+        if created_by:
+            fields.append(_norm(created_by))
+        material = json.dumps(fields, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.DB_PATH), check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if self.ttl_seconds > 0:
+                conn.execute("DELETE FROM task_fingerprints WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, fingerprint: str) -> Optional[LedgerEntry]:
+        oldest = time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT fingerprint, project_id, title, state, task_id FROM task_fingerprints"
+                " WHERE fingerprint = ? AND updated_at >= ?",
+                (fingerprint, oldest),
+            ).fetchone()
+        return LedgerEntry(*row) if row else None
+
+    def _upsert(self, fingerprint: str, project_id: int, title: str, state: str, task_id: Optional[int]) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO task_fingerprints (fingerprint, project_id, title, state, task_id, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(fingerprint) DO UPDATE SET"
+                " state = excluded.state, task_id = excluded.task_id, updated_at = excluded.updated_at",
+                (fingerprint, project_id, title, state, task_id, time.time()),
+            )
+
+    def mark_pending(self, fingerprint: str, project_id: int, title: str) -> None:
+        self._upsert(fingerprint, project_id, title, PENDING, None)
+
+    def mark_created(self, fingerprint: str, project_id: int, title: str, task_id: int) -> None:
+        self._upsert(fingerprint, project_id, title, CREATED, task_id)
+
+    def forget(self, fingerprint: str) -> None:
+        """Drop a pending entry after a definite failure (the task was not created)."""
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM task_fingerprints WHERE fingerprint = ? AND state = ?", (fingerprint, PENDING)
+            )
+
+    def invalidate(self, fingerprint: str) -> None:
+        """Drop an entry in any state (its task was deleted in Vikunja)."""
+        with self._lock:
+            self._connect().execute("DELETE FROM task_fingerprints WHERE fingerprint = ?", (fingerprint,))
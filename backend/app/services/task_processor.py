@@ -1,19 +1,22 @@
 import os
 import re
+import asyncio
 import json
-import docx
-import shutil
 import time
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set, Tuple, AsyncIterator
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
 from google.genai import types
 from thefuzz import process
 from fastapi import UploadFile
 from app.core.config import settings
-from app.models.schemas import AnalysisResponse, TaskBase
+from app.models.schemas import AnalysisResponse, ChunkReport, CompressionReport, TaskBase
 from app.services.glossary_manager import GlossaryManager
+from app.services.analysis_cache import AnalysisCache
+from app.services.transcript_parsers import extract_text
+from app.services.transcript_compressor import TranscriptCompressor
 from app.core.prompts import PRIORITY_INSTRUCTION
 
 logger = logging.getLogger(__name__)
@@ -45,71 +48,242 @@ def get_system_prompt(meeting_date_str: str, custom_instructions: str, glossary_
         - priority (int):
 {PRIORITY_INSTRUCTION}
         - due_date (string): YYYY-MM-DD ou null.
+        - source_timestamp (string): Se a transcrição tiver marcadores [HH:MM:SS], o marcador do trecho onde a tarefa foi combinada (apenas HH:MM:SS), senão null.
         """
 
+
+_SEGMENT_BOUNDARY = re.compile(r"(?=\n\n--- INÍCIO DO )")
+
+
+def split_transcript(text: str, token_budget: int) -> List[str]:
+    """Split a combined transcript into chunks of at most *token_budget* tokens.
+
+    Cuts prefer the ``--- INÍCIO DO ARQUIVO`` / ``TEXTO COLADO`` markers, so whole
+    files stay together when they fit; oversized segments fall back to line
+    boundaries (and, for pathological single lines, hard character cuts).
+    """
+    max_chars = max(1, token_budget) * 4  # inverse of estimate_tokens
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for segment in _SEGMENT_BOUNDARY.split(text):
+        if len(segment) <= max_chars:
+            pieces.append(segment)
+            continue
+        for line in segment.splitlines(keepends=True):
+            while len(line) > max_chars:
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+            pieces.append(line)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current.strip():
+        chunks.append(current)
+    return [c for c in chunks if c.strip()]
+
+
+def dedupe_tasks(tasks: List[TaskBase]) -> List[TaskBase]:
+    """Drop exact duplicates (same normalized title and assignee), keeping the highest priority."""
+    seen: Dict[Tuple[str, str], int] = {}
+    unique: List[TaskBase] = []
+    for task in tasks:
+        key = (
+            " ".join(task.title.casefold().split()),
+            " ".join((task.assignee_name or "").casefold().split()),
+        )
+        if key in seen:
+            kept = unique[seen[key]]
+            if task.priority > kept.priority:
+                unique[seen[key]] = task
+            continue
+        seen[key] = len(unique)
+        unique.append(task)
+    return unique
+
+
+def get_merge_prompt(tasks_json: str) -> str:
+    return f"""Você é um Analista Sênior de Projetos e Atas.
+        As tarefas abaixo foram extraídas de trechos consecutivos da MESMA reunião, analisados separadamente.
+        Sua missão é consolidar a lista final.
+
+        DIRETRIZES:
+        1. Unifique apenas tarefas que sejam ESTRITAMENTE sobre a mesma entrega, combinando as descrições.
+        2. Em caso de conflito, mantenha a maior prioridade e a data de vencimento mais próxima.
+        3. NÃO descarte nenhuma tarefa distinta. NÃO invente tarefas novas.
+        4. Mantenha exatamente os mesmos campos: title, description, assignee_name, priority, due_date, source_timestamp.
+
+        TAREFAS (JSON):
+        {tasks_json}
+
+        Retorne apenas o array JSON consolidado.
+        """
+
+
+class JsonArrayStreamParser:
+    """Incrementally extract the objects of the first JSON array in a text stream.
+
+    ``feed`` accepts arbitrary text fragments and returns the elements completed
+    so far, so tasks can be forwarded before the model finishes the array.
+    Objects nested inside elements are returned as part of their parent.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._array_depth: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: Optional[int] = None
+        self.items_seen = 0
+
+    def feed(self, text: str) -> List[Any]:
+        self._buffer += text
+        items: List[Any] = []
+        buf = self._buffer
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                if ch == "[" and self._array_depth is None:
+                    self._array_depth = self._depth + 1
+                elif self._array_depth is not None and self._depth == self._array_depth and ch == "{":
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._item_start is not None and self._depth == self._array_depth:
+                    fragment = buf[self._item_start:i + 1]
+                    self._item_start = None
+                    try:
+                        items.append(json.loads(fragment))
+                        self.items_seen += 1
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping unparsable streamed task fragment")
+        self._pos = len(buf)
+
+        # Drop consumed text so long streams stay bounded in memory
+        keep_from = self._item_start if self._item_start is not None else self._pos
+        self._buffer = buf[keep_from:]
+        self._pos -= keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        return items
+
+
 class TaskProcessor:
     def __init__(self):
         self.api_key = settings.GOOGLE_API_KEY
         self.client = genai.Client(api_key=self.api_key)
         self.model_id = "gemini-3-flash-preview"
         self.glossary_manager = GlossaryManager()
+        # Bounds how many Gemini analyses run at once across all requests
+        self._analysis_semaphore = asyncio.Semaphore(max(1, settings.ANALYSIS_MAX_CONCURRENCY))
+        self.result_cache = AnalysisCache(
+            max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANALYSIS_CACHE_TTL_SECONDS,
+        )
+        self.compressor = TranscriptCompressor(settings.TRANSCRIPT_FILLER_WORDS)
+        # docx/vtt parsing is CPU + blocking I/O: keep it off the event loop
+        self._extract_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.EXTRACTION_MAX_WORKERS),
+            thread_name_prefix="upload-extract",
+        )
 
     async def extract_text_from_upload(self, file: UploadFile) -> str:
-        ext = os.path.splitext(file.filename)[1].lower()
-        
-        # Save temp file to read
-        temp_path = f"temp_{int(time.time())}_{file.filename}"
-        try:
-            with open(temp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            text = ""
-            if ext == ".docx":
-                doc = docx.Document(temp_path)
-                text = "\n".join([p.text for p in doc.paragraphs])
-            elif ext in [".txt", ".md"]:
-                with open(temp_path, "r", encoding="utf-8") as f:
-                    text = f.read()
-            elif ext == ".vtt":
-                with open(temp_path, "r", encoding="utf-8") as f:
-                    raw = f.read()
-                # Strip WebVTT header, timestamps, and blank lines — keep spoken text
-                lines = []
-                for line in raw.splitlines():
-                    line = line.strip()
-                    if not line or line == "WEBVTT" or re.match(r"^\d{2}:\d{2}", line) or line.startswith("NOTE"):
-                        continue
-                    lines.append(line)
-                text = "\n".join(lines)
-            return text
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        """Parse an upload in memory on the extraction worker pool (no temp files)."""
+        ext = os.path.splitext(file.filename or "")[1].lower()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._extract_executor, extract_text, file.file, ext)
 
     @staticmethod
     def estimate_tokens(text: str) -> int:
         """Rough estimation of token count (approx 4 chars/token)."""
         return len(text) // 4
 
-    async def process_files(
+    async def _generate_json(self, prompt: str) -> str:
+        """Run a JSON-mode generation on the async client, bounded by the concurrency limit."""
+        async with self._analysis_semaphore:
+            response = await self.client.aio.models.generate_content(
+                model=self.model_id,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
+            )
+        return response.text
+
+    @staticmethod
+    def _parse_tasks(raw: str) -> List[TaskBase]:
+        """Validate a Gemini JSON payload (array, or object wrapping one) into tasks."""
+        data = json.loads(raw)
+
+        # Ensure data is a list
+        if not isinstance(data, list):
+            if isinstance(data, dict):
+                data = data.get('tasks', [data])
+            else:
+                data = []
+
+        tasks = []
+        for item in data:
+            try:
+                tasks.append(TaskBase(**item))
+            except Exception as e:
+                logger.warning("Skipping invalid task: %s - %s", item, e)
+        return tasks
+
+    async def _analyze_prompt(self, prompt: str) -> List[TaskBase]:
+        """Send a prompt to Gemini and validate the returned JSON array into tasks."""
+        return self._parse_tasks(await self._generate_json(prompt))
+
+    def _build_prompt(
         self,
-        files: List[UploadFile],
-        meeting_date: Optional[datetime] = None,
-        custom_instructions: str = "",
-        text_context: Optional[str] = None,
-    ) -> AnalysisResponse:
-        """Process files and/or raw text as a single continuous meeting context."""
-        if meeting_date is None:
-            meeting_date = datetime.now()
-        start_time = time.time()
+        combined_text: str,
+        meeting_date: datetime,
+        custom_instructions: str,
+        glossary_terms: Optional[Set[str]] = None,
+    ) -> str:
+        glossary_rules = self.glossary_manager.get_prompt_rules(glossary_terms)
+        meeting_date_str = meeting_date.strftime('%d/%m/%Y (%A)')
+        system_instructions = get_system_prompt(meeting_date_str, custom_instructions, glossary_rules)
+
+        return f"""
+        {system_instructions}
 
+        TRANSCRICÃO:
+        ---
+        {combined_text}
+        ---
+        """
+
+    async def _combine_inputs(self, files: List[UploadFile], text_context: Optional[str]) -> Tuple[str, List[str]]:
+        """Extract every upload and the pasted text into one transcript with file markers."""
         file_names: List[str] = []
         combined_text = ""
 
-        for file in files:
+        # Parse all uploads concurrently; results keep the upload order
+        texts = await asyncio.gather(*[self.extract_text_from_upload(f) for f in files])
+
+        for file, text in zip(files, texts):
             name = file.filename or "unknown"
             file_names.append(name)
-            text = await self.extract_text_from_upload(file)
             if not text.strip():
                 logger.warning("Empty content extracted from %s — skipping", name)
                 continue
@@ -129,53 +303,246 @@ class TaskProcessor:
 
         if not combined_text.strip():
             raise ValueError("Nenhum conteúdo extraído dos arquivos enviados.")
+        return combined_text, file_names
 
-        glossary_rules = self.glossary_manager.get_prompt_rules()
-        meeting_date_str = meeting_date.strftime('%d/%m/%Y (%A)')
-        system_instructions = get_system_prompt(meeting_date_str, custom_instructions, glossary_rules)
+    def _compress(self, text: str, compress: Optional[bool]) -> Tuple[str, Optional[CompressionReport]]:
+        """Pre-compression stage: runs before the prompt is built (and before cache keying)."""
+        enabled = settings.TRANSCRIPT_COMPRESSION_ENABLED if compress is None else compress
+        if not enabled:
+            return text, None
+        compressed, report = self.compressor.compress(text)
+        logger.info(
+            "Transcript compression saved ~%d tokens (%d -> %d)",
+            report.tokens_saved, report.tokens_before, report.tokens_after,
+        )
+        return compressed, report
 
-        prompt = f"""
-        {system_instructions}
+    def _apply_glossary(self, text: str) -> Tuple[str, Optional[Set[str]]]:
+        """Rewrite glossary misspellings locally and pick which rules go in the prompt.
 
-        TRANSCRICÃO:
-        ---
-        {combined_text}
-        ---
+        Returns the (possibly rewritten) text and the canonical terms whose rules
+        should be injected, or None to inject the whole glossary (the default,
+        and the fallback when no term matched).
         """
+        rewrite = settings.GLOSSARY_LOCAL_NORMALIZATION
+        matched_only = settings.GLOSSARY_MATCHED_RULES_ONLY
+        if not rewrite and not matched_only:
+            return text, None
+        normalized, matched = self.glossary_manager.normalize_text(text)
+        logger.info("Glossary matched %d term(s) in transcript", len(matched))
+        # Nothing matched verbatim: keep every rule for the model's phonetic matching
+        return (normalized if rewrite else text), (matched if matched_only and matched else None)
+
+    def _cache_key(
+        self, combined_text: str, meeting_date: datetime, custom_instructions: str, chunked: bool = False
+    ) -> str:
+        return AnalysisCache.make_key(
+            combined_text, custom_instructions, meeting_date, self.glossary_manager.version, self.model_id, chunked
+        )
+
+    def _cached_result(
+        self, cache_key: str, start_time: float, file_count: int, file_names: List[str]
+    ) -> Optional[AnalysisResponse]:
+        """Return the cached analysis re-labelled for the current request, or None on miss."""
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return None
+        logger.info("Analysis cache hit (%s)", cache_key[:12])
+        return cached.model_copy(update={
+            "processing_time": time.time() - start_time,
+            "file_count": file_count,
+            "file_names": file_names,
+            "cached": True,
+        })
+
+    async def process_files(
+        self,
+        files: List[UploadFile],
+        meeting_date: Optional[datetime] = None,
+        custom_instructions: str = "",
+        text_context: Optional[str] = None,
+        chunked: Optional[bool] = None,
+        compress: Optional[bool] = None,
+    ) -> AnalysisResponse:
+        """Process files and/or raw text as a single continuous meeting context.
+
+        Args:
+            chunked: Force (True) or disable (False) map-reduce analysis. When None,
+                     chunking kicks in only if the transcript exceeds the token budget.
+            compress: Override TRANSCRIPT_COMPRESSION_ENABLED for this request.
+        """
+        if meeting_date is None:
+            meeting_date = datetime.now()
+        start_time = time.time()
+
+        combined_text, file_names = await self._combine_inputs(files, text_context)
+        combined_text, compression = self._compress(combined_text, compress)
+        combined_text, glossary_terms = self._apply_glossary(combined_text)
+        token_count = self.estimate_tokens(combined_text)
+
+        budget = settings.ANALYSIS_CHUNK_TOKEN_BUDGET
+        if chunked is None:
+            chunked = token_count > budget
+
+        cache_key = self._cache_key(combined_text, meeting_date, custom_instructions, chunked)
+        cached = self._cached_result(cache_key, start_time, len(files), file_names)
+        if cached is not None:
+            return cached
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
+            chunk_reports: List[ChunkReport] = []
+            if chunked:
+                tasks, chunk_reports = await self._process_chunked(
+                    combined_text, meeting_date, custom_instructions, budget, glossary_terms
+                )
+            else:
+                tasks = await self._analyze_prompt(
+                    self._build_prompt(combined_text, meeting_date, custom_instructions, glossary_terms)
                 )
-            )
-            data = json.loads(response.text)
-
-            # Ensure data is a list
-            if not isinstance(data, list):
-                if isinstance(data, dict):
-                    data = data.get('tasks', [data])
-                else:
-                    data = []
-
-            tasks = []
-            for item in data:
-                try:
-                    tasks.append(TaskBase(**item))
-                except Exception as e:
-                    logger.warning("Skipping invalid task: %s - %s", item, e)
 
             processing_time = time.time() - start_time
-            return AnalysisResponse(
+            result = AnalysisResponse(
                 tasks=tasks,
-                token_count=self.estimate_tokens(combined_text),
+                token_count=token_count,
                 processing_time=processing_time,
                 file_count=len(files),
                 file_names=file_names,
+                chunks=chunk_reports,
+                compression=compression,
+                cache_key=cache_key,
             )
+            self.result_cache.put(cache_key, result)
+            return result
 
         except Exception as e:
             logger.error("Erro na análise do Gemini: %s", e)
             raise e
+
+    async def process_files_stream(
+        self,
+        files: List[UploadFile],
+        meeting_date: Optional[datetime] = None,
+        custom_instructions: str = "",
+        text_context: Optional[str] = None,
+        compress: Optional[bool] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of process_files.
+
+        Yields ``("task", TaskBase)`` as soon as each array element arrives and
+        validates, then a single ``("summary", AnalysisResponse)`` carrying the
+        full task list, token_count and processing_time. Always a single-prompt
+        analysis: map-reduce chunking needs the whole map phase before merging.
+        """
+        if meeting_date is None:
+            meeting_date = datetime.now()
+        start_time = time.time()
+
+        combined_text, file_names = await self._combine_inputs(files, text_context)
+        combined_text, compression = self._compress(combined_text, compress)
+        combined_text, glossary_terms = self._apply_glossary(combined_text)
+        token_count = self.estimate_tokens(combined_text)
+
+        cache_key = self._cache_key(combined_text, meeting_date, custom_instructions)
+        cached = self._cached_result(cache_key, start_time, len(files), file_names)
+        if cached is not None:
+            for task in cached.tasks:
+                yield "task", task
+            yield "summary", cached
+            return
+
+        prompt = self._build_prompt(combined_text, meeting_date, custom_instructions, glossary_terms)
+        parser = JsonArrayStreamParser()
+        raw_parts: List[str] = []
+        tasks: List[TaskBase] = []
+
+        try:
+            async with self._analysis_semaphore:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model_id,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json"
+                    )
+                )
+                async for chunk in stream:
+                    text = chunk.text or ""
+                    raw_parts.append(text)
+                    for item in parser.feed(text):
+                        try:
+                            task = TaskBase(**item)
+                        except Exception as e:
+                            logger.warning("Skipping invalid task: %s - %s", item, e)
+                            continue
+                        tasks.append(task)
+                        yield "task", task
+        except Exception as e:
+            logger.error("Erro na análise do Gemini (stream): %s", e)
+            raise e
+
+        # Non-array payloads (e.g. a single task object) only parse once complete
+        if parser.items_seen == 0:
+            for task in self._parse_tasks("".join(raw_parts)):
+                tasks.append(task)
+                yield "task", task
+
+        result = AnalysisResponse(
+            tasks=tasks,
+            token_count=token_count,
+            processing_time=time.time() - start_time,
+            file_count=len(files),
+            file_names=file_names,
+            compression=compression,
+            cache_key=cache_key,
+        )
+        self.result_cache.put(cache_key, result)
+        yield "summary", result
+
+    # --- Map-reduce (chunked) analysis ----------------------------------------
+
+    async def _process_chunked(
+        self,
+        combined_text: str,
+        meeting_date: datetime,
+        custom_instructions: str,
+        token_budget: int,
+        glossary_terms: Optional[Set[str]] = None,
+    ) -> Tuple[List[TaskBase], List[ChunkReport]]:
+        """Analyze transcript chunks concurrently, then merge their task lists."""
+        chunks = split_transcript(combined_text, token_budget)
+        logger.info("Chunked analysis: %d chunk(s), budget %d tokens", len(chunks), token_budget)
+
+        async def analyze_chunk(index: int, chunk: str) -> Tuple[List[TaskBase], ChunkReport]:
+            chunk_start = time.time()
+            tasks = await self._analyze_prompt(
+                self._build_prompt(chunk, meeting_date, custom_instructions, glossary_terms)
+            )
+            report = ChunkReport(
+                index=index,
+                token_count=self.estimate_tokens(chunk),
+                processing_time=time.time() - chunk_start,
+                task_count=len(tasks),
+            )
+            return tasks, report
+
+        results = await asyncio.gather(*[analyze_chunk(i, c) for i, c in enumerate(chunks)])
+        reports = [report for _, report in results]
+        partial = [tasks for tasks, _ in results if tasks]
+
+        tasks = dedupe_tasks([t for chunk_tasks in partial for t in chunk_tasks])
+        if len(partial) > 1:
+            tasks = await self._merge_tasks(tasks)
+        return tasks, reports
+
+    async def _merge_tasks(self, tasks: List[TaskBase]) -> List[TaskBase]:
+        """Reduce step: ask Gemini to unify tasks that describe the same deliverable.
+
+        Falls back to the locally deduplicated list if the merge call fails or
+        comes back empty, so a bad reduce never loses the map results.
+        """
+        tasks_json = json.dumps([t.model_dump() for t in tasks], ensure_ascii=False)
+        try:
+            merged = await self._analyze_prompt(get_merge_prompt(tasks_json))
+        except Exception as e:
+            logger.warning("Merge pass failed, keeping deduplicated chunk tasks: %s", e)
+            return tasks
+        return merged or tasks
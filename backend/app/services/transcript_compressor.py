@@ -0,0 +1,123 @@
+import re
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from app.models.schemas import CompressionReport
+
+logger = logging.getLogger(__name__)
+
+# Pure disfluencies in pt-BR STT output. Words that can carry meaning on their
+# own ("tá", "tipo", "então") are deliberately left to the model.
+DEFAULT_FILLERS: List[str] = [
+    "né", "aham", "uhum", "ahn", "ãh", "ah", "éh", "eh", "hã", "hum", "humm", "hmm", "hmmm", "mhm",
+]
+
+# "--- INÍCIO DO ARQUIVO: x ---" style markers are passed through verbatim
+_MARKER_LINE = re.compile(r"^(--- .* ---)$", re.MULTILINE)
+# Same 1–4 word fragment repeated back to back on one line ("eu vou eu vou eu vou").
+# Letters only: repeated numbers ("10 10 reais") are amounts/dates, not stutter
+_REPEATED_FRAGMENT = re.compile(
+    r"\b([^\W\d_]+(?:[ \t]+[^\W\d_]+){0,3})(?:[ \t,]+\1\b)+", re.IGNORECASE
+)
+# Only punctuation that ends a word: ".NET" and "arquivo .docx" keep their space
+_SPACE_BEFORE_PUNCT = re.compile(r"[ \t]+([,.;!?])(?=\s|$)")
+_DANGLING_COMMA = re.compile(r"[,;][ \t]*(?=[,.;!?]|$)", re.MULTILINE)
+_LEADING_COMMA = re.compile(r"(^|[:\]])[ \t]*[,;]+[ \t]*", re.MULTILINE)
+_MULTI_SPACE = re.compile(r"[ \t]{2,}")
+# Indentation and quote markers (nested .md lists, "> " quotes): layout, not speech
+_LINE_PREFIX = re.compile(r"^[ \t>]*", re.MULTILINE)
+_TIMESTAMP_PREFIX = re.compile(r"^\[[^\]]*\]\s*")
+_HAS_WORD = re.compile(r"\w")
+
+# Repeated lines shorter than this ("Sim.", "Ok") are kept, even back to back:
+# they may be genuine answers to separate questions
+_MIN_DUPLICATE_LINE_CHARS = 20
+
+
+def _estimate_tokens(text: str) -> int:
+    # Mirrors TaskProcessor.estimate_tokens (approx 4 chars/token)
+    return len(text) // 4
+
+
+class TranscriptCompressor:
+    """Deterministic pre-LLM clean-up of raw STT transcripts.
+
+    Every pass is one compiled regex over the whole text (or a set lookup per
+    line), so cost is linear in transcript size and independent of how many
+    filler words are configured.
+    """
+
+    def __init__(self, fillers: Optional[Iterable[str]] = None):
+        words = {w.strip().lower() for w in (DEFAULT_FILLERS if fillers is None else fillers) if w.strip()}
+        # Longest first so "hmmm" wins over "hmm" in the alternation
+        alternation = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+        self._filler_re = (
+            re.compile(rf"(?<!\w)(?:{alternation})(?!\w)[,;]?", re.IGNORECASE) if words else None
+        )
+
+    def compress(self, text: str) -> Tuple[str, CompressionReport]:
+        """Return the compressed transcript and a report of what was removed."""
+        tokens_before = _estimate_tokens(text)
+        counts = {"fillers": 0, "fragments": 0}
+
+        parts = _MARKER_LINE.split(text)
+        # re.split with one group: even indexes are content, odd ones are markers
+        for i in range(0, len(parts), 2):
+            parts[i] = self._clean_segment(parts[i], counts)
+        text, duplicate_lines = self._drop_duplicate_lines("".join(parts))
+
+        tokens_after = _estimate_tokens(text)
+        report = CompressionReport(
+            tokens_before=tokens_before,
+            tokens_after=tokens_after,
+            tokens_saved=max(0, tokens_before - tokens_after),
+            fillers_removed=counts["fillers"],
+            fragments_collapsed=counts["fragments"],
+            duplicate_lines_removed=duplicate_lines,
+        )
+        return text, report
+
+    def _clean_segment(self, text: str, counts: dict) -> str:
+        # Set line prefixes aside so the passes below cannot flatten them; no
+        # pass adds or removes newlines, so they line up again afterwards
+        prefixes = _LINE_PREFIX.findall(text)
+        text = _LINE_PREFIX.sub("", text)
+        if self._filler_re is not None:
+            text, n = self._filler_re.subn("", text)
+            counts["fillers"] += n
+        text, n = _REPEATED_FRAGMENT.subn(r"\1", text)
+        counts["fragments"] += n
+
+        text = _LEADING_COMMA.sub(lambda m: m.group(1) + (" " if m.group(1) else ""), text)
+        text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+        text = _DANGLING_COMMA.sub("", text)
+        text = _MULTI_SPACE.sub(" ", text)
+        return "\n".join(
+            prefix + line.strip() if line.strip() else ""
+            for prefix, line in zip(prefixes, text.split("\n"))
+        )
+
+    @staticmethod
+    def _drop_duplicate_lines(text: str) -> Tuple[str, int]:
+        """Drop long lines already seen, consecutive or not (STT re-sends).
+
+        The stripped text is only the dedupe key; kept lines keep their indentation.
+        """
+        kept: List[str] = []
+        seen = set()
+        removed = 0
+        for line in text.splitlines():
+            stripped = line.strip()
+            # Lines left with only punctuation ("Aham." -> ".") count as blank
+            if not _HAS_WORD.search(stripped):
+                if kept and kept[-1] == "":
+                    continue
+                kept.append("")
+                continue
+            key = _TIMESTAMP_PREFIX.sub("", stripped).casefold()
+            if len(key) >= _MIN_DUPLICATE_LINE_CHARS and key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+            kept.append(line.rstrip())
+        return "\n".join(kept).strip("\n"), removed
@@ -0,0 +1,184 @@
+import re
+import codecs
+import logging
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import docx
+
+logger = logging.getLogger(__name__)
+
+# Parsers read straight from the upload stream (FastAPI's SpooledTemporaryFile),
+# so nothing is ever copied to a temp file in the working directory.
+Parser = Callable[[BinaryIO], str]
+
+
+_NEWLINE = re.compile(r"\r\n|\r|\n")
+_READ_SIZE = 64 * 1024
+
+
+def iter_text_lines(stream: BinaryIO, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield decoded lines from a binary stream without loading it whole.
+
+    Only ``read()`` is used: SpooledTemporaryFile lacks ``readable()`` before
+    Python 3.11, so it cannot be wrapped in io.TextIOWrapper. Newlines are
+    universal (\\n, \\r\\n and \\r), and the stream is left open for the caller.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    while True:
+        chunk = stream.read(_READ_SIZE)
+        pending += decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            break
+        # A trailing CR may be the first half of a CRLF split across reads
+        carry = "\r" if pending.endswith("\r") else ""
+        *lines, pending = _NEWLINE.split(pending[: len(pending) - len(carry)])
+        pending += carry
+        yield from lines
+    lines = _NEWLINE.split(pending)
+    if lines[-1] == "":
+        lines.pop()
+    yield from lines
+
+
+def parse_docx(stream: BinaryIO) -> str:
+    doc = docx.Document(stream)
+    return "\n".join([p.text for p in doc.paragraphs])
+
+
+def parse_plain_text(stream: BinaryIO) -> str:
+    return "\n".join(iter_text_lines(stream))
+
+
+_TIMING = re.compile(
+    r"^\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})"
+)
+_VOICE_TAG = re.compile(r"<v(?:\.[^ >]*)?\s+([^>]+)>")
+_MARKUP = re.compile(r"</?[^>]+>")
+_INLINE_SPEAKER = re.compile(r"^([A-ZÀ-Ý][\wÀ-ÿ.'-]*(?: [A-ZÀ-Ý][\wÀ-ÿ.'-]*){0,3}):\s+(.+)$")
+
+
+class Cue(NamedTuple):
+    start: float
+    end: float
+    speaker: Optional[str]
+    text: str
+
+
+def _parse_timestamp(value: str) -> float:
+    """'01:02:03.500', '02:03.500' or SRT '01:02:03,500' -> seconds."""
+    seconds = 0.0
+    for part in value.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_offset(seconds: float) -> str:
+    total = int(seconds)
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
+def _split_speaker(line: str) -> Tuple[Optional[str], str]:
+    """Extract the speaker from a WebVTT voice tag or a 'Name: text' prefix."""
+    speaker = None
+    match = _VOICE_TAG.search(line)
+    if match:
+        speaker = match.group(1).strip()
+    text = _MARKUP.sub("", line).strip()
+    if speaker is None:
+        inline = _INLINE_SPEAKER.match(text)
+        if inline:
+            speaker, text = inline.group(1), inline.group(2).strip()
+    return speaker, text
+
+
+def iter_subtitle_cues(lines: Iterable[str]) -> Iterator[Cue]:
+    """Line-by-line WebVTT/SRT cue reader; holds only the current cue in memory.
+
+    Header, NOTE/STYLE/REGION blocks and SRT/VTT cue identifiers are skipped.
+    A cue spanning several lines keeps one speaker per line, so multi-voice
+    cues are emitted as several Cue objects sharing the same timing.
+    """
+    timing: Optional[Tuple[float, float]] = None
+    skipping_block = False
+    speaker: Optional[str] = None
+    buffer: List[str] = []
+
+    def flush() -> Iterator[Cue]:
+        if timing is not None and buffer:
+            yield Cue(timing[0], timing[1], speaker, " ".join(buffer))
+
+    for raw in lines:
+        line = raw.strip().lstrip("\ufeff")
+        if not line:
+            yield from flush()
+            timing, speaker, buffer, skipping_block = None, None, [], False
+            continue
+        if skipping_block:
+            continue
+        if timing is None:
+            match = _TIMING.match(line)
+            if match:
+                timing = (_parse_timestamp(match.group(1)), _parse_timestamp(match.group(2)))
+            elif line.startswith(("WEBVTT", "NOTE", "STYLE", "REGION")):
+                skipping_block = True
+            # Anything else before the timing line is a cue identifier
+            continue
+
+        line_speaker, text = _split_speaker(line)
+        if line_speaker is not None and line_speaker != speaker and buffer:
+            yield from flush()
+            buffer = []
+        if line_speaker is not None:
+            speaker = line_speaker
+        if text:
+            buffer.append(text)
+
+    yield from flush()
+
+
+def merge_speaker_turns(cues: Iterable[Cue]) -> Iterator[Cue]:
+    """Collapse consecutive cues by the same (known) speaker into a single turn."""
+    current: Optional[Cue] = None
+    for cue in cues:
+        if current is not None and cue.speaker is not None and cue.speaker == current.speaker:
+            current = Cue(current.start, cue.end, current.speaker, f"{current.text} {cue.text}")
+            continue
+        if current is not None:
+            yield current
+        current = cue
+    if current is not None:
+        yield current
+
+
+def parse_subtitles(stream: BinaryIO) -> str:
+    """WebVTT/SRT -> one compact '[HH:MM:SS] Speaker: text' line per speaker turn.
+
+    The offsets let extracted tasks point back to the transcript position
+    (see TaskBase.source_timestamp); merging same-speaker cues removes the
+    per-cue timing noise that otherwise inflates prompt tokens.
+    """
+    lines = []
+    for turn in merge_speaker_turns(iter_subtitle_cues(iter_text_lines(stream))):
+        prefix = f"[{format_offset(turn.start)}]"
+        lines.append(f"{prefix} {turn.speaker}: {turn.text}" if turn.speaker else f"{prefix} {turn.text}")
+    return "\n".join(lines)
+
+
+PARSERS: Dict[str, Parser] = {
+    ".docx": parse_docx,
+    ".txt": parse_plain_text,
+    ".md": parse_plain_text,
+    ".vtt": parse_subtitles,
+    ".srt": parse_subtitles,
+}
+
+
+def extract_text(stream: BinaryIO, ext: str) -> str:
+    """Dispatch to the parser for *ext*; unsupported formats yield an empty string."""
+    parser = PARSERS.get(ext.lower())
+    if parser is None:
+        logger.warning("Unsupported upload format: %s", ext)
+        return ""
+    stream.seek(0)
+    return parser(stream)
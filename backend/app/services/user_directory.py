@@ -0,0 +1,191 @@
+import time
+import asyncio
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from thefuzz import fuzz
+
+logger = logging.getLogger(__name__)
+
+# Minimum WRatio score for a fuzzy assignee match (same cut-off as the V1 logic)
+MATCH_THRESHOLD = 80
+
+UserLoader = Callable[[], Awaitable[List[Dict]]]
+
+
+def normalize_name(value: str) -> str:
+    """Accent-fold, casefold and reduce to space-separated alphanumeric tokens."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    return " ".join("".join(c if c.isalnum() else " " for c in folded).split())
+
+
+def _trigrams(label: str) -> Set[str]:
+    padded = f"  {label} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class UserIndex:
+    """Immutable lookup structure over one snapshot of the project members.
+
+    Built once per directory refresh: every user's display name and username
+    are normalized and indexed by token and character trigram, so resolving a
+    name only scores the users that share something with it.
+    """
+
+    def __init__(self, users: Iterable[Dict], version: int = 0):
+        self.version = version
+        self.users: List[Dict] = list(users)
+        self._labels: List[Tuple[str, int]] = []  # (normalized label, user id)
+        self._exact: Dict[str, int] = {}
+        self._by_token: Dict[str, Set[int]] = {}
+        self._by_trigram: Dict[str, Set[int]] = {}
+
+        for user in self.users:
+            for raw in (user.get("name"), user.get("username")):
+                label = normalize_name(raw or "")
+                if not label:
+                    continue
+                pos = len(self._labels)
+                self._labels.append((label, user["id"]))
+                self._exact.setdefault(label, user["id"])
+                for token in label.split():
+                    self._by_token.setdefault(token, set()).add(pos)
+                for gram in _trigrams(label):
+                    self._by_trigram.setdefault(gram, set()).add(pos)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Best matching user id for *name*, or None below MATCH_THRESHOLD."""
+        query = normalize_name(name or "")
+        if not query:
+            return None
+        exact = self._exact.get(query)
+        if exact is not None:
+            return exact
+
+        candidates: Set[int] = set()
+        for token in query.split():
+            candidates |= self._by_token.get(token, set())
+        for gram in _trigrams(query):
+            candidates |= self._by_trigram.get(gram, set())
+
+        best_score, best_id = 0, None
+        for pos in sorted(candidates):
+            label, user_id = self._labels[pos]
+            score = fuzz.WRatio(query, label)
+            if score > best_score:
+                best_score, best_id = score, user_id
+        return best_id if best_score >= MATCH_THRESHOLD else None
+
+    def resolve_many(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Resolve several names against this snapshot; duplicates are scored once."""
+        by_query: Dict[str, Optional[int]] = {}
+        result: Dict[str, Optional[int]] = {}
+        for name in names:
+            query = normalize_name(name or "")
+            if query not in by_query:
+                by_query[query] = self.resolve(query)
+            result[name] = by_query[query]
+        return result
+
+
+class ResolutionCache:
+    """LRU of assignee resolutions keyed by (directory version, normalized name).
+
+    Keying on the version makes a directory reload invalidate old answers
+    implicitly; entries from older versions simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str], Optional[int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, version: int, query: str) -> Tuple[bool, Optional[int]]:
+        """Return (found, user_id); a cached None means "known not to match"."""
+        key = (version, query)
+        if key not in self._entries:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, self._entries[key]
+
+    def store(self, version: int, query: str, user_id: Optional[int]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[(version, query)] = user_id
+        self._entries.move_to_end((version, query))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class UserDirectory:
+    """TTL-refreshed cache of Vikunja project members plus their UserIndex.
+
+    The first lookup loads synchronously. Afterwards a stale directory keeps
+    answering from the current snapshot while one background task reloads
+    it, so new project members become matchable without a restart and no
+    request waits on the refresh. A failed reload keeps the old snapshot and
+    is retried after ``retry_seconds``.
+    """
+
+    def __init__(self, loader: UserLoader, ttl_seconds: float = 300.0, retry_seconds: float = 30.0):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._index: Optional[UserIndex] = None
+        self._version = 0
+        self._next_refresh = 0.0
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        """Bumped on every successful reload; use it to key derived caches."""
+        return self._version
+
+    async def index(self) -> UserIndex:
+        if self._index is None:
+            await self.refresh()
+        elif time.monotonic() >= self._next_refresh:
+            self._schedule_refresh()
+        return self._index if self._index is not None else UserIndex([], self._version)
+
+    async def users(self) -> List[Dict]:
+        return (await self.index()).users
+
+    async def refresh(self) -> None:
+        """Reload now; concurrent callers share one load."""
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._index is not None and time.monotonic() < self._next_refresh:
+                return
+            try:
+                users = await self._loader()
+            except Exception as e:
+                logger.warning("Vikunja user directory refresh failed: %s", e)
+                self._next_refresh = time.monotonic() + self.retry_seconds
+                return
+            self._version += 1
+            self._index = UserIndex(users, self._version)
+            self._next_refresh = time.monotonic() + self.ttl_seconds
+            logger.info("Vikunja user directory loaded: %d user(s), version %d", len(users), self._version)
+
+    def invalidate(self) -> None:
+        """Force the next lookup to trigger a reload."""
+        self._next_refresh = 0.0
+
+    def _schedule_refresh(self) -> None:
+        if self._background is not None and not self._background.done():
+            return
+        self._background = asyncio.create_task(self.refresh())
@@ -1,21 +1,48 @@
-import json
 import logging
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
 
-import bcrypt
-
 from app.core.config import settings
+from app.core.security import PrincipalCache
 from app.models.auth_schemas import User, UserCreate, UserUpdate
+from app.services.password_hasher import password_hasher
+from app.services.user_store import BACKENDS, UserStore, import_json_users, open_user_store
 
 logger = logging.getLogger(__name__)
 
 
 class UserManager:
-    """Manages user CRUD operations with bcrypt hashing and JSON file persistence."""
+    """Manages user CRUD operations with bcrypt hashing and pluggable persistence.
+
+    Users live in a UserStore: ``users.json`` (the default) or a SQLite
+    table (USER_STORE_BACKEND=sqlite). They are loaded once into an
+    in-memory registry indexed by username and id, so auth lookups are dict
+    hits. The registry is reloaded when the store's version changes (an
+    edit by hand or by another process) and after this manager's own
+    writes. The User objects returned by lookups are shared: treat them as
+    read-only.
+    """
 
     USERS_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "users.json"
+    USERS_DB = Path(__file__).resolve().parent.parent.parent / "data" / "users.sqlite3"
+
+    def __init__(self, backend: str | None = None):
+        self.backend = backend or settings.USER_STORE_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown user store backend {self.backend!r}; expected one of {BACKENDS}")
+        self._store_instance: UserStore | None = None
+        self._store_key: tuple | None = None
+        self._lock = threading.Lock()
+        self._signature: tuple | None = None
+        self._by_username: dict[str, User] = {}
+        self._by_id: dict[str, User] = {}
+        # Verified token -> User for get_current_user; emptied whenever users change
+        self.principals = PrincipalCache(
+            max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+        )
 
     # ------------------------------------------------------------------
     # Password helpers
@@ -23,41 +50,76 @@ class UserManager:
 
     @staticmethod
     def hash_password(plain: str) -> str:
-        """Hash a plain-text password with bcrypt."""
-        return bcrypt.hashpw(plain.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        """Hash a plain-text password with bcrypt (BCRYPT_ROUNDS). Blocks: use hash_password_async in handlers."""
+        return password_hasher.hash(plain)
 
     @staticmethod
     def verify_password(plain: str, hashed: str) -> bool:
-        """Verify a plain-text password against a bcrypt hash."""
-        return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+        """Verify a plain-text password against a bcrypt hash. Blocks: use verify_password_async in handlers."""
+        return password_hasher.verify(plain, hashed)
+
+    @staticmethod
+    async def hash_password_async(plain: str) -> str:
+        """hash_password on the bcrypt worker pool."""
+        return await password_hasher.hash_async(plain)
+
+    @staticmethod
+    async def verify_password_async(plain: str, hashed: str) -> bool:
+        """verify_password on the bcrypt worker pool."""
+        return await password_hasher.verify_async(plain, hashed)
 
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
-    def _load_users(self) -> list[dict]:
-        """Load the raw user list from disk. Returns [] if file missing/corrupt."""
-        if not self.USERS_FILE.exists():
-            return []
-        try:
-            data = json.loads(self.USERS_FILE.read_text(encoding="utf-8"))
-            assert isinstance(data, list)
-            return data
-        except Exception:
-            logger.error("Failed to load users.json", exc_info=True)
-            return []
-
-    def _save_users(self, users: list[dict]) -> None:
-        """Atomically write the user list to disk."""
-        self.USERS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.USERS_FILE.with_suffix(".tmp")
-        tmp.write_text(
-            json.dumps(users, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-        # os.replace is atomic and works on Windows (unlike Path.rename when target exists)
-        import os
-        os.replace(tmp, self.USERS_FILE)
+    def _store(self) -> UserStore:
+        """The store for the configured backend (reopened if USERS_FILE / USERS_DB is repointed)."""
+        path = self.USERS_DB if self.backend == "sqlite" else self.USERS_FILE
+        key = (self.backend, str(path))
+        if key != self._store_key:
+            if self._store_instance is not None:
+                self._store_instance.close()
+            self._store_instance = open_user_store(self.backend, path)
+            self._store_key = key
+        return self._store_instance
+
+    def close(self) -> None:
+        if self._store_instance is not None:
+            self._store_instance.close()
+
+    def _install(self, users: list[dict], signature: tuple | None) -> None:
+        """Replace the registry (caller holds the lock)."""
+        self._by_username = {}
+        self._by_id = {}
+        for raw in users:
+            try:
+                user = User(**raw)
+            except Exception:
+                logger.error("Skipping invalid user entry: %r", raw.get("username"))
+                continue
+            self._by_username[user.username] = user
+            self._by_id[user.id] = user
+        self._signature = signature
+
+    def _refresh_registry(self) -> None:
+        """Reload the registry if the store changed since it was last read or written."""
+        store = self._store()
+        version = store.version()
+        if version == self._signature:
+            return
+        with self._lock:
+            if version != self._signature:
+                self._install(store.load(), version)
+                # Changed outside this manager: no telling whose role or status moved
+                self.principals.clear()
+
+    def _write(self, change):
+        """Run ``change(store)`` and make the result the in-memory registry; returns its result."""
+        store = self._store()
+        with self._lock:
+            result = change(store)
+            self._install(store.load(), store.version())
+        return result
 
     # ------------------------------------------------------------------
     # CRUD
@@ -65,89 +127,84 @@ class UserManager:
 
     def get_user(self, username: str) -> User | None:
         """Look up a user by username. Returns None if not found."""
-        for raw in self._load_users():
-            if raw.get("username") == username:
-                return User(**raw)
-        return None
+        self._refresh_registry()
+        return self._by_username.get(username)
 
     def get_user_by_id(self, user_id: str) -> User | None:
         """Look up a user by id. Returns None if not found."""
-        for raw in self._load_users():
-            if raw.get("id") == user_id:
-                return User(**raw)
-        return None
+        self._refresh_registry()
+        return self._by_id.get(user_id)
 
     def list_users(self) -> list[User]:
         """Return all users."""
-        return [User(**raw) for raw in self._load_users()]
+        self._refresh_registry()
+        return list(self._by_id.values())
 
-    def create_user(self, payload: UserCreate) -> User:
+    def create_user(self, payload: UserCreate, hashed_password: str | None = None) -> User:
         """
         Create a new user. Raises ValueError if the username already exists.
         The password is hashed before storage — plain text is never persisted.
+        Async callers pass ``hashed_password`` (from hash_password_async) so
+        bcrypt does not run on the event loop.
         """
-        users = self._load_users()
-
-        if any(u["username"] == payload.username for u in users):
-            raise ValueError(f"Username '{payload.username}' already exists")
-
         user = User(
             id=str(uuid.uuid4()),
             username=payload.username,
-            hashed_password=self.hash_password(payload.password),
+            hashed_password=hashed_password or self.hash_password(payload.password),
             role=payload.role,
             is_active=True,
             created_at=datetime.now().isoformat(),
         )
 
-        users.append(user.model_dump())
-        self._save_users(users)
+        # The store rejects a taken username atomically, so concurrent creates cannot both succeed
+        self._write(lambda store: store.insert(user.model_dump()))
         logger.info("User created: %s (role=%s)", user.username, user.role)
         return user
 
     def update_user(self, user_id: str, payload: UserUpdate) -> User | None:
         """
-        Partially update a user by ID. Only non-None fields are applied.
+        Partially update a user by ID. Only non-None fields are applied,
+        except ``default_project_id``, which an explicit None clears.
         Returns the updated User, or None if not found.
         """
-        users = self._load_users()
-        for raw in users:
-            if raw.get("id") == user_id:
-                updates = payload.model_dump(exclude_none=True)
-                raw.update(updates)
-                self._save_users(users)
-                logger.info("User updated: %s fields=%s", user_id, list(updates.keys()))
-                return User(**raw)
-        return None
-
-    def reset_password(self, user_id: str, new_password: str) -> bool:
-        """Set a new hashed password for the user. Returns False if not found."""
-        users = self._load_users()
-        for raw in users:
-            if raw.get("id") == user_id:
-                raw["hashed_password"] = self.hash_password(new_password)
-                self._save_users(users)
-                logger.info("Password reset for user: %s", user_id)
-                return True
-        return False
+        updates = payload.model_dump(exclude_none=True)
+        if "default_project_id" in payload.model_fields_set:
+            updates["default_project_id"] = payload.default_project_id
+        raw = self._write(lambda store: store.update(user_id, updates))
+        if raw is None:
+            return None
+        self.principals.invalidate_user(user_id)
+        logger.info("User updated: %s fields=%s", user_id, list(updates.keys()))
+        return User(**raw)
+
+    def reset_password(self, user_id: str, new_password: str, hashed_password: str | None = None) -> bool:
+        """Set a new hashed password for the user. Returns False if not found.
+
+        ``hashed_password`` works as in create_user.
+        """
+        if self.get_user_by_id(user_id) is None:
+            return False
+        hashed = hashed_password or self.hash_password(new_password)
+        if self._write(lambda store: store.update(user_id, {"hashed_password": hashed})) is None:
+            return False
+        self.principals.invalidate_user(user_id)
+        logger.info("Password reset for user: %s", user_id)
+        return True
 
     def delete_user(self, username: str) -> bool:
         """Delete a user by username. Returns True if removed, False if not found."""
-        users = self._load_users()
-        filtered = [u for u in users if u["username"] != username]
-        if len(filtered) == len(users):
+        removed = self._write(lambda store: store.delete(username=username))
+        if removed is None:
             return False
-        self._save_users(filtered)
+        self.principals.invalidate_user(removed.get("id"))
         logger.info("User deleted: %s", username)
         return True
 
     def delete_user_by_id(self, user_id: str) -> bool:
         """Delete a user by ID. Returns True if removed, False if not found."""
-        users = self._load_users()
-        filtered = [u for u in users if u.get("id") != user_id]
-        if len(filtered) == len(users):
+        if self._write(lambda store: store.delete(user_id=user_id)) is None:
             return False
-        self._save_users(filtered)
+        self.principals.invalidate_user(user_id)
         logger.info("User deleted by id: %s", user_id)
         return True
 
@@ -160,9 +217,14 @@ class UserManager:
         Called on application startup. If no users exist, create the default
         admin account from environment settings.
         """
-        users = self._load_users()
+        users = self.list_users()
+        if not users and self.backend == "sqlite" and self.USERS_FILE.exists():
+            # First start on the SQLite store: carry the accounts over from users.json
+            report = self._write(lambda store: import_json_users(self.USERS_FILE, store))
+            logger.info("Imported %d user(s) from %s into %s", report.imported, self.USERS_FILE.name, self.USERS_DB.name)
+            users = self.list_users()
         if users:
-            logger.info("Users file present with %d user(s) — skipping bootstrap.", len(users))
+            logger.info("User store has %d user(s) — skipping bootstrap.", len(users))
             return
 
         admin_payload = UserCreate(
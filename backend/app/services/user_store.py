@@ -0,0 +1,305 @@
+import os
+import json
+from abc import ABC, abstractmethod
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("json", "sqlite")
+
+# Every field of app.models.auth_schemas.User, in table order
+_COLUMNS = ("id", "username", "hashed_password", "role", "is_active", "created_at", "default_project_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    hashed_password TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'user',
+    is_active INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    default_project_id INTEGER
+);
+"""
+
+
+def _duplicate(username: str) -> ValueError:
+    return ValueError(f"Username '{username}' already exists")
+
+
+def _check_changes(changes: dict) -> None:
+    """Both stores accept the same updates: any User field except the id."""
+    unknown = set(changes) - set(_COLUMNS[1:])
+    if unknown:
+        raise ValueError(f"Cannot update user field(s): {sorted(unknown)}")
+
+
+class UserStore(ABC):
+    """Where UserManager keeps the raw user rows (dicts shaped like User).
+
+    Every mutation is atomic with respect to the store, so concurrent admin
+    operations cannot lose each other's changes. ``version()`` is a cheap
+    token that changes whenever the data may have changed, including writes
+    by another process; UserManager compares it to decide when to reload
+    its in-memory registry.
+    """
+
+    @abstractmethod
+    def version(self) -> tuple:
+        """Token that changes whenever the stored users may have changed."""
+
+    @abstractmethod
+    def load(self) -> list[dict]:
+        """Every user row, as dicts the caller may modify."""
+
+    @abstractmethod
+    def insert(self, raw: dict) -> None:
+        """Add a user; raises ValueError if the username is taken."""
+
+    @abstractmethod
+    def update(self, user_id: str, changes: dict) -> Optional[dict]:
+        """Apply *changes* to one user; returns the updated row, or None if not found.
+
+        Raises ValueError for fields that are not updatable or a taken username.
+        """
+
+    @abstractmethod
+    def delete(self, user_id: str | None = None, username: str | None = None) -> Optional[dict]:
+        """Remove the user matching *user_id* or *username*; returns the removed row."""
+
+    def close(self) -> None:
+        pass
+
+
+class JsonUserStore(UserStore):
+    """The original ``users.json`` list, rewritten atomically on every change.
+
+    Mutations run under a lock against the last known file contents (re-read
+    only if the file changed), which serializes writers within the process.
+    Writers in separate processes can still overwrite each other; use the
+    SQLite store when that matters.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._users: list[dict] = []
+        self._signature: tuple | None = None
+
+    def version(self) -> tuple:
+        """(path, mtime_ns, size, inode) of the file; just (path,) while it does not exist."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return (str(self.path),)
+        return (str(self.path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _read(self) -> list[dict]:
+        """Parse the raw user list from disk. Returns [] if file missing/corrupt."""
+        if not self.path.exists():
+            return []
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            assert isinstance(data, list)
+            return data
+        except Exception:
+            logger.error("Failed to load %s", self.path.name, exc_info=True)
+            return []
+
+    def _current(self) -> list[dict]:
+        """The user list as on disk now (caller holds the lock)."""
+        signature = self.version()
+        if signature != self._signature:
+            self._users = self._read()
+            self._signature = signature
+        return self._users
+
+    def _write(self, users: list[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(users, ensure_ascii=False, indent=2), encoding="utf-8")
+        # os.replace is atomic and works on Windows (unlike Path.rename when target exists)
+        os.replace(tmp, self.path)
+        self._users = users
+        self._signature = self.version()
+
+    def load(self) -> list[dict]:
+        with self._lock:
+            return [dict(raw) for raw in self._current()]
+
+    def insert(self, raw: dict) -> None:
+        with self._lock:
+            users = [dict(u) for u in self._current()]
+            if any(u.get("username") == raw["username"] for u in users):
+                raise _duplicate(raw["username"])
+            self._write(users + [dict(raw)])
+
+    def update(self, user_id: str, changes: dict) -> Optional[dict]:
+        _check_changes(changes)
+        with self._lock:
+            users = [dict(u) for u in self._current()]
+            username = changes.get("username")
+            if username is not None and any(u.get("username") == username and u.get("id") != user_id for u in users):
+                raise _duplicate(username)
+            for raw in users:
+                if raw.get("id") == user_id:
+                    raw.update(changes)
+                    self._write(users)
+                    return dict(raw)
+        return None
+
+    def delete(self, user_id: str | None = None, username: str | None = None) -> Optional[dict]:
+        with self._lock:
+            users = [dict(u) for u in self._current()]
+            for index, raw in enumerate(users):
+                if (user_id is not None and raw.get("id") == user_id) or (
+                    username is not None and raw.get("username") == username
+                ):
+                    del users[index]
+                    self._write(users)
+                    return raw
+        return None
+
+
+class SqliteUserStore(UserStore):
+    """Users as rows of a SQLite table with unique ``id`` and ``username``.
+
+    Creates, updates and deletes touch a single row in one statement or
+    transaction, so concurrent admin operations (threads or processes) never clobber one
+    another, and a duplicate username is rejected by the UNIQUE constraint
+    rather than by a check-then-write.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # PRAGMA data_version ignores this connection's own commits; count those here
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict:
+        raw = dict(row)
+        raw["is_active"] = bool(raw["is_active"])
+        return raw
+
+    def version(self) -> tuple:
+        with self._lock:
+            data_version = self._connect().execute("PRAGMA data_version").fetchone()[0]
+            return (str(self.path), data_version, self._writes)
+
+    def load(self) -> list[dict]:
+        with self._lock:
+            rows = self._connect().execute(f"SELECT {', '.join(_COLUMNS)} FROM users ORDER BY rowid").fetchall()
+        return [self._row(row) for row in rows]
+
+    def insert(self, raw: dict) -> None:
+        values = {column: raw.get(column) for column in _COLUMNS}
+        values["is_active"] = int(raw.get("is_active", True))
+        with self._lock:
+            try:
+                self._connect().execute(
+                    f"INSERT INTO users ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                    tuple(values.values()),
+                )
+            except sqlite3.IntegrityError:
+                raise _duplicate(raw["username"]) from None
+            self._writes += 1
+
+    def update(self, user_id: str, changes: dict) -> Optional[dict]:
+        _check_changes(changes)
+        with self._lock:
+            conn = self._connect()
+            if changes:
+                assignments = ", ".join(f"{column} = ?" for column in changes)
+                params = [int(v) if column == "is_active" else v for column, v in changes.items()]
+                try:
+                    cursor = conn.execute(f"UPDATE users SET {assignments} WHERE id = ?", (*params, user_id))
+                except sqlite3.IntegrityError:
+                    raise _duplicate(changes.get("username", "")) from None
+                if cursor.rowcount:
+                    self._writes += 1
+            row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM users WHERE id = ?", (user_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def delete(self, user_id: str | None = None, username: str | None = None) -> Optional[dict]:
+        column, value = ("id", user_id) if user_id is not None else ("username", username)
+        with self._lock:
+            conn = self._connect()
+            # One write transaction, so no other process can change the row in between
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM users WHERE {column} = ?", (value,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM users WHERE id = ?", (row["id"],))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if row is None:
+                return None
+            self._writes += 1
+        return self._row(row)
+
+
+def open_user_store(backend: str, path: Path) -> UserStore:
+    if backend == "json":
+        return JsonUserStore(path)
+    if backend == "sqlite":
+        return SqliteUserStore(path)
+    raise ValueError(f"Unknown user store backend {backend!r}; expected one of {BACKENDS}")
+
+
+class ImportReport(NamedTuple):
+    imported: int
+    existing: int  # id or username already in the target store
+    invalid: int  # entries that are not valid users
+
+
+def import_json_users(json_path: Path, store: UserStore) -> ImportReport:
+    """Copy the users of a ``users.json`` file into *store*.
+
+    Safe to re-run: users whose id or username is already present are left
+    alone, so the JSON file can stay in place as a backup.
+    """
+    from app.models.auth_schemas import User
+
+    present = store.load()
+    ids = {raw.get("id") for raw in present}
+    names = {raw.get("username") for raw in present}
+    imported = existing = invalid = 0
+    for raw in JsonUserStore(json_path).load():
+        try:
+            user = User(**raw)
+        except Exception:
+            logger.warning("Skipping invalid user entry in %s: %r", Path(json_path).name, raw.get("username"))
+            invalid += 1
+            continue
+        if user.id in ids or user.username in names:
+            existing += 1
+            continue
+        store.insert(user.model_dump())
+        ids.add(user.id)
+        names.add(user.username)
+        imported += 1
+    return ImportReport(imported, existing, invalid)
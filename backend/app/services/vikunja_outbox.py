@@ -0,0 +1,373 @@
+import json
+import time
+import uuid
+import random
+import sqlite3
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.models.schemas import TaskBase
+from app.services.vikunja_service import SyncResult
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENDING = "sending"
+DELIVERED = "delivered"
+DEAD = "dead"  # gave up after VIKUNJA_OUTBOX_MAX_ATTEMPTS, or Vikunja rejected it for good
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    project_id INTEGER NOT NULL,
+    created_by TEXT,
+    source TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+def is_retryable(status_code: Optional[int]) -> bool:
+    """Transport errors (no status), 5xx, 408 and 429 may succeed later; other 4xx never will."""
+    return status_code is None or not 400 <= status_code < 500 or status_code in (408, 429)
+
+
+class OutboxEntry(NamedTuple):
+    id: int
+    idempotency_key: str
+    project_id: int
+    created_by: Optional[str]
+    source: Optional[str]
+    task: TaskBase
+    status: str
+    attempts: int
+    last_error: Optional[str]
+
+
+class VikunjaOutbox:
+    """Durable SQLite queue of Vikunja task creations.
+
+    ``/sync`` and ``save_conversation`` write here and return immediately;
+    ``OutboxWorker`` delivers in the background. Every entry carries an
+    idempotency key (UNIQUE), so enqueueing the same key twice is a no-op and
+    an entry is never delivered again once marked delivered.
+    """
+
+    DB_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "vikunja_outbox.sqlite3"
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        max_attempts: int = 8,
+        backoff_base: float = 2.0,
+        backoff_max: float = 600.0,
+        lease_seconds: float = 120.0,
+    ):
+        if db_path is not None:
+            self.DB_PATH = Path(db_path)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        # Called after every enqueue (the worker uses it to wake up early)
+        self.on_enqueue: Optional[Callable[[], None]] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # --- Storage --------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.DB_PATH), check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _to_entry(row: sqlite3.Row) -> OutboxEntry:
+        return OutboxEntry(
+            id=row["id"],
+            idempotency_key=row["idempotency_key"],
+            project_id=row["project_id"],
+            created_by=row["created_by"],
+            source=row["source"],
+            task=TaskBase(**json.loads(row["payload"])),
+            status=row["status"],
+            attempts=row["attempts"],
+            last_error=row["last_error"],
+        )
+
+    # --- Producer side --------------------------------------------------------
+
+    def enqueue(
+        self,
+        tasks: Iterable[TaskBase],
+        project_id: int,
+        created_by: str | None = None,
+        source: str | None = None,
+        idempotency_key: str | None = None,
+    ) -> List[int]:
+        """Queue *tasks* for delivery and return their outbox ids, in order.
+
+        With an ``idempotency_key`` each task gets ``<key>:<index>``; replaying
+        the same key returns the existing ids instead of queueing again.
+        """
+        now = time.time()
+        ids: List[int] = []
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for i, task in enumerate(tasks):
+                    key = f"{idempotency_key}:{i}" if idempotency_key else uuid.uuid4().hex
+                    conn.execute(
+                        "INSERT OR IGNORE INTO outbox (idempotency_key, project_id, created_by, source, payload,"
+                        " status, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, project_id, created_by, source, task.model_dump_json(), PENDING, now, now, now),
+                    )
+                    row = conn.execute("SELECT id FROM outbox WHERE idempotency_key = ?", (key,)).fetchone()
+                    ids.append(row["id"])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if self.on_enqueue is not None:
+            self.on_enqueue()
+        return ids
+
+    # --- Consumer side --------------------------------------------------------
+
+    def claim(self, limit: int) -> List[OutboxEntry]:
+        """Lease up to *limit* due entries (pending, or sending with an expired lease)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT * FROM outbox WHERE status IN (?, ?) AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                    (PENDING, SENDING, now, limit),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE outbox SET status = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                    [(SENDING, now + self.lease_seconds, now, r["id"]) for r in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [self._to_entry(r)._replace(status=SENDING) for r in rows]
+
+    def backoff(self, attempts: int) -> float:
+        """Exponential delay before retry number *attempts*, capped, with ±20% jitter."""
+        delay = min(self.backoff_base * (2 ** max(0, attempts - 1)), self.backoff_max)
+        return delay * random.uniform(0.8, 1.2)
+
+    def mark_delivered(self, entry_id: int) -> None:
+        with self._lock:
+            self._connect().execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, updated_at = ?"
+                " WHERE id = ?",
+                (DELIVERED, time.time(), entry_id),
+            )
+
+    def mark_failed(self, entry_id: int, error: str | None, retryable: bool = True) -> str:
+        """Record a failed attempt; returns the new status (pending or dead).
+
+        A non-retryable failure is dead at once instead of waiting out the retries.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT attempts FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                return DEAD
+            attempts = row["attempts"] + 1
+            status = DEAD if not retryable or attempts >= self.max_attempts else PENDING
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ?"
+                " WHERE id = ?",
+                (status, attempts, error, now + self.backoff(attempts), now, entry_id),
+            )
+        return status
+
+    # --- Inspection -----------------------------------------------------------
+
+    def get_many(self, entry_ids: Iterable[int]) -> List[OutboxEntry]:
+        ids = list(entry_ids)
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT * FROM outbox WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id", ids
+            ).fetchall()
+        return [self._to_entry(r) for r in rows]
+
+    def stats(self) -> Dict[str, int]:
+        counts = {PENDING: 0, SENDING: 0, DELIVERED: 0, DEAD: 0}
+        with self._lock:
+            for row in self._connect().execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status"):
+                counts[row["status"]] = row["n"]
+        return counts
+
+
+OutboxListener = Callable[[OutboxEntry, bool, Optional[str]], None]
+
+
+class OutboxWorker:
+    """Background task draining a VikunjaOutbox through VikunjaService.create_tasks.
+
+    Claimed entries are flushed in batches grouped by (project, author), so a
+    whole meeting goes out over one pooled client with bounded concurrency.
+    Listeners registered per source kind ("conversation:<id>" -> "conversation")
+    are told about final outcomes (delivered, or dead after the last retry).
+    """
+
+    def __init__(self, outbox: VikunjaOutbox, batch_size: int = 20, poll_seconds: float = 5.0):
+        self.outbox = outbox
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._service = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self._listeners: Dict[str, List[OutboxListener]] = {}
+
+    def add_listener(self, source_kind: str, listener: OutboxListener) -> None:
+        self._listeners.setdefault(source_kind, []).append(listener)
+
+    async def start(self, service) -> None:
+        if self._task is not None:
+            return
+        self._service = service
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        self.outbox.on_enqueue = self.wake
+        self._task = asyncio.create_task(self._run())
+        logger.info("Vikunja outbox worker started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self.outbox.on_enqueue = None
+        # On Python < 3.12 wait_for can swallow a cancel that lands just after
+        # the wakeup event is set; the flag ends the loop in that case too
+        self._stopping = True
+        self.wake()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Vikunja outbox worker stopped")
+
+    def wake(self) -> None:
+        """Safe from any thread: producers enqueue through asyncio.to_thread."""
+        if self._wakeup is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.drain_once()
+            except Exception:
+                logger.exception("Vikunja outbox drain failed")
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain_once(self, service=None) -> int:
+        """Deliver one batch of due entries; returns how many were attempted."""
+        service = service or self._service
+        # The outbox calls are SQLite write transactions; run them off the event loop
+        entries = await asyncio.to_thread(self.outbox.claim, self.batch_size)
+        if not entries:
+            return 0
+
+        groups: Dict[Tuple[int, Optional[str]], List[OutboxEntry]] = {}
+        for entry in entries:
+            groups.setdefault((entry.project_id, entry.created_by), []).append(entry)
+
+        for (project_id, created_by), group in groups.items():
+            try:
+                results = await service.create_tasks(
+                    [e.task for e in group], created_by=created_by, project_id=project_id
+                )
+            except Exception as e:
+                results = [SyncResult(False, str(e))] * len(group)
+            for entry, result in zip(group, results):
+                if result.ok:
+                    await asyncio.to_thread(self.outbox.mark_delivered, entry.id)
+                    self._notify(entry, True, None)
+                else:
+                    retryable = is_retryable(result.status_code)
+                    status = await asyncio.to_thread(self.outbox.mark_failed, entry.id, result.error, retryable)
+                    if status == DEAD:
+                        logger.error(
+                            "Vikunja outbox entry %d dropped %s: %s",
+                            entry.id, "after retries" if retryable else "(rejected)", result.error,
+                        )
+                        self._notify(entry, False, result.error)
+        return len(entries)
+
+    def _notify(self, entry: OutboxEntry, ok: bool, error: Optional[str]) -> None:
+        kind = (entry.source or "").split(":", 1)[0]
+        for listener in self._listeners.get(kind, []):
+            try:
+                listener(entry, ok, error)
+            except Exception:
+                logger.exception("Outbox listener failed for entry %d", entry.id)
+
+
+vikunja_outbox = VikunjaOutbox(
+    max_attempts=settings.VIKUNJA_OUTBOX_MAX_ATTEMPTS,
+    backoff_base=settings.VIKUNJA_OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.VIKUNJA_OUTBOX_BACKOFF_MAX_SECONDS,
+)
+outbox_worker = OutboxWorker(
+    vikunja_outbox,
+    batch_size=settings.VIKUNJA_OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.VIKUNJA_OUTBOX_POLL_SECONDS,
+)
+
+
+def active_outbox() -> Optional[VikunjaOutbox]:
+    """The process outbox, or None when VIKUNJA_OUTBOX_ENABLED is off (direct sync)."""
+    return vikunja_outbox if settings.VIKUNJA_OUTBOX_ENABLED else None
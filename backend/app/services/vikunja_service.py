@@ -1,154 +1,536 @@
 import httpx
+import time
+import asyncio
 import logging
+import importlib.util
+from contextlib import asynccontextmanager
+from functools import partial
 
 logger = logging.getLogger(__name__)
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Dict, NamedTuple, Optional, Any
 from app.core.config import settings
-from app.models.schemas import TaskBase
-from thefuzz import process
+from app.models.schemas import HttpPoolStats, TaskBase
+from app.services.user_directory import ResolutionCache, UserDirectory, normalize_name
+from app.services.task_ledger import CREATED, TaskLedger
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class SyncResult(NamedTuple):
+    """Outcome of one task in VikunjaService.create_tasks."""
+    ok: bool
+    error: Optional[str] = None
+    # HTTP status Vikunja rejected the task with; None on success or transport errors
+    status_code: Optional[int] = None
+
+
+class VikunjaRejected(Exception):
+    """Vikunja answered a task creation with a non-2xx status."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Failed to create task (HTTP {status_code})")
+        self.status_code = status_code
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart (rate <= 0 disables it)."""
+
+    def __init__(self, rate_per_second: float = 0.0):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class VikunjaHttpPool:
+    """Process-wide keep-alive client for the Vikunja API.
+
+    Opened and closed by the FastAPI lifespan (see app/main.py). While it is
+    closed (CLI scripts, tests) ``session()`` hands out a short-lived client
+    instead, so callers never need to care which mode they run in.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 10.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests_total = 0
+        self.requests_in_flight = 0
+        self.peak_in_flight = 0
+        self.ephemeral_clients = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def start(self) -> None:
+        if self.is_open:
+            return
+        self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        logger.info(
+            "Vikunja HTTP pool opened (max_connections=%s, http2=%s)",
+            self.limits.max_connections, self.http2,
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Vikunja HTTP pool closed")
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a throwaway one when the pool is not open."""
+        if self.is_open:
+            yield self._client
+            return
+        self.ephemeral_clients += 1
+        async with httpx.AsyncClient(timeout=self.timeout, limits=self.limits) as client:
+            yield client
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Count one request for the usage metrics."""
+        self.requests_total += 1
+        self.requests_in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.requests_in_flight)
+        try:
+            yield
+        finally:
+            self.requests_in_flight -= 1
+
+    def stats(self) -> HttpPoolStats:
+        connections = idle = 0
+        if self.is_open:
+            # httpcore exposes no public pool API; read it defensively
+            pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+            for conn in getattr(pool, "connections", []):
+                connections += 1
+                if conn.is_idle():
+                    idle += 1
+        return HttpPoolStats(
+            open=self.is_open,
+            http2=self.http2,
+            max_connections=self.limits.max_connections,
+            max_keepalive_connections=self.limits.max_keepalive_connections,
+            connections=connections,
+            idle_connections=idle,
+            requests_total=self.requests_total,
+            requests_in_flight=self.requests_in_flight,
+            peak_in_flight=self.peak_in_flight,
+            ephemeral_clients=self.ephemeral_clients,
+        )
+
+
+vikunja_http_pool = VikunjaHttpPool(
+    max_connections=settings.VIKUNJA_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.VIKUNJA_HTTP_MAX_KEEPALIVE,
+    keepalive_expiry=settings.VIKUNJA_HTTP_KEEPALIVE_EXPIRY,
+    http2=settings.VIKUNJA_HTTP2,
+)
+
+
+class CachedResource:
+    """One TTL-cached API payload; concurrent misses share a single load."""
+
+    def __init__(self, loader: Callable[[], Awaitable[Any]], ttl_seconds: float):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._value: Any = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Any:
+        if self._value is not None and time.monotonic() < self._expires_at:
+            return self._value
+        async with self._lock:
+            if self._value is None or time.monotonic() >= self._expires_at:
+                self._value = await self._loader()
+                self._expires_at = time.monotonic() + self.ttl_seconds
+        return self._value
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+
+class ProjectState:
+    """Caches partitioned by Vikunja project: members, their index and resolutions."""
+
+    def __init__(self, project_id: int, directory: UserDirectory, assignee_cache: ResolutionCache):
+        self.project_id = project_id
+        self.user_directory = directory
+        self.assignee_cache = assignee_cache
+
+
+def select_project_id(requested: Optional[int] = None, user_default: Optional[int] = None) -> int:
+    """Target project: explicit request > user's default > VIKUNJA_DEFAULT_PROJECT_ID."""
+    for candidate in (requested, user_default):
+        if candidate is not None:
+            return candidate
+    return settings.VIKUNJA_DEFAULT_PROJECT_ID
+
+
+task_ledger = TaskLedger()
+
 
 class VikunjaService:
-    def __init__(self):
+    def __init__(self, pool: VikunjaHttpPool | None = None, ledger: TaskLedger | None = None):
         self.api_url = settings.VIKUNJA_API_URL.rstrip("/")
         self.token = settings.VIKUNJA_API_TOKEN
-        self.project_id = 2 
+        self.project_id = settings.VIKUNJA_DEFAULT_PROJECT_ID
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json; charset=utf-8"
         }
         self.timeout = 10.0
-        self._users_cache = None
+        self.sync_concurrency = max(1, settings.VIKUNJA_SYNC_CONCURRENCY)
+        self.rate_limiter = RateLimiter(settings.VIKUNJA_RATE_LIMIT_PER_SECOND)
+        self.pool = pool if pool is not None else vikunja_http_pool
+        self._projects: Dict[int, ProjectState] = {}
+        if ledger is None and settings.VIKUNJA_IDEMPOTENCY_ENABLED:
+            ledger = task_ledger
+        self.ledger = ledger
+        # fingerprint -> future of the identical task currently being created
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Account-wide metadata, shared by every project
+        metadata_ttl = settings.VIKUNJA_PROJECT_METADATA_TTL_SECONDS
+        self._self_user = CachedResource(lambda: self._get_json("/user"), metadata_ttl)
+        self._project_list = CachedResource(lambda: self._get_json("/projects"), metadata_ttl)
+        # Vikunja labels belong to the account, not to a project
+        self._label_list = CachedResource(lambda: self._get_json("/labels"), metadata_ttl)
 
-    async def _fetch_users(self) -> List[Dict]:
-        """Busca usuários do projeto para matching."""
-        if self._users_cache is not None:
-            return self._users_cache
-            
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            users_dict = {}
-            # 1. Self
-            try:
-                resp = await client.get(f"{self.api_url}/user", headers=self.headers)
-                if resp.status_code == 200:
-                    u = resp.json()
-                    users_dict[u['id']] = u
-            except httpx.HTTPError as e:
-                logger.warning("Vikunja API error: %s", e)
-            
-            # 2. Project Members
-            try:
-                resp = await client.get(f"{self.api_url}/projects/{self.project_id}/users", headers=self.headers)
-                if resp.status_code == 200:
-                    for u in resp.json():
-                        users_dict[u['id']] = u
-            except httpx.HTTPError as e:
-                logger.warning("Vikunja API error: %s", e)
-            
-            self._users_cache = list(users_dict.values())
-            return self._users_cache
+    def project(self, project_id: Optional[int] = None) -> ProjectState:
+        """Per-project cache partition, created on first use."""
+        pid = self.project_id if project_id is None else project_id
+        state = self._projects.get(pid)
+        if state is None:
+            directory = UserDirectory(
+                partial(self._load_users, pid),
+                ttl_seconds=settings.VIKUNJA_USER_DIRECTORY_TTL_SECONDS,
+            )
+            state = ProjectState(pid, directory, ResolutionCache(settings.VIKUNJA_ASSIGNEE_CACHE_SIZE))
+            self._projects[pid] = state
+        return state
+
+    async def _request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue one Vikunja API call through the shared rate limiter."""
+        await self.rate_limiter.acquire()
+        async with self.pool.track():
+            return await client.request(method, url, headers=self.headers, **kwargs)
+
+    async def _get_json(self, path: str) -> Any:
+        """GET *path*; raises on transport errors and non-200 responses."""
+        async with self.pool.session() as client:
+            resp = await self._request(client, "GET", f"{self.api_url}{path}")
+        resp.raise_for_status()
+        return resp.json()
+
+    async def list_projects(self) -> List[Dict]:
+        return await self._project_list.get()
+
+    async def list_labels(self) -> List[Dict]:
+        return await self._label_list.get()
+
+    async def _load_users(self, project_id: int) -> List[Dict]:
+        """Busca usuários do projeto para matching (loader do UserDirectory)."""
+        users_dict = {}
+        reached_api = False
+        # 1. Self (cached once for all projects)
+        try:
+            u = await self._self_user.get()
+            reached_api = True
+            users_dict[u['id']] = u
+        except httpx.HTTPError as e:
+            logger.warning("Vikunja API error: %s", e)
+
+        # 2. Project Members
+        try:
+            for u in await self._get_json(f"/projects/{project_id}/users"):
+                users_dict[u['id']] = u
+            reached_api = True
+        except httpx.HTTPError as e:
+            logger.warning("Vikunja API error: %s", e)
+
+        if not reached_api:
+            # Let the directory keep its previous snapshot and retry later
+            raise RuntimeError(f"could not load Vikunja users for project {project_id}")
+        return list(users_dict.values())
+
+    async def _fetch_users(self, project_id: Optional[int] = None) -> List[Dict]:
+        return await self.project(project_id).user_directory.users()
 
-    async def _resolve_assignee(self, name: str) -> Optional[int]:
-        """Resolve nome para ID usando logic fuzzy."""
+    async def resolve_assignees(
+        self, names: Iterable[str], project_id: Optional[int] = None
+    ) -> Dict[str, Optional[int]]:
+        """
+        Resolve assignee names to user IDs in one pass over the project's
+        user index. Each distinct normalized name is matched at most once per
+        directory version; repeats are served from the LRU memo.
+        """
+        names = [n for n in names if n]
+        if not names:
+            return {}
+        state = self.project(project_id)
+        index = await state.user_directory.index()
+        resolved: Dict[str, Optional[int]] = {}
+        pending: Dict[str, List[str]] = {}
+        for name in names:
+            if name in resolved:
+                continue
+            query = normalize_name(name)
+            found, user_id = state.assignee_cache.lookup(index.version, query)
+            if found:
+                resolved[name] = user_id
+            else:
+                pending.setdefault(query, []).append(name)
+
+        for query, user_id in index.resolve_many(pending).items():
+            state.assignee_cache.store(index.version, query, user_id)
+            for name in pending[query]:
+                resolved[name] = user_id
+        return resolved
+
+    async def _resolve_assignee(self, name: str, project_id: Optional[int] = None) -> Optional[int]:
+        """Resolve nome para ID usando o índice fuzzy pré-computado."""
         if not name:
             return None
-            
-        users = await self._fetch_users()
-        if not users:
-            return None
-            
-        choices = []
-        user_map = {}
-        for u in users:
-            choice = u.get("name") or u.get("username")
-            if choice:
-                choices.append(choice)
-                user_map[choice] = u["id"]
-        
-        if not choices:
-            return None
-            
-        result = process.extractOne(name, choices)
-        if result and result[1] >= 80:
-            return user_map[result[0]]
-        return None
+        return (await self.resolve_assignees([name], project_id)).get(name)
 
-    async def create_task(self, task_data: TaskBase, created_by: str | None = None) -> bool:
+    async def create_task(
+        self, task_data: TaskBase, created_by: str | None = None, project_id: Optional[int] = None
+    ) -> bool:
         """
-        Cria uma tarefa no projeto alvo.
+        Cria uma tarefa no projeto alvo (default: VIKUNJA_DEFAULT_PROJECT_ID).
         Async port of V1 create_task logic.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            # --- ETAPA 1: Criar a Tarefa ---
-            endpoint = f"{self.api_url}/projects/{self.project_id}/tasks"
-            
-            # Saneamento (Logic Port)
-            title = task_data.title
-            if not title:
-                title = "Sem título"
-                
-            description = task_data.description
-            if not description:
-                description = ""
-            if created_by:
-                description = f"{description}\n\n---\nCreated via MeetingToVikunja by: {created_by}".lstrip("\n")
-
-            priority = task_data.priority
-            # Logic.py had complex priority logic, but Pydantic handles int validation.
-            
-            payload = {
-                "title": title.strip(),
-                "description": description.strip(),
-                "priority": priority
-            }
-
-            # Data de vencimento
-            due_date = task_data.due_date
-            if due_date:
-                due_str = str(due_date).strip()
-                if len(due_str) == 10:
-                    due_str += "T23:59:59Z"
-                elif " " in due_str and "T" not in due_str:
-                    due_str = due_str.replace(" ", "T") + "Z"
-                
-                payload["due_date"] = due_str
-
+        async with self.pool.session() as client:
             try:
-                response = await client.put(endpoint, headers=self.headers, json=payload)
-                
-                if response.status_code not in [200, 201]:
-                    logger.error(f"Erro API (Etapa 1 - Criação): {response.status_code} - {response.text}")
-                    return False
-                
-                new_task = response.json()
-                task_id = new_task.get("id")
-                
-                if not task_id:
-                    logger.error(f"Erro: API não retornou ID para a tarefa '{payload['title']}'")
-                    return False
-
-                # --- ETAPA 2: Atribuir Responsável ---
-                assignee_id = task_data.assignee_id
-                
-                # Se não tem ID mas tem nome, tenta resolver
-                if not assignee_id and task_data.assignee_name:
-                    assignee_id = await self._resolve_assignee(task_data.assignee_name)
-                
-                if assignee_id:
+                return await self._create_task(client, task_data, created_by, project_id=project_id)
+            except VikunjaRejected:
+                return False
+
+    async def create_tasks(
+        self, tasks: List[TaskBase], created_by: str | None = None, project_id: Optional[int] = None
+    ) -> List[SyncResult]:
+        """
+        Bulk variant of create_task: shared pooled client, at most
+        VIKUNJA_SYNC_CONCURRENCY tasks in flight, every call rate limited.
+        Returns a SyncResult per task, in input order.
+        """
+        semaphore = asyncio.Semaphore(self.sync_concurrency)
+
+        async with self.pool.session() as client:
+            # Resolve each distinct assignee name once for the whole batch
+            assignees = await self.resolve_assignees(
+                (t.assignee_name for t in tasks if t.assignee_name and not t.assignee_id), project_id
+            )
+
+            async def create_one(task: TaskBase) -> SyncResult:
+                if task.assignee_name and not task.assignee_id:
+                    task = task.model_copy(update={"assignee_id": assignees.get(task.assignee_name)})
+                async with semaphore:
                     try:
-                        aidInt = int(assignee_id)
-                        assign_endpoint = f"{self.api_url}/tasks/{task_id}/assignees"
-                        assign_payload = {"user_id": aidInt}
-                        
-                        assign_response = await client.put(assign_endpoint, headers=self.headers, json=assign_payload)
-                        
-                        if assign_response.status_code not in [200, 201]:
-                            logger.warning(f"Aviso: Tarefa criada (ID: {task_id}), mas falha ao atribuir usuário {aidInt}.")
-                            logger.error(f"Erro API (Etapa 2): {assign_response.text}")
+                        ok = await self._create_task(
+                            client, task, created_by, assignee_resolved=True, project_id=project_id
+                        )
+                        return SyncResult(ok, None if ok else "Failed to create task")
+                    except VikunjaRejected as e:
+                        return SyncResult(False, str(e), e.status_code)
                     except Exception as e:
-                        logger.error(f"Falha ao tentar atribuir usuário: {e}")
-                
-                return True
+                        return SyncResult(False, str(e))
+
+            return list(await asyncio.gather(*[create_one(t) for t in tasks]))
+
+    async def _find_task_id(self, client: httpx.AsyncClient, project_id: int, title: str) -> Optional[int]:
+        """Look a task up by exact title in *project_id* (reconciles unknown PUT outcomes)."""
+        try:
+            resp = await self._request(client, "GET", f"{self.api_url}/tasks/all", params={"s": title})
+            if resp.status_code != 200:
+                return None
+            matches = [
+                t["id"] for t in resp.json() or []
+                if t.get("project_id") == project_id and (t.get("title") or "").strip() == title
+            ]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning("Vikunja task lookup failed: %s", e)
+            return None
+        return max(matches) if matches else None
+
+    async def _task_exists(self, client: httpx.AsyncClient, task_id: int) -> bool:
+        """False only when Vikunja says the task is gone; errors count as present (no duplicate)."""
+        try:
+            resp = await self._request(client, "GET", f"{self.api_url}/tasks/{task_id}")
+        except httpx.HTTPError as e:
+            logger.warning("Vikunja task check failed: %s", e)
+            return True
+        return resp.status_code != 404
+
+    async def _ledger(self, method: Callable, *args):
+        """Run a (sqlite-backed) ledger call on a worker thread, off the event loop."""
+        return await asyncio.to_thread(method, *args)
 
-            except Exception as e:
-                logger.error(f"Falha crítica no processamento: {e}")
+    async def _already_created(
+        self, client: httpx.AsyncClient, fingerprint: str, project_id: int, title: str
+    ) -> bool:
+        entry = await self._ledger(self.ledger.get, fingerprint)
+        if entry is None:
+            return False
+        if entry.state == CREATED:
+            # Deleted in Vikunja since: let it be created again
+            if entry.task_id is not None and not await self._task_exists(client, entry.task_id):
+                await self._ledger(self.ledger.invalidate, fingerprint)
                 return False
+        else:
+            # A previous PUT timed out or crashed: ask Vikunja before sending it again
+            task_id = await self._find_task_id(client, project_id, title)
+            if task_id is None:
+                return False
+            await self._ledger(self.ledger.mark_created, fingerprint, project_id, title, task_id)
+        self.ledger.skipped += 1
+        logger.info("Skipping already created task '%s' (fingerprint %s)", title, fingerprint[:12])
+        return True
+
+    async def _create_task(
+        self,
+        client: httpx.AsyncClient,
+        task_data: TaskBase,
+        created_by: str | None = None,
+        assignee_resolved: bool = False,
+        project_id: Optional[int] = None,
+    ) -> bool:
+        project_id = self.project_id if project_id is None else project_id
+        if self.ledger is None:
+            return await self._send_task(client, task_data, created_by, assignee_resolved, project_id, None)
+
+        fingerprint = self.ledger.fingerprint(task_data, project_id, created_by)
+        # Identical tasks in flight (same batch, concurrent retries) wait for the first one
+        while fingerprint in self._inflight:
+            await asyncio.shield(self._inflight[fingerprint])
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[fingerprint] = done
+        try:
+            return await self._send_task(client, task_data, created_by, assignee_resolved, project_id, fingerprint)
+        finally:
+            del self._inflight[fingerprint]
+            done.set_result(None)
+
+    async def _send_task(
+        self,
+        client: httpx.AsyncClient,
+        task_data: TaskBase,
+        created_by: str | None,
+        assignee_resolved: bool,
+        project_id: int,
+        fingerprint: str | None,
+    ) -> bool:
+        # --- ETAPA 1: Criar a Tarefa ---
+        endpoint = f"{self.api_url}/projects/{project_id}/tasks"
+        
+        # Saneamento (Logic Port)
+        title = task_data.title
+        if not title:
+            title = "Sem título"
+            
+        description = task_data.description
+        if not description:
+            description = ""
+        if created_by:
+            description = f"{description}\n\n---\nCreated via MeetingToVikunja by: {created_by}".lstrip("\n")
+
+        priority = task_data.priority
+        # Logic.py had complex priority logic, but Pydantic handles int validation.
+        
+        payload = {
+            "title": title.strip(),
+            "description": description.strip(),
+            "priority": priority
+        }
+
+        # Data de vencimento
+        due_date = task_data.due_date
+        if due_date:
+            due_str = str(due_date).strip()
+            if len(due_str) == 10:
+                due_str += "T23:59:59Z"
+            elif " " in due_str and "T" not in due_str:
+                due_str = due_str.replace(" ", "T") + "Z"
+            
+            payload["due_date"] = due_str
+
+        try:
+            if fingerprint is not None:
+                if await self._already_created(client, fingerprint, project_id, payload["title"]):
+                    return True
+                await self._ledger(self.ledger.mark_pending, fingerprint, project_id, payload["title"])
+
+            response = await self._request(client, "PUT", endpoint, json=payload)
+            
+            if response.status_code not in [200, 201]:
+                logger.error(f"Erro API (Etapa 1 - Criação): {response.status_code} - {response.text}")
+                if fingerprint is not None:
+                    await self._ledger(self.ledger.forget, fingerprint)
+                raise VikunjaRejected(response.status_code)
+            
+            new_task = response.json()
+            task_id = new_task.get("id")
+            
+            if not task_id:
+                logger.error(f"Erro: API não retornou ID para a tarefa '{payload['title']}'")
+                # Outcome unclear: release the claim instead of leaving it pending forever
+                if fingerprint is not None:
+                    await self._ledger(self.ledger.forget, fingerprint)
+                return False
+
+            if fingerprint is not None:
+                await self._ledger(self.ledger.mark_created, fingerprint, project_id, payload["title"], task_id)
+
+            # --- ETAPA 2: Atribuir Responsável ---
+            assignee_id = task_data.assignee_id
+            
+            # Se não tem ID mas tem nome, tenta resolver (a menos que o lote já tenha resolvido)
+            if not assignee_id and task_data.assignee_name and not assignee_resolved:
+                assignee_id = await self._resolve_assignee(task_data.assignee_name, project_id)
+            
+            if assignee_id:
+                try:
+                    aidInt = int(assignee_id)
+                    assign_endpoint = f"{self.api_url}/tasks/{task_id}/assignees"
+                    assign_payload = {"user_id": aidInt}
+                    
+                    assign_response = await self._request(client, "PUT", assign_endpoint, json=assign_payload)
+                    
+                    if assign_response.status_code not in [200, 201]:
+                        logger.warning(f"Aviso: Tarefa criada (ID: {task_id}), mas falha ao atribuir usuário {aidInt}.")
+                        logger.error(f"Erro API (Etapa 2): {assign_response.text}")
+                except Exception as e:
+                    logger.error(f"Falha ao tentar atribuir usuário: {e}")
+            
+            return True
+
+        except VikunjaRejected:
+            raise
+        except Exception as e:
+            logger.error(f"Falha crítica no processamento: {e}")
+            return False
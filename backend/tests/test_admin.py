@@ -7,6 +7,7 @@ Covers:
   - PUT /admin/users/{id} (update role / is_active)
   - DELETE /admin/users/{id}
   - POST /admin/users/{id}/reset-password
+  - GET /admin/metrics/vikunja-pool
   - 403 for non-admin users
   - UserManager.update_user / reset_password / delete_user_by_id
 """
@@ -224,6 +225,23 @@ class TestAdminResetPassword:
         assert resp.status_code == 422  # Pydantic validation
 
 
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class TestVikunjaPoolMetrics:
+    def test_admin_reads_pool_stats(self, admin_client):
+        client, _ = admin_client
+        resp = client.get("/api/v1/admin/metrics/vikunja-pool")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert {"open", "http2", "max_connections", "requests_total"} <= body.keys()
+
+    def test_forbidden_for_user(self, user_client):
+        client, _ = user_client
+        assert client.get("/api/v1/admin/metrics/vikunja-pool").status_code == 403
+
+
 # ---------------------------------------------------------------------------
 # Authorization: non-admin must get 403
 # ---------------------------------------------------------------------------
@@ -0,0 +1,192 @@
+"""
+Tests for the content-addressed batch analysis cache.
+
+Covers:
+  - Key derivation (normalization, sensitivity to every input)
+  - TTL expiry and LRU eviction
+  - Seeding from persisted history records
+  - TaskProcessor integration (hits skip Gemini entirely)
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.schemas import AnalysisResponse, TaskBase
+from app.services.analysis_cache import AnalysisCache
+from app.services.glossary_manager import GlossaryManager
+from app.services.history_manager import HistoryManager
+from app.services.task_processor import TaskProcessor
+
+
+MEETING_DATE = datetime(2025, 2, 7, 10, 0, 0)
+
+
+def _key(transcript="Carlos envia o relatório", instructions="", date=MEETING_DATE, glossary="v1", model="m",
+         chunked=False):
+    return AnalysisCache.make_key(transcript, instructions, date, glossary, model, chunked)
+
+
+def _response(title="Enviar relatório"):
+    return AnalysisResponse(tasks=[TaskBase(title=title)], token_count=10, processing_time=5.0)
+
+
+# ---------------------------------------------------------------------------
+# Keying
+# ---------------------------------------------------------------------------
+
+class TestMakeKey:
+    def test_whitespace_differences_share_a_key(self):
+        assert _key("Carlos  envia\r\n\n o relatório ") == _key("Carlos envia\no relatório")
+
+    def test_same_day_shares_a_key(self):
+        assert _key(date=MEETING_DATE) == _key(date=MEETING_DATE + timedelta(hours=3))
+
+    @pytest.mark.parametrize("override", [
+        {"transcript": "outro texto"},
+        {"instructions": "foco em vendas"},
+        {"date": MEETING_DATE + timedelta(days=1)},
+        {"glossary": "v2"},
+        {"model": "other-model"},
+        {"chunked": True},
+    ])
+    def test_every_input_changes_the_key(self, override):
+        assert _key(**override) != _key()
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+class TestGetPut:
+    def test_roundtrip_returns_copy(self):
+        cache = AnalysisCache()
+        cache.put("k", _response())
+        hit = cache.get("k")
+        assert hit.tasks[0].title == "Enviar relatório"
+        hit.tasks[0].title = "mutated"
+        assert cache.get("k").tasks[0].title == "Enviar relatório"
+        assert cache.hits == 2
+
+    def test_miss_counts(self):
+        cache = AnalysisCache()
+        assert cache.get("absent") is None
+        assert cache.misses == 1
+
+    def test_expired_entry_is_dropped(self):
+        cache = AnalysisCache(ttl_seconds=10)
+        cache.put("k", _response(), created_at=time.time() - 20)
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(max_entries=2)
+        cache.put("a", _response("A"))
+        cache.put("b", _response("B"))
+        cache.get("a")  # refresh a
+        cache.put("c", _response("C"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_zero_entries_disables_cache(self):
+        cache = AnalysisCache(max_entries=0)
+        assert cache.put("k", _response()) is False
+        assert cache.get("k") is None
+
+
+class TestSeedFromHistory:
+    def test_seeds_only_fresh_records_with_key(self):
+        now = datetime.now()
+        records = [
+            {"id": "fresh", "cache_key": "k1", "timestamp": now.isoformat(),
+             "source_files": ["a.txt"], "file_count": 1, "token_count": 7, "processing_time": 2.0,
+             "analysis": {"tasks": [{"title": "T1"}]}, "chunks": [], "compression": None},
+            {"id": "stale", "cache_key": "k2", "timestamp": (now - timedelta(days=3)).isoformat(),
+             "analysis": {"tasks": []}, "chunks": []},
+            {"id": "legacy", "timestamp": now.isoformat(), "analysis": {"tasks": []}},
+            # Saved before the reports were persisted: a hit could not restore them
+            {"id": "no-reports", "cache_key": "k4", "timestamp": now.isoformat(), "analysis": {"tasks": []}},
+            {"id": "broken", "cache_key": "k3", "timestamp": "not-a-date", "chunks": []},
+        ]
+        cache = AnalysisCache(ttl_seconds=86400)
+        assert cache.seed_from_history(records) == 1
+        hit = cache.get("k1")
+        assert hit.tasks[0].title == "T1"
+        assert hit.file_names == ["a.txt"]
+        assert cache.get("k4") is None
+
+    @pytest.mark.asyncio
+    async def test_seeded_hit_keeps_chunk_and_compression_reports(self, processor):
+        fresh = await processor.process_files(
+            [], meeting_date=MEETING_DATE, text_context="né, Carlos envia o relatório", chunked=True, compress=True
+        )
+        assert fresh.chunks and fresh.compression is not None
+        record = HistoryManager._build_record(fresh, "m")
+
+        cache = AnalysisCache()
+        assert cache.seed_from_history([json.loads(json.dumps(record))]) == 1
+        seeded = cache.get(fresh.cache_key)
+        assert seeded.chunks == fresh.chunks
+        assert seeded.compression == fresh.compression
+
+
+# ---------------------------------------------------------------------------
+# TaskProcessor integration
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def processor(tmp_path):
+    proc = TaskProcessor()
+    proc.glossary_manager = GlossaryManager(file_path=str(tmp_path / "glossary.json"))
+    proc.client = MagicMock()
+    proc.client.aio.models.generate_content = AsyncMock(
+        return_value=SimpleNamespace(text=json.dumps([{"title": "Enviar relatório"}]))
+    )
+    return proc
+
+
+class TestProcessorCache:
+    @pytest.mark.asyncio
+    async def test_repeat_analysis_is_served_from_cache(self, processor):
+        first = await processor.process_files([], meeting_date=MEETING_DATE, text_context="Carlos envia o relatório")
+        second = await processor.process_files([], meeting_date=MEETING_DATE, text_context="Carlos  envia o relatório\n")
+
+        processor.client.aio.models.generate_content.assert_awaited_once()
+        assert first.cached is False
+        assert second.cached is True
+        assert second.tasks == first.tasks
+        assert second.cache_key == first.cache_key
+
+    @pytest.mark.asyncio
+    async def test_chunked_and_single_prompt_results_are_kept_apart(self, processor):
+        single = await processor.process_files([], meeting_date=MEETING_DATE, text_context="Carlos envia o relatório")
+        chunked = await processor.process_files(
+            [], meeting_date=MEETING_DATE, text_context="Carlos envia o relatório", chunked=True
+        )
+        assert chunked.cached is False
+        assert chunked.cache_key != single.cache_key
+        again = await processor.process_files(
+            [], meeting_date=MEETING_DATE, text_context="Carlos envia o relatório", chunked=False
+        )
+        assert again.cached is True and again.chunks == []
+
+    @pytest.mark.asyncio
+    async def test_glossary_change_invalidates(self, processor):
+        await processor.process_files([], meeting_date=MEETING_DATE, text_context="texto")
+        processor.glossary_manager.add_term("Vikunja", ["Vicunha"])
+        await processor.process_files([], meeting_date=MEETING_DATE, text_context="texto")
+        assert processor.client.aio.models.generate_content.await_count == 2
+
+    def test_cache_key_not_serialized(self):
+        response = _response()
+        response.cache_key = "secret"
+        assert "cache_key" not in response.model_dump()
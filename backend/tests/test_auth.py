@@ -5,6 +5,8 @@ Covers:
   - Password hashing & verification (bcrypt)
   - JWT encoding & decoding
   - UserManager CRUD and ensure_admin_exists()
+  - UserManager in-memory registry (mtime invalidation, write-through)
+  - Verified-principal cache (TTL, bound, invalidation on user changes)
   - Auth endpoint /auth/login
 """
 
@@ -24,7 +26,7 @@ from fastapi.testclient import TestClient
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.core.config import settings
-from app.core.security import create_access_token, decode_access_token
+from app.core.security import PrincipalCache, authenticate_token, create_access_token, decode_access_token
 from app.models.auth_schemas import User, UserCreate
 from app.services.user_manager import UserManager
 
@@ -176,6 +178,150 @@ class TestUserManager:
             assert entry.get("hashed_password", "").startswith("$2b$")
 
 
+# ---------------------------------------------------------------------------
+# In-memory registry
+# ---------------------------------------------------------------------------
+
+class TestUserRegistry:
+    def test_lookups_do_not_reread_the_file(self, seeded_manager):
+        seeded_manager.get_user("admin_test")
+        with patch.object(Path, "read_text", side_effect=AssertionError("users.json re-read")):
+            assert seeded_manager.get_user("regular_user").role == "user"
+            user_id = seeded_manager.get_user("admin_test").id
+            assert seeded_manager.get_user_by_id(user_id).username == "admin_test"
+            assert seeded_manager.get_user("ghost") is None
+            assert len(seeded_manager.list_users()) == 2
+
+    def test_own_writes_refresh_without_rereading(self, seeded_manager):
+        from app.models.auth_schemas import UserUpdate
+
+        user = seeded_manager.get_user("regular_user")
+        with patch.object(Path, "read_text", side_effect=AssertionError("users.json re-read")):
+            seeded_manager.update_user(user.id, UserUpdate(role="admin"))
+            assert seeded_manager.get_user("regular_user").role == "admin"
+            seeded_manager.delete_user("admin_test")
+            assert seeded_manager.get_user("admin_test") is None
+
+    def test_external_change_is_picked_up(self, seeded_manager):
+        seeded_manager.get_user("admin_test")
+        other = UserManager()
+        other.USERS_FILE = seeded_manager.USERS_FILE
+        other.create_user(UserCreate(username="from_elsewhere", password="T3stP@ss!", role="user"))
+        assert seeded_manager.get_user("from_elsewhere") is not None
+
+    def test_hand_edit_is_picked_up(self, seeded_manager):
+        assert seeded_manager.get_user("regular_user").is_active is True
+        raw = json.loads(seeded_manager.USERS_FILE.read_text(encoding="utf-8"))
+        for entry in raw:
+            entry["is_active"] = False
+        seeded_manager.USERS_FILE.write_text(json.dumps(raw, indent=4), encoding="utf-8")
+        assert seeded_manager.get_user("regular_user").is_active is False
+
+    def test_failed_write_leaves_registry_intact(self, seeded_manager):
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                seeded_manager.create_user(UserCreate(username="lost", password="T3stP@ss!", role="user"))
+        assert seeded_manager.get_user("lost") is None
+        assert len(seeded_manager.list_users()) == 2
+
+
+# ---------------------------------------------------------------------------
+# Verified-principal cache
+# ---------------------------------------------------------------------------
+
+def _user(user_id="u1", username="alice"):
+    return User(id=user_id, username=username, hashed_password="x", role="user",
+                is_active=True, created_at=datetime.now().isoformat())
+
+
+class TestPrincipalCache:
+    def test_hit_and_ttl(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.put("tok", _user())
+        assert cache.get("tok").username == "alice"
+        with patch("app.core.security.time.time", return_value=datetime.now().timestamp() + 31):
+            assert cache.get("tok") is None
+
+    def test_token_expiry_caps_the_ttl(self):
+        cache = PrincipalCache(ttl_seconds=3600)
+        cache.put("tok", _user(), token_expires_at=datetime.now().timestamp() - 1)
+        assert cache.get("tok") is None
+
+    def test_size_bound_evicts_least_recent(self):
+        cache = PrincipalCache(max_entries=2)
+        cache.put("a", _user("1"))
+        cache.put("b", _user("2"))
+        cache.get("a")
+        cache.put("c", _user("3"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+    def test_invalidate_user_drops_all_their_tokens(self):
+        cache = PrincipalCache()
+        cache.put("t1", _user("1"))
+        cache.put("t2", _user("1"))
+        cache.put("t3", _user("2"))
+        cache.invalidate_user("1")
+        assert cache.get("t1") is None and cache.get("t2") is None
+        assert cache.get("t3") is not None
+
+    def test_disabled(self):
+        cache = PrincipalCache(max_entries=0)
+        cache.put("tok", _user())
+        assert cache.get("tok") is None
+
+    def test_tokens_are_stored_hashed(self):
+        cache = PrincipalCache()
+        cache.put("secret-token", _user())
+        assert "secret-token" not in cache._entries
+
+
+class TestAuthenticateToken:
+    @pytest.fixture(autouse=True)
+    def _patched(self, seeded_manager):
+        self.mgr = seeded_manager
+        self.token = create_access_token({"sub": "regular_user", "role": "user"})
+        with patch("app.services.user_manager.user_manager", seeded_manager):
+            yield
+
+    def test_second_call_skips_decode(self):
+        assert authenticate_token(self.token).username == "regular_user"
+        with patch("app.core.security.decode_access_token", side_effect=AssertionError("decoded again")):
+            assert authenticate_token(self.token).username == "regular_user"
+        assert self.mgr.principals.hits == 1
+
+    def test_deactivation_takes_effect_immediately(self):
+        from fastapi import HTTPException
+        from app.models.auth_schemas import UserUpdate
+
+        user = authenticate_token(self.token)
+        self.mgr.update_user(user.id, UserUpdate(is_active=False))
+        with pytest.raises(HTTPException) as exc:
+            authenticate_token(self.token)
+        assert exc.value.status_code == 403
+
+    def test_delete_and_reset_invalidate(self):
+        from fastapi import HTTPException
+
+        user = authenticate_token(self.token)
+        self.mgr.reset_password(user.id, "N3wP@ssword")
+        assert len(self.mgr.principals) == 0
+        authenticate_token(self.token)
+        self.mgr.delete_user_by_id(user.id)
+        with pytest.raises(HTTPException) as exc:
+            authenticate_token(self.token)
+        assert exc.value.status_code == 401
+
+    def test_rejected_tokens_are_not_cached(self):
+        from fastapi import HTTPException
+
+        ghost = create_access_token({"sub": "ghost", "role": "user"})
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                authenticate_token(ghost)
+        assert len(self.mgr.principals) == 0
+
+
 # ---------------------------------------------------------------------------
 # ensure_admin_exists()
 # ---------------------------------------------------------------------------
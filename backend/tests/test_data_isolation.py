@@ -351,3 +351,53 @@ class TestEndpointProtection:
             headers=self._auth(self.bob_token),
         )
         assert resp.status_code == 403
+
+    # --- Paginated listings ---
+    def test_history_pages_with_next_cursor_header(self):
+        first = self.client.get("/api/v1/history?limit=2", headers=self._auth(self.admin_token))
+        assert [h["id"] for h in first.json()] == ["hist-bob-1", "hist-alice-2"]
+        cursor = first.headers["X-Next-Cursor"]
+        second = self.client.get(f"/api/v1/history?limit=2&cursor={cursor}", headers=self._auth(self.admin_token))
+        assert [h["id"] for h in second.json()] == ["hist-alice-1"]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_history_text_and_date_filters(self):
+        resp = self.client.get("/api/v1/history?q=B.TXT", headers=self._auth(self.admin_token))
+        assert [h["id"] for h in resp.json()] == ["hist-alice-2"]
+        resp = self.client.get(
+            "/api/v1/history?since=2026-01-02&until=2026-01-03", headers=self._auth(self.admin_token)
+        )
+        assert [h["id"] for h in resp.json()] == ["hist-alice-2"]
+
+    def test_conversations_ascending_and_title_filter(self):
+        resp = self.client.get("/api/v1/conversations?order=asc", headers=self._auth(self.admin_token))
+        assert [c["id"] for c in resp.json()] == ["conv-alice-1", "conv-alice-2", "conv-bob-1"]
+        resp = self.client.get("/api/v1/conversations?q=task%20b1", headers=self._auth(self.admin_token))
+        assert [c["id"] for c in resp.json()] == ["conv-bob-1"]
+
+    def test_conversations_agent_type_filter_pages_on_the_server(self):
+        first = self.client.get("/api/v1/conversations?agent_type=live&limit=1", headers=self._auth(self.admin_token))
+        assert [c["id"] for c in first.json()] == ["conv-bob-1"]
+        cursor = first.headers["X-Next-Cursor"]
+        second = self.client.get(
+            f"/api/v1/conversations?agent_type=live&limit=1&cursor={cursor}", headers=self._auth(self.admin_token)
+        )
+        assert [c["id"] for c in second.json()] == ["conv-alice-1"]
+        assert "X-Next-Cursor" not in second.headers
+        resp = self.client.get("/api/v1/conversations?agent_type=standard", headers=self._auth(self.admin_token))
+        assert [c["id"] for c in resp.json()] == ["conv-alice-2"]
+        resp = self.client.get("/api/v1/conversations?agent_type=other", headers=self._auth(self.admin_token))
+        assert resp.status_code == 422
+
+    def test_admin_can_filter_by_owner(self):
+        resp = self.client.get(f"/api/v1/conversations?owner_id={self.bob.id}", headers=self._auth(self.admin_token))
+        assert [c["id"] for c in resp.json()] == ["conv-bob-1"]
+
+    def test_owner_param_cannot_widen_a_users_view(self):
+        resp = self.client.get(f"/api/v1/history?owner_id={self.bob.id}", headers=self._auth(self.alice_token))
+        assert "hist-bob-1" not in [h["id"] for h in resp.json()]
+        assert len(resp.json()) == 2
+
+    def test_invalid_cursor_is_400(self):
+        resp = self.client.get("/api/v1/history?cursor=garbage", headers=self._auth(self.admin_token))
+        assert resp.status_code == 400
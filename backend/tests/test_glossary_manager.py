@@ -0,0 +1,179 @@
+"""
+Tests for GlossaryManager: persistence, prompt rules and the compiled matcher.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.services.glossary_manager import GlossaryManager
+
+
+@pytest.fixture()
+def glossary(tmp_path):
+    mgr = GlossaryManager(file_path=str(tmp_path / "glossary.json"))
+    mgr.save({
+        "Hankell": ["Rankel", "Ranquel", "Hankel"],
+        "APN": ["PN", "A.P.N."],
+        "Datatem": ["Data tem", "Dataten"],
+    })
+    return mgr
+
+
+class TestPersistence:
+    def test_seed_written_when_missing(self, tmp_path):
+        path = tmp_path / "sub" / "glossary.json"
+        mgr = GlossaryManager(file_path=str(path))
+        assert path.exists()
+        assert "Hankell" in mgr.load()
+
+    def test_add_and_remove_term(self, glossary):
+        glossary.add_term("Odoo", ["Odo"])
+        assert glossary.load()["Odoo"] == ["Odo"]
+        glossary.remove_term("Odoo")
+        assert "Odoo" not in json.loads(Path(glossary.file_path).read_text(encoding="utf-8"))
+
+    def test_callers_keep_ownership_of_their_dicts(self, glossary):
+        data = {"APN": ["PN"]}
+        glossary.save(data)
+        data["APN"].append("A pena")
+        data["Odoo"] = ["Odo"]
+        returned = glossary.add_term("Hankell", ["Rankel"])
+        returned.pop("APN")
+        assert glossary.load() == {"APN": ["PN"], "Hankell": ["Rankel"]}
+
+    @pytest.mark.parametrize("breakage", ["corrupt", "missing"])
+    def test_seed_fallback_is_cached(self, glossary, breakage):
+        path = Path(glossary.file_path)
+        if breakage == "corrupt":
+            path.write_text("{not json", encoding="utf-8")
+        else:
+            path.unlink()
+        with patch.object(settings, "GLOSSARY_RELOAD_CHECK_SECONDS", 0):
+            fallback = glossary._current()
+            assert "Hankell" in fallback.data and "Odoo" in fallback.data
+            assert glossary._current() is fallback
+            glossary.save({"APN": ["PN"]})
+            assert glossary.load() == {"APN": ["PN"]}
+
+
+class TestPromptRules:
+    def test_all_rules(self, glossary):
+        rules = glossary.get_prompt_rules()
+        assert rules.count("- Se ouvir:") == 3
+        assert "- Se ouvir: Rankel, Ranquel, Hankel -> Escreva: Hankell" in rules
+
+    def test_only_selected_terms(self, glossary):
+        rules = glossary.get_prompt_rules({"APN"})
+        assert rules == "- Se ouvir: PN, A.P.N. -> Escreva: APN"
+
+    def test_empty_selection(self, glossary):
+        assert glossary.get_prompt_rules(set()) == ""
+
+
+class TestNormalizeText:
+    def test_variations_rewritten(self, glossary):
+        text, matched = glossary.normalize_text("O rankel falou com a Data tem sobre o pn.")
+        assert text == "O Hankell falou com a Datatem sobre o APN."
+        assert matched == {"Hankell", "Datatem", "APN"}
+
+    def test_whole_words_only(self, glossary):
+        text, matched = glossary.normalize_text("Open Ranqueling e PNG")
+        assert text == "Open Ranqueling e PNG"
+        assert matched == set()
+
+    def test_canonical_terms_reported(self, glossary):
+        text, matched = glossary.normalize_text("Hankell confirmou")
+        assert text == "Hankell confirmou"
+        assert matched == {"Hankell"}
+
+    def test_punctuated_variation(self, glossary):
+        text, _ = glossary.normalize_text("Contrato A.P.N. assinado")
+        assert text == "Contrato APN assinado"
+
+    def test_matcher_rebuilt_after_edit(self, glossary):
+        glossary.normalize_text("warm up")
+        glossary.add_term("Vikunja", ["Vicunha"])
+        text, matched = glossary.normalize_text("abre no vicunha")
+        assert text == "abre no Vikunja"
+        assert matched == {"Vikunja"}
+
+    def test_empty_glossary(self, tmp_path):
+        mgr = GlossaryManager(file_path=str(tmp_path / "g.json"))
+        mgr.save({})
+        assert mgr.normalize_text("qualquer texto") == ("qualquer texto", set())
+
+
+class TestVersioning:
+    def test_version_is_the_rules_hash(self, glossary):
+        import hashlib
+
+        # Same value the analysis cache keys were built from before versions existed
+        assert glossary.version == hashlib.sha256(glossary.get_prompt_rules().encode("utf-8")).hexdigest()
+
+    def test_version_tracks_content(self, glossary):
+        before = glossary.version
+        assert GlossaryManager(file_path=glossary.file_path).version == before
+        glossary.add_term("Odoo", ["Odo"])
+        assert glossary.version != before
+        glossary.remove_term("Odoo")
+        assert glossary.version == before
+
+    def test_rules_and_matcher_memoized(self, glossary):
+        rules = glossary.get_prompt_rules({"APN", "Hankell"})
+        glossary.normalize_text("warm up")
+        matcher = glossary._current().matcher()
+        with patch("builtins.open", side_effect=AssertionError("glossary re-read")):
+            assert glossary.get_prompt_rules({"Hankell", "APN"}) is rules
+            assert glossary.get_prompt_rules() is glossary.get_prompt_rules()
+            assert glossary._current().matcher() is matcher
+
+    def test_concurrent_subset_memo(self, glossary):
+        compiled = glossary._current()
+        subsets = [{"APN"}, {"Hankell"}, {"Datatem"}, {"APN", "Datatem"}]
+        expected = [compiled._format(t for t in compiled.data if t in s) for s in subsets]
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(200):
+                    for subset, rules in zip(subsets, expected):
+                        assert compiled.rules_for(subset) == rules
+            except Exception as exc:
+                errors.append(exc)
+
+        with patch("app.services.glossary_manager._MAX_MEMOIZED_SUBSETS", 2):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert errors == []
+        assert len(compiled._subsets) <= 2
+
+    def test_file_not_statted_on_every_call(self, glossary):
+        glossary.load()
+        with patch("os.stat", side_effect=AssertionError("glossary stat'ed")):
+            glossary.get_prompt_rules()
+            glossary.normalize_text("o rankel")
+
+    def test_save_is_visible_to_other_managers_at_once(self, glossary):
+        other = GlossaryManager(file_path=glossary.file_path)
+        other.load()
+        glossary.add_term("Vikunja", ["Vicunha"])
+        assert "Vikunja" in other.load()
+        assert other.version == glossary.version
+
+    def test_hand_edit_picked_up_after_recheck_interval(self, glossary):
+        before = glossary.version
+        Path(glossary.file_path).write_text(json.dumps({"Odoo": ["Odo", "Hoodoo"]}), encoding="utf-8")
+        with patch.object(settings, "GLOSSARY_RELOAD_CHECK_SECONDS", 0):
+            assert glossary.load() == {"Odoo": ["Odo", "Hoodoo"]}
+            assert glossary.version != before
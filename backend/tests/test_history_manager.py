@@ -14,6 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.models.schemas import AnalysisResponse, TaskBase
 from app.services.history_manager import HistoryManager
+from app.services.record_codec import read_record
 
 
 @pytest.fixture
@@ -217,3 +218,31 @@ class TestSaveFailureIsolation:
             manager = HistoryManager()
             with pytest.raises(Exception):
                 manager.save(sample_response)
+
+
+class TestCacheKeyPersistence:
+    def test_cache_key_recorded_when_present(self, tmp_history_dir, sample_response):
+        sample_response.cache_key = "abc123"
+        manager = HistoryManager()
+        path = manager.save(sample_response)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["cache_key"] == "abc123"
+
+    def test_iter_recent_records_reads_only_the_newest(self, tmp_history_dir, sample_response):
+        manager = HistoryManager()
+        for stamp in ("2026-01-01T10:00:00", "2026-01-02T10:00:00", "2026-01-03T10:00:00"):
+            with patch("app.services.history_manager.datetime") as fake_now:
+                fake_now.now.return_value = datetime.fromisoformat(stamp)
+                manager.save(sample_response)
+        with patch("app.services.history_manager.read_record", wraps=read_record) as reads:
+            records = list(manager.iter_recent_records("2026-01-02T00:00:00", limit=1))
+        assert [r["timestamp"] for r in records] == ["2026-01-03T10:00:00"]
+        assert reads.call_count == 1
+
+    def test_iter_records_skips_corrupt_files(self, tmp_history_dir, sample_response):
+        manager = HistoryManager()
+        manager.save(sample_response)
+        (tmp_history_dir / "broken.json").write_text("{not json", encoding="utf-8")
+        records = list(manager.iter_records())
+        assert len(records) == 1
+        assert "cache_key" not in records[0]
@@ -0,0 +1,180 @@
+"""
+Tests for off-loop password hashing (PasswordHasher), the per-username /
+per-client login throttle, their wiring into /auth/login and the admin
+password endpoints, and the benchmark-login command.
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import bcrypt
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.security import create_access_token
+from app.models.auth_schemas import UserCreate
+from app.services.password_hasher import LoginThrottle, LoginThrottled, PasswordHasher, benchmark_logins
+from app.services.user_manager import UserManager
+
+
+@pytest.fixture()
+def hasher():
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    yield hasher
+    hasher.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# PasswordHasher
+# ---------------------------------------------------------------------------
+
+class TestPasswordHasher:
+    def test_cost_factor_is_configurable(self, hasher):
+        hashed = hasher.hash("s3cret")
+        assert hashed.startswith("$2b$04$")
+        assert hasher.verify("s3cret", hashed)
+
+    def test_hashes_of_another_cost_still_verify(self, hasher):
+        legacy = bcrypt.hashpw(b"s3cret", bcrypt.gensalt(rounds=5)).decode()
+        assert hasher.verify("s3cret", legacy)
+        assert not hasher.verify("wrong", legacy)
+
+    def test_malformed_hash_fails_verification(self, hasher):
+        assert hasher.verify("s3cret", "not-a-bcrypt-hash") is False
+
+    def test_async_methods_run_on_the_bcrypt_pool(self, hasher):
+        threads = []
+        original = PasswordHasher.verify
+
+        def recording_verify(plain, hashed):
+            threads.append(threading.current_thread().name)
+            return original(plain, hashed)
+
+        async def run():
+            hashed = await hasher.hash_async("s3cret")
+            with patch.object(hasher, "verify", recording_verify):
+                return await hasher.verify_async("s3cret", hashed)
+
+        assert asyncio.run(run()) is True
+        assert threads and threads[0].startswith("bcrypt")
+
+    def test_pool_is_recreated_after_shutdown(self, hasher):
+        asyncio.run(hasher.hash_async("a"))
+        hasher.shutdown()
+        assert hasher.verify("a", asyncio.run(hasher.hash_async("a")))
+
+
+# ---------------------------------------------------------------------------
+# LoginThrottle
+# ---------------------------------------------------------------------------
+
+class TestLoginThrottle:
+    def test_rejects_beyond_the_per_username_limit(self):
+        throttle = LoginThrottle(per_username=1, per_client=10)
+        with throttle.slot("Alice", "10.0.0.1"):
+            with pytest.raises(LoginThrottled):
+                with throttle.slot("alice", "10.0.0.2"):
+                    pass
+            with throttle.slot("bob", "10.0.0.1"):
+                pass
+        assert throttle.rejected == 1
+
+    def test_rejects_beyond_the_per_client_limit(self):
+        throttle = LoginThrottle(per_username=10, per_client=2)
+        with throttle.slot("a", "10.0.0.1"), throttle.slot("b", "10.0.0.1"):
+            with pytest.raises(LoginThrottled):
+                with throttle.slot("c", "10.0.0.1"):
+                    pass
+            with throttle.slot("c", "10.0.0.2"):
+                pass
+
+    def test_slots_are_released_even_on_error(self):
+        throttle = LoginThrottle(per_username=1, per_client=1)
+        with pytest.raises(RuntimeError):
+            with throttle.slot("alice", "10.0.0.1"):
+                raise RuntimeError
+        assert throttle.in_flight("user:alice") == 0
+        assert throttle._in_flight == {}
+
+    def test_zero_disables_a_limit(self):
+        throttle = LoginThrottle(per_username=0, per_client=0)
+        with throttle.slot("alice", None), throttle.slot("alice", None):
+            assert throttle.in_flight("user:alice") == 2
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+class TestEndpoints:
+    @pytest.fixture(autouse=True)
+    def _setup_app(self, tmp_path):
+        mgr = UserManager()
+        mgr.USERS_FILE = tmp_path / "users.json"
+        mgr.create_user(UserCreate(username="testadmin", password="Adm1nP@ss", role="admin"))
+        throttle = LoginThrottle(per_username=1, per_client=10)
+        with patch("app.services.user_manager.user_manager", mgr), \
+             patch("app.api.endpoints.auth.user_manager", mgr), \
+             patch("app.api.endpoints.admin.user_manager", mgr), \
+             patch("app.api.endpoints.auth.login_throttle", throttle):
+            from app.main import app
+            self.client = TestClient(app)
+            self.mgr = mgr
+            self.throttle = throttle
+            yield
+
+    def _admin_headers(self):
+        return {"Authorization": f"Bearer {create_access_token({'sub': 'testadmin', 'role': 'admin'})}"}
+
+    def test_login_verifies_off_the_event_loop(self):
+        with patch.object(UserManager, "verify_password", side_effect=AssertionError("blocking verify")):
+            resp = self.client.post("/api/v1/auth/login", json={"username": "testadmin", "password": "Adm1nP@ss"})
+        assert resp.status_code == 200
+
+    def test_login_over_the_limit_gets_429(self):
+        with self.throttle.slot("testadmin", None):
+            resp = self.client.post("/api/v1/auth/login", json={"username": "TestAdmin", "password": "Adm1nP@ss"})
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "1"
+        # The slot is free again afterwards
+        resp = self.client.post("/api/v1/auth/login", json={"username": "testadmin", "password": "Adm1nP@ss"})
+        assert resp.status_code == 200
+
+    def test_admin_create_and_reset_hash_off_the_event_loop(self):
+        with patch.object(UserManager, "hash_password", side_effect=AssertionError("blocking hash")):
+            created = self.client.post(
+                "/api/v1/admin/users", headers=self._admin_headers(),
+                json={"username": "newbie", "password": "N3wbieP@ss", "role": "user"},
+            )
+            assert created.status_code == 201
+            reset = self.client.post(
+                f"/api/v1/admin/users/{created.json()['id']}/reset-password", headers=self._admin_headers(),
+                json={"new_password": "An0therP@ss"},
+            )
+            assert reset.status_code == 200
+        user = self.mgr.get_user("newbie")
+        assert UserManager.verify_password("An0therP@ss", user.hashed_password)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+class TestBenchmark:
+    def test_pool_keeps_the_event_loop_responsive(self, hasher):
+        inline, pooled = asyncio.run(benchmark_logins(hasher, attempts=4, concurrency=4))
+        assert inline.attempts == pooled.attempts == 4
+        assert pooled.per_second > 0
+        assert pooled.mode == "pool (2 workers)"
+
+    def test_cli_command(self, capsys):
+        from app import cli
+
+        assert cli.main(["benchmark-login", "--attempts", "2", "--concurrency", "2", "--rounds", "4"]) == 0
+        out = capsys.readouterr().out
+        assert "inline (event loop)" in out and "max loop lag ms" in out
@@ -216,7 +216,8 @@ class TestUserIdHook:
             vikunja_service=mock_vs,
         )
 
-        files = list(conversations_dir.glob("*.json"))
+        # Owned records live in the owner's partition
+        files = list((conversations_dir / "user-42").glob("*.json"))
         data = json.loads(files[0].read_text(encoding="utf-8"))
         assert data["owner_id"] == "user-42"
 
@@ -248,6 +249,31 @@ class TestVikunjaSync:
         assert task_arg.title == "Enviar relatório mensal"
         assert task_arg.assignee_name == "Carlos"
 
+    @pytest.mark.asyncio
+    async def test_sync_targets_user_default_project(self, mock_cm, mock_vs, sync_request):
+        await save_conversation(
+            sync_request,
+            agent_type="live",
+            agent_version="v1",
+            default_project_id=7,
+            conversation_manager=mock_cm,
+            vikunja_service=mock_vs,
+        )
+        assert mock_vs.create_task.call_args.kwargs["project_id"] == 7
+
+    @pytest.mark.asyncio
+    async def test_request_project_overrides_user_default(self, mock_cm, mock_vs, sync_request):
+        sync_request.project_id = 9
+        await save_conversation(
+            sync_request,
+            agent_type="live",
+            agent_version="v1",
+            default_project_id=7,
+            conversation_manager=mock_cm,
+            vikunja_service=mock_vs,
+        )
+        assert mock_vs.create_task.call_args.kwargs["project_id"] == 9
+
     @pytest.mark.asyncio
     async def test_sync_failure_captures_error(self, mock_cm, mock_vs, sync_request):
         mock_vs.create_task = AsyncMock(side_effect=ConnectionError("Vikunja unreachable"))
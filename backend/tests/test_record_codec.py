@@ -0,0 +1,192 @@
+"""
+Tests for the on-disk record encodings (RecordCodec), the migration and
+benchmark helpers, and their use by HistoryManager, ConversationManager and
+the maintenance CLI.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.conversation_manager import ConversationManager
+from app.services.history_manager import HistoryManager
+from app.services.record_codec import (
+    RecordCodec,
+    benchmark_codecs,
+    benchmark_variants,
+    find_record_file,
+    migrate_directory,
+    read_record,
+    record_files,
+    record_stem,
+)
+
+
+def _record(turns=50):
+    return {
+        "id": "20260101-100000-abcd",
+        "timestamp": "2026-01-01T10:00:00",
+        "transcript": [{"role": "user", "content": f"Fala número {i} sobre o relatório"} for i in range(turns)],
+        "task_draft": {"title": "Enviar relatório"},
+    }
+
+
+@pytest.fixture()
+def records_dir(tmp_path):
+    directory = tmp_path / "records"
+    directory.mkdir()
+    return directory
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+class TestRecordCodec:
+    def test_default_is_the_original_pretty_json(self, records_dir):
+        path = RecordCodec().write(records_dir, "r", _record())
+        assert path.name == "r.json"
+        assert path.read_text(encoding="utf-8") == json.dumps(_record(), ensure_ascii=False, indent=2)
+
+    def test_compact_is_smaller_and_round_trips(self, records_dir):
+        pretty = RecordCodec().encode(_record())[0]
+        compact, suffix = RecordCodec(compact=True).encode(_record())
+        assert suffix == ".json" and len(compact) < len(pretty)
+        assert read_record(RecordCodec(compact=True).write(records_dir, "r", _record())) == _record()
+
+    def test_compression_above_threshold_only(self, records_dir):
+        codec = RecordCodec(compact=True, compression="gzip", min_bytes=1024)
+        big = codec.write(records_dir, "big", _record(turns=100))
+        small = codec.write(records_dir, "small", _record(turns=1))
+        assert big.name == "big.json.gz" and small.name == "small.json"
+        assert json.loads(gzip.decompress(big.read_bytes())) == _record(turns=100)
+        assert read_record(big) == _record(turns=100)
+
+    def test_rewrite_in_another_encoding_replaces_the_old_file(self, records_dir):
+        RecordCodec().write(records_dir, "r", _record())
+        RecordCodec(compression="gzip", min_bytes=0).write(records_dir, "r", _record())
+        assert sorted(p.name for p in records_dir.iterdir()) == ["r.json.gz"]
+        assert find_record_file(records_dir, "r") == records_dir / "r.json.gz"
+
+    def test_zstd_falls_back_to_gzip_without_the_package(self):
+        with patch("app.services.record_codec.ZSTD_AVAILABLE", False):
+            assert RecordCodec(compression="zstd").compression == "gzip"
+
+    def test_unknown_compression_rejected(self):
+        with pytest.raises(ValueError):
+            RecordCodec(compression="brotli")
+
+    def test_record_names(self, records_dir):
+        assert record_stem("a.json") == "a"
+        assert record_stem("a.json.gz") == "a"
+        assert record_stem("a.json.zst") == "a"
+        assert record_stem("a.json.tmp") is None
+        assert record_stem("_index.sqlite3") is None
+        (records_dir / "x.json.gz.tmp").write_bytes(b"")
+        RecordCodec().write(records_dir, "y", {})
+        assert list(record_files(records_dir)) == ["y"]
+
+
+# ---------------------------------------------------------------------------
+# Managers read and write every encoding
+# ---------------------------------------------------------------------------
+
+class TestManagersWithCompactStorage:
+    def test_conversation_save_get_update_list(self, tmp_path):
+        codec = RecordCodec(compact=True, compression="gzip", min_bytes=0)
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", tmp_path / "conversations"):
+            manager = ConversationManager(codec=codec)
+            path = manager.save({**_record(), "session_id": "abcd1234"})
+            assert path.name.endswith(".json.gz")
+            assert manager.get_by_id("20260101-100000-abcd")["task_draft"]["title"] == "Enviar relatório"
+            assert manager.update("20260101-100000-abcd", {"synced_to_vikunja": True})
+            assert manager.list_all()[0]["synced_to_vikunja"] is True
+            assert manager.list_all()[0]["turn_count"] == 50
+
+    def test_history_mixed_directory(self, tmp_path):
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        RecordCodec().write(history_dir, "old", {"id": "old", "timestamp": "1", "analysis": {"tasks": []}})
+        RecordCodec(compression="gzip", min_bytes=0).write(
+            history_dir, "new", {"id": "new", "timestamp": "2", "analysis": {"tasks": [{}]}}
+        )
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            manager = HistoryManager()
+            assert [s["id"] for s in manager.list_all()] == ["new", "old"]
+            assert manager.get_by_id("new")["analysis"]["tasks"] == [{}]
+            assert sorted(r["id"] for r in manager.iter_records()) == ["new", "old"]
+
+    def test_index_follows_a_file_that_changes_encoding(self, tmp_path):
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        RecordCodec().write(history_dir, "r", {"id": "r", "timestamp": "1"})
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            manager = HistoryManager()
+            assert manager.get_by_id("r") is not None
+            migrate_directory(history_dir, RecordCodec(compression="gzip", min_bytes=0))
+            assert manager.get_by_id("r") == {"id": "r", "timestamp": "1"}
+
+
+# ---------------------------------------------------------------------------
+# Migration and benchmark
+# ---------------------------------------------------------------------------
+
+class TestMigration:
+    def test_migrate_and_rerun_is_a_no_op(self, records_dir):
+        for i in range(3):
+            RecordCodec().write(records_dir, f"r{i}", _record())
+        (records_dir / "broken.json").write_text("{oops", encoding="utf-8")
+        codec = RecordCodec(compact=True, compression="gzip", min_bytes=0)
+
+        report = migrate_directory(records_dir, codec)
+        assert (report.files, report.rewritten, report.skipped) == (4, 3, 1)
+        assert report.bytes_after < report.bytes_before
+        assert sorted(record_files(records_dir)) == ["broken", "r0", "r1", "r2"]
+        assert all(read_record(records_dir / f"r{i}.json.gz") == _record() for i in range(3))
+
+        assert migrate_directory(records_dir, codec).rewritten == 0
+
+    def test_dry_run_writes_nothing(self, records_dir):
+        RecordCodec().write(records_dir, "r", _record())
+        report = migrate_directory(records_dir, RecordCodec(compact=True), dry_run=True)
+        assert report.rewritten == 1
+        assert (records_dir / "r.json").read_text(encoding="utf-8").startswith("{\n")
+
+    def test_benchmark_reports_every_variant(self):
+        rows = benchmark_codecs([_record()] * 5, benchmark_variants(), repeat=1)
+        by_name = {r.variant: r for r in rows}
+        assert by_name["json (compact)"].bytes_on_disk < by_name["json (indent=2)"].bytes_on_disk
+        assert by_name["gzip (compact)"].bytes_on_disk < by_name["json (compact)"].bytes_on_disk
+        assert all(r.parse_ms >= 0 for r in rows)
+
+
+class TestCli:
+    def test_migrate_records_command(self, tmp_path, capsys):
+        from app import cli
+
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        RecordCodec().write(history_dir, "h1", {"id": "h1", "timestamp": "1", "analysis": {"tasks": []}})
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            assert cli.main(["migrate-records", "--only", "history", "--compact",
+                             "--compression", "gzip", "--min-bytes", "0"]) == 0
+            assert (history_dir / "h1.json.gz").exists()
+            assert HistoryManager().get_by_id("h1")["id"] == "h1"
+        assert "rewrote 1" in capsys.readouterr().out
+
+    def test_benchmark_command(self, tmp_path, capsys):
+        from app import cli
+
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        RecordCodec().write(history_dir, "h1", _record())
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            assert cli.main(["benchmark-record-formats", "--only", "history", "--repeat", "1"]) == 0
+        out = capsys.readouterr().out
+        assert "json (indent=2)" in out and "gzip (compact)" in out
@@ -0,0 +1,376 @@
+"""
+Tests for RecordIndex, the SQLite summary index kept next to JSON record
+directories, its paginated listing, the per-owner partition layout, and
+its use by HistoryManager, ConversationManager and the maintenance CLI.
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.conversation_manager import ConversationManager
+from app.services.history_manager import HistoryManager
+from app.services.record_index import (
+    INDEX_FILENAME,
+    RecordIndex,
+    decode_cursor,
+    encode_cursor,
+    partition_directory,
+    partition_for,
+)
+
+
+def _summarize(record, path):
+    return {"id": record.get("id", path.stem), "timestamp": record.get("timestamp", ""), "n": record.get("n")}
+
+
+def _write(directory, stem, **record):
+    path = directory / f"{stem}.json"
+    path.write_text(json.dumps(record), encoding="utf-8")
+    return path
+
+
+@pytest.fixture()
+def records_dir(tmp_path):
+    directory = tmp_path / "records"
+    directory.mkdir()
+    return directory
+
+
+class TestRecordIndex:
+    def test_list_newest_first(self, records_dir):
+        _write(records_dir, "a", id="rec-a", timestamp="2026-01-01T10:00:00", n=1)
+        _write(records_dir, "b", id="rec-b", timestamp="2026-01-03T10:00:00", n=2)
+        index = RecordIndex(records_dir, _summarize)
+        assert [s["id"] for s in index.list()] == ["rec-b", "rec-a"]
+        assert (records_dir / INDEX_FILENAME).exists()
+
+    def test_owner_filter(self, records_dir):
+        _write(records_dir, "a", id="a", timestamp="1", owner_id="alice")
+        _write(records_dir, "b", id="b", timestamp="2", owner_id="bob")
+        index = RecordIndex(records_dir, _summarize)
+        assert [s["id"] for s in index.list(owner_id="alice")] == ["a"]
+
+    def test_find_by_id_or_stem(self, records_dir):
+        path = _write(records_dir, "20260101-100000_notes", id="20260101-100000-notes", timestamp="1")
+        index = RecordIndex(records_dir, _summarize)
+        assert index.find_path("20260101-100000-notes") == path
+        assert index.find_path("20260101-100000_notes") == path
+        assert index.find_path("missing") is None
+
+    def test_listing_does_not_reparse_files(self, records_dir):
+        _write(records_dir, "a", id="a", timestamp="1")
+        index = RecordIndex(records_dir, _summarize)
+        index.list()
+        with patch.object(Path, "read_bytes", side_effect=AssertionError("file parsed")):
+            assert len(index.list()) == 1
+            assert index.find_path("a") is not None
+
+    def test_out_of_band_changes_are_reconciled(self, records_dir):
+        index = RecordIndex(records_dir, _summarize)
+        first = _write(records_dir, "a", id="a", timestamp="1")
+        assert len(index.list()) == 1
+        _write(records_dir, "b", id="b", timestamp="2")
+        first.unlink()
+        assert [s["id"] for s in index.list()] == ["b"]
+
+    def test_corrupt_files_are_skipped(self, records_dir):
+        (records_dir / "broken.json").write_text("{not json", encoding="utf-8")
+        _write(records_dir, "ok", id="ok", timestamp="1")
+        index = RecordIndex(records_dir, _summarize)
+        assert [s["id"] for s in index.list()] == ["ok"]
+        assert index.find_path("broken") is None
+
+    def test_corrupt_file_is_not_reparsed_on_every_change(self, records_dir):
+        broken = records_dir / "broken.json"
+        broken.write_text("{not json", encoding="utf-8")
+        index = RecordIndex(records_dir, _summarize)
+        index.list()
+
+        real_read = Path.read_bytes
+        reads = []
+
+        def counting_read(path, *args, **kwargs):
+            reads.append(path.name)
+            return real_read(path, *args, **kwargs)
+
+        with patch.object(Path, "read_bytes", counting_read):
+            _write(records_dir, "a", id="a", timestamp="1")
+            index.list()
+            _write(records_dir, "b", id="b", timestamp="2")
+            assert index.find_path("b") is not None
+        assert "broken.json" not in reads
+
+    def test_repaired_file_is_picked_up(self, records_dir):
+        broken = records_dir / "fixme.json"
+        broken.write_text("{not json", encoding="utf-8")
+        index = RecordIndex(records_dir, _summarize)
+        assert index.list() == []
+        broken.unlink()
+        _write(records_dir, "fixme", id="fixed", timestamp="1")
+        assert index.find_path("fixed") == broken
+
+    def test_rebuild_and_reopen(self, records_dir):
+        _write(records_dir, "a", id="a", timestamp="1")
+        first = RecordIndex(records_dir, _summarize)
+        assert first.rebuild() == 1
+        first.close()
+        assert len(RecordIndex(records_dir, _summarize).list()) == 1
+
+    def test_schema_change_rebuilds(self, records_dir):
+        _write(records_dir, "a", id="a", timestamp="1")
+        RecordIndex(records_dir, _summarize).list()
+
+        class NextVersion(RecordIndex):
+            SCHEMA_VERSION = RecordIndex.SCHEMA_VERSION + 1
+
+        assert [s["id"] for s in NextVersion(records_dir, _summarize).list()] == ["a"]
+
+    def test_missing_directory(self, tmp_path):
+        index = RecordIndex(tmp_path / "nope", _summarize)
+        assert index.list() == []
+        assert index.find_path("x") is None
+        assert index.rebuild() == 0
+
+
+class TestRecordIndexPage:
+    @pytest.fixture()
+    def index(self, records_dir):
+        for day in range(1, 8):
+            _write(
+                records_dir, f"r{day}", id=f"r{day}", timestamp=f"2026-01-0{day}T10:00:00",
+                owner_id="alice" if day % 2 else "bob", title=f"Relatório {day}" if day < 4 else f"Ata {day}",
+            )
+        return RecordIndex(records_dir, _summarize, lambda r: [r.get("title")])
+
+    def _walk(self, index, **kwargs):
+        ids, cursor = [], None
+        while True:
+            items, cursor = index.page(cursor=cursor, **kwargs)
+            ids.append([s["id"] for s in items])
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_everything_once(self, index):
+        assert self._walk(index, limit=3) == [["r7", "r6", "r5"], ["r4", "r3", "r2"], ["r1"]]
+
+    def test_ascending(self, index):
+        assert self._walk(index, limit=4, ascending=True) == [["r1", "r2", "r3", "r4"], ["r5", "r6", "r7"]]
+
+    def test_exact_multiple_has_no_empty_trailing_page(self, index):
+        items, cursor = index.page(limit=7)
+        assert len(items) == 7 and cursor is None
+
+    def test_ties_on_timestamp_are_broken_by_stem(self, records_dir):
+        for stem in ("a", "b", "c"):
+            _write(records_dir, stem, id=stem, timestamp="2026-01-01T10:00:00")
+        index = RecordIndex(records_dir, _summarize)
+        assert self._walk(index, limit=1) == [["c"], ["b"], ["a"]]
+
+    def test_date_range_and_owner(self, index):
+        items, _ = index.page(owner_id="alice", since="2026-01-03", until="2026-01-07")
+        assert [s["id"] for s in items] == ["r5", "r3"]
+
+    def test_text_filter_is_case_insensitive(self, index):
+        items, _ = index.page(query="RELATÓRIO")
+        assert [s["id"] for s in items] == ["r3", "r2", "r1"]
+
+    def test_text_filter_matches_the_id(self, index):
+        assert [s["id"] for s in index.page(query="R6")[0]] == ["r6"]
+
+    def test_text_filter_wildcards_are_literal(self, index):
+        assert index.page(query="%")[0] == []
+        assert index.page(query="_")[0] == []
+
+    def test_filters_carry_across_pages(self, index):
+        assert self._walk(index, limit=2, query="ata") == [["r7", "r6"], ["r5", "r4"]]
+
+    def test_cursor_round_trip_and_rejects_garbage(self, index):
+        assert decode_cursor(encode_cursor("2026-01-01T10:00:00", "r1")) == ("2026-01-01T10:00:00", "r1")
+        with pytest.raises(ValueError):
+            index.page(cursor="not-a-cursor")
+
+    def test_missing_directory(self, tmp_path):
+        assert RecordIndex(tmp_path / "nope", _summarize).page() == ([], None)
+
+
+class TestManagerSearchFields:
+    def test_history_matches_source_files_and_task_titles(self, tmp_path):
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        _write(history_dir, "h1", id="h1", timestamp="1", source_files=["weekly.txt"],
+               analysis={"tasks": [{"title": "Revisar contrato"}]})
+        _write(history_dir, "h2", id="h2", timestamp="2", source_files=["kickoff.vtt"], analysis={"tasks": []})
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            manager = HistoryManager()
+            assert [s["id"] for s in manager.list_page(query="weekly")[0]] == ["h1"]
+            assert [s["id"] for s in manager.list_page(query="contrato")[0]] == ["h1"]
+            assert [s["id"] for s in manager.list_page(query=".vtt")[0]] == ["h2"]
+
+    def test_conversation_index_follows_save_and_update(self, tmp_path):
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", tmp_path / "conversations"):
+            manager = ConversationManager()
+            manager.save({"id": "c1", "session_id": "s1", "timestamp": "2026-01-01T10:00:00",
+                          "transcript": [], "task_draft": {"title": "Enviar orçamento"}})
+            assert [s["id"] for s in manager.list_page(query="orçamento")[0]] == ["c1"]
+            assert manager.list_all()[0]["synced_to_vikunja"] is False
+
+            assert manager.update("c1", {"synced_to_vikunja": True})
+            assert manager.list_all()[0]["synced_to_vikunja"] is True
+
+    def test_conversation_agent_type_filter(self, tmp_path):
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", tmp_path / "conversations"):
+            manager = ConversationManager()
+            for i, agent in enumerate(["live", "standard", "live", None]):
+                record = {"id": f"c{i}", "session_id": f"s{i}", "timestamp": f"2026-01-0{i + 1}T10:00:00",
+                          "transcript": [], "task_draft": {"title": f"T{i}"}}
+                if agent:
+                    record["agent_type"] = agent
+                manager.save(record)
+            # Records without agent_type count as live, as in their summary
+            items, cursor = manager.list_page(agent_type="live", limit=2)
+            assert [s["id"] for s in items] == ["c3", "c2"]
+            assert [s["id"] for s in manager.list_page(agent_type="live", cursor=cursor)[0]] == ["c0"]
+            assert [s["id"] for s in manager.list_page(agent_type="standard")[0]] == ["c1"]
+
+
+class TestConversationLookup:
+    @pytest.fixture()
+    def manager(self, tmp_path):
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", tmp_path / "conversations"):
+            manager = ConversationManager()
+            for i in range(5):
+                manager.save({"id": f"c{i}", "session_id": f"s{i}", "timestamp": f"2026-01-0{i + 1}T10:00:00",
+                              "transcript": [], "task_draft": {"title": f"T{i}"}})
+            yield manager
+
+    def test_get_by_id_parses_only_the_match(self, manager):
+        manager.list_all()
+        real_read = Path.read_bytes
+        reads = []
+
+        def counting_read(path, *args, **kwargs):
+            reads.append(path.name)
+            return real_read(path, *args, **kwargs)
+
+        with patch.object(Path, "read_bytes", counting_read):
+            assert manager.get_by_id("c3")["task_draft"]["title"] == "T3"
+        assert len(reads) == 1
+
+    def test_update_goes_through_the_index(self, manager):
+        assert manager.update("c2", {"synced_to_vikunja": True})
+        assert manager.get_by_id("c2")["synced_to_vikunja"] is True
+        assert manager.update("missing", {"x": 1}) is False
+
+
+class TestOwnerPartitions:
+    def test_partition_names(self):
+        uid = "3f2b8c1e-0d4a-4c8e-9b1a-2f6d7e8c9a0b"
+        assert partition_for(uid) == uid
+        assert partition_for(None) == ""
+        assert partition_for("../etc") != partition_for("__etc")
+        assert "/" not in partition_for("../etc") and not partition_for("../etc").startswith(".")
+
+    def test_saves_land_in_the_owner_partition(self, tmp_path):
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", tmp_path / "conversations"):
+            manager = ConversationManager()
+            owned = manager.save({"id": "c1", "session_id": "s1", "timestamp": "1", "owner_id": "alice"})
+            shared = manager.save({"id": "c2", "session_id": "s2", "timestamp": "2"})
+            assert owned.parent.name == "alice"
+            assert shared.parent == tmp_path / "conversations"
+            assert manager.get_by_id("c1", owner_id="alice")["id"] == "c1"
+            assert manager.get_by_id("c1", owner_id="bob") is None
+            assert [s["id"] for s in manager.list_all()] == ["c2", "c1"]
+
+    def test_owner_query_only_reconciles_root_and_own_partition(self, records_dir):
+        (records_dir / "alice").mkdir()
+        _write(records_dir / "alice", "a1", id="a1", timestamp="1", owner_id="alice")
+        index = RecordIndex(records_dir, _summarize)
+        index.list()
+
+        (records_dir / "bob").mkdir()
+        _write(records_dir / "bob", "b1", id="b1", timestamp="2", owner_id="bob")
+        with patch.object(Path, "read_bytes", side_effect=AssertionError("other partition parsed")):
+            assert [s["id"] for s in index.list(owner_id="alice")] == ["a1"]
+            assert index.find_path("a1", owner_id="alice") is not None
+        assert [s["id"] for s in index.list()] == ["b1", "a1"]
+
+    def test_same_stem_in_two_partitions(self, records_dir):
+        for owner in ("alice", "bob"):
+            (records_dir / owner).mkdir()
+            _write(records_dir / owner, "20260101-100000_notes", id="20260101-100000-notes",
+                   timestamp="2026-01-01T10:00:00", owner_id=owner)
+        index = RecordIndex(records_dir, _summarize)
+        assert len(index.list()) == 2
+        assert index.find_path("20260101-100000-notes", owner_id="bob").parent.name == "bob"
+        first, cursor = index.page(limit=1)
+        second, cursor = index.page(limit=1, cursor=cursor)
+        assert cursor is None and len(first) == len(second) == 1
+
+    def test_removed_partition_is_dropped(self, records_dir):
+        (records_dir / "alice").mkdir()
+        path = _write(records_dir / "alice", "a1", id="a1", timestamp="1", owner_id="alice")
+        index = RecordIndex(records_dir, _summarize)
+        assert len(index.list()) == 1
+        path.unlink()
+        (records_dir / "alice").rmdir()
+        assert index.list() == []
+
+    def test_partition_directory_moves_owned_flat_files(self, records_dir):
+        _write(records_dir, "a1", id="a1", timestamp="1", owner_id="alice")
+        _write(records_dir, "shared", id="shared", timestamp="2")
+        (records_dir / "broken.json").write_text("{oops", encoding="utf-8")
+        (records_dir / "alice").mkdir()
+        _write(records_dir / "alice", "a1", id="already-there", timestamp="0", owner_id="alice")
+
+        report = partition_directory(records_dir)
+        assert tuple(report) == (1, 1, 1)
+        assert sorted(p.name for p in (records_dir / "alice").iterdir()) == ["a1.json", "a1_1.json"]
+        assert (records_dir / "shared.json").exists()
+        assert partition_directory(records_dir).moved == 0
+
+        index = RecordIndex(records_dir, _summarize)
+        assert sorted(s["id"] for s in index.list(owner_id="alice")) == ["a1", "already-there"]
+
+
+class TestHistoryIndexCli:
+    def test_rebuild_command(self, tmp_path, capsys):
+        from app import cli
+
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        _write(history_dir, "h1", id="h1", timestamp="1", analysis={"tasks": [{}, {}]})
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            assert cli.main(["rebuild-history-index"]) == 0
+            assert HistoryManager().list_all()[0]["task_count"] == 2
+        assert "1 record(s)" in capsys.readouterr().out
+
+    def test_rebuild_conversation_command(self, tmp_path, capsys):
+        from app import cli
+
+        conversations_dir = tmp_path / "conversations"
+        conversations_dir.mkdir()
+        _write(conversations_dir, "c1", id="c1", timestamp="1", transcript=[{}, {}, {}])
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", conversations_dir):
+            assert cli.main(["rebuild-conversation-index"]) == 0
+            assert ConversationManager().list_all()[0]["turn_count"] == 3
+        assert "1 record(s)" in capsys.readouterr().out
+
+    def test_partition_records_command(self, tmp_path, capsys):
+        from app import cli
+
+        history_dir = tmp_path / "history"
+        history_dir.mkdir()
+        _write(history_dir, "h1", id="h1", timestamp="1", owner_id="alice")
+        with patch.object(HistoryManager, "HISTORY_DIR", history_dir):
+            manager = HistoryManager()
+            assert manager.get_by_id("h1", owner_id="alice") is not None
+            assert cli.main(["partition-records", "--only", "history"]) == 0
+            assert (history_dir / "alice" / "h1.json").exists()
+            assert manager.get_by_id("h1", owner_id="alice")["id"] == "h1"
+        assert "moved 1 record(s)" in capsys.readouterr().out
@@ -0,0 +1,378 @@
+"""
+Tests for the batch analysis pipeline (TaskProcessor).
+
+Gemini is never called: the async client's generate_content is replaced by
+AsyncMock/fake coroutines so the tests exercise prompt assembly, response
+parsing and concurrency control only.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.models.schemas import AnalysisResponse, TaskBase
+from app.services.glossary_manager import GlossaryManager
+from app.services.task_processor import (
+    JsonArrayStreamParser,
+    TaskProcessor,
+    dedupe_tasks,
+    split_transcript,
+)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+SAMPLE_TASKS = [
+    {"title": "Enviar relatório", "assignee_name": "Carlos", "priority": 3},
+    {"title": "Revisar contrato", "priority": 4, "due_date": "2025-02-14"},
+]
+
+
+@pytest.fixture()
+def processor(tmp_path):
+    """TaskProcessor with a temp glossary and a mocked async Gemini client."""
+    proc = TaskProcessor()
+    proc.glossary_manager = GlossaryManager(file_path=str(tmp_path / "glossary.json"))
+    proc.client = MagicMock()
+    proc.client.aio.models.generate_content = AsyncMock(
+        return_value=SimpleNamespace(text=json.dumps(SAMPLE_TASKS))
+    )
+    return proc
+
+
+# ---------------------------------------------------------------------------
+# Tests — non-blocking analysis
+# ---------------------------------------------------------------------------
+
+class TestAsyncGeneration:
+    @pytest.mark.asyncio
+    async def test_uses_async_client(self, processor):
+        result = await processor.process_files([], text_context="Carlos vai enviar o relatório.")
+
+        assert isinstance(result, AnalysisResponse)
+        assert [t.title for t in result.tasks] == ["Enviar relatório", "Revisar contrato"]
+        processor.client.aio.models.generate_content.assert_awaited_once()
+        processor.client.models.generate_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dict_response_is_unwrapped(self, processor):
+        processor.client.aio.models.generate_content.return_value = SimpleNamespace(
+            text=json.dumps({"tasks": SAMPLE_TASKS})
+        )
+        result = await processor.process_files([], text_context="texto")
+        assert len(result.tasks) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, processor):
+        processor._analysis_semaphore = asyncio.Semaphore(1)
+        active = 0
+        peak = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return SimpleNamespace(text="[]")
+
+        processor.client.aio.models.generate_content = fake_generate
+        await asyncio.gather(*[
+            processor.process_files([], text_context=f"reunião {i}") for i in range(4)
+        ])
+        assert peak == 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, processor):
+        """Other coroutines must keep running while an analysis is in flight."""
+        async def slow_generate(**kwargs):
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(text="[]")
+
+        processor.client.aio.models.generate_content = slow_generate
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(3):
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        await asyncio.gather(processor.process_files([], text_context="texto"), ticker())
+        assert ticks == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_input_raises_value_error(self, processor):
+        with pytest.raises(ValueError):
+            await processor.process_files([], text_context="   ")
+
+
+# ---------------------------------------------------------------------------
+# Tests — chunked (map-reduce) analysis
+# ---------------------------------------------------------------------------
+
+def _multi_file_text(sizes):
+    parts = []
+    for i, size in enumerate(sizes):
+        name = f"parte{i}.txt"
+        parts.append(f"\n\n--- INÍCIO DO ARQUIVO: {name} ---\n{'x' * size}\n--- FIM DO ARQUIVO: {name} ---\n")
+    return "".join(parts)
+
+
+class TestSplitTranscript:
+    def test_short_text_is_single_chunk(self):
+        assert split_transcript("curto", token_budget=100) == ["curto"]
+
+    def test_splits_at_file_markers(self):
+        text = _multi_file_text([300, 300, 300])
+        chunks = split_transcript(text, token_budget=100)  # 400 chars per chunk
+        assert len(chunks) == 3
+        assert all(c.lstrip().startswith("--- INÍCIO DO ARQUIVO") for c in chunks)
+        assert "".join(chunks) == text
+
+    def test_small_files_are_packed_together(self):
+        text = _multi_file_text([50, 50, 50, 50])
+        chunks = split_transcript(text, token_budget=100)
+        assert len(chunks) < 4
+        assert "".join(chunks) == text
+
+    def test_oversized_segment_split_by_lines(self):
+        text = "\n".join(["linha " * 10] * 40)
+        chunks = split_transcript(text, token_budget=50)
+        assert len(chunks) > 1
+        assert all(len(c) <= 200 for c in chunks)
+        assert "".join(chunks) == text
+
+
+class TestDedupeTasks:
+    def test_exact_duplicates_removed(self):
+        tasks = [
+            TaskBase(title="Enviar  relatório", assignee_name="Carlos", priority=2),
+            TaskBase(title="enviar relatório", assignee_name="carlos", priority=4),
+            TaskBase(title="Enviar relatório", assignee_name="Ana"),
+        ]
+        result = dedupe_tasks(tasks)
+        assert len(result) == 2
+        assert result[0].priority == 4
+
+
+class TestChunkedAnalysis:
+    @pytest.mark.asyncio
+    async def test_forced_chunking_reports_each_chunk(self, processor):
+        with patch.object(settings, "ANALYSIS_CHUNK_TOKEN_BUDGET", 100):
+            result = await processor.process_files(
+                [], text_context=_multi_file_text([300, 300]), chunked=True, compress=False
+            )
+
+        # Two map calls + one merge call
+        assert processor.client.aio.models.generate_content.await_count == 3
+        assert [c.index for c in result.chunks] == [0, 1]
+        assert all(c.token_count > 0 and c.task_count == 2 for c in result.chunks)
+        assert result.token_count == processor.estimate_tokens(_multi_file_text([300, 300]).strip())
+
+    @pytest.mark.asyncio
+    async def test_auto_chunking_only_above_budget(self, processor):
+        result = await processor.process_files([], text_context="texto curto")
+        assert result.chunks == []
+        processor.client.aio.models.generate_content.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_merge_failure_falls_back_to_deduplicated_tasks(self, processor):
+        responses = [
+            SimpleNamespace(text=json.dumps(SAMPLE_TASKS)),
+            SimpleNamespace(text=json.dumps(SAMPLE_TASKS)),
+            RuntimeError("merge down"),
+        ]
+        processor.client.aio.models.generate_content = AsyncMock(side_effect=responses)
+
+        with patch.object(settings, "ANALYSIS_CHUNK_TOKEN_BUDGET", 100):
+            result = await processor.process_files([], text_context=_multi_file_text([300, 300]))
+
+        assert len(result.chunks) == 2
+        assert [t.title for t in result.tasks] == ["Enviar relatório", "Revisar contrato"]
+
+
+# ---------------------------------------------------------------------------
+# Tests — streaming extraction (SSE)
+# ---------------------------------------------------------------------------
+
+def _fake_stream(fragments):
+    """Build a fake generate_content_stream returning *fragments* as chunks."""
+    async def generate_content_stream(**kwargs):
+        async def iterator():
+            for text in fragments:
+                yield SimpleNamespace(text=text)
+        return iterator()
+    return generate_content_stream
+
+
+class TestJsonArrayStreamParser:
+    def test_items_emitted_as_they_complete(self):
+        parser = JsonArrayStreamParser()
+        assert parser.feed('[{"title": "A", ') == []
+        assert parser.feed('"priority": 2}, {"ti') == [{"title": "A", "priority": 2}]
+        assert parser.feed('tle": "B"}]') == [{"title": "B"}]
+        assert parser.items_seen == 2
+
+    def test_braces_and_escapes_inside_strings(self):
+        parser = JsonArrayStreamParser()
+        items = parser.feed('[{"title": "Ver {x} e [y] \\"ok\\" \\\\", "description": "}"}]')
+        assert items == [{"title": 'Ver {x} e [y] "ok" \\', "description": "}"}]
+
+    def test_array_wrapped_in_object(self):
+        parser = JsonArrayStreamParser()
+        assert parser.feed('{"tasks": [{"title": "A", "meta": {"k": 1}}]}') == [
+            {"title": "A", "meta": {"k": 1}}
+        ]
+
+    def test_single_object_yields_nothing(self):
+        parser = JsonArrayStreamParser()
+        assert parser.feed('{"title": "A"}') == []
+        assert parser.items_seen == 0
+
+
+class TestProcessFilesStream:
+    @pytest.mark.asyncio
+    async def test_tasks_then_summary(self, processor):
+        processor.client.aio.models.generate_content_stream = _fake_stream(
+            ['[{"title": "Enviar relatório"}, ', '{"title": "sem prioridade", "priority": 9}, ', '{"title": "Revisar"}]']
+        )
+        events = [e async for e in processor.process_files_stream([], text_context="texto")]
+
+        kinds = [k for k, _ in events]
+        assert kinds == ["task", "task", "summary"]  # invalid priority skipped
+        summary = events[-1][1]
+        assert [t.title for t in summary.tasks] == ["Enviar relatório", "Revisar"]
+        assert summary.token_count == processor.estimate_tokens("texto")
+        assert summary.processing_time >= 0
+
+    @pytest.mark.asyncio
+    async def test_single_object_fallback(self, processor):
+        processor.client.aio.models.generate_content_stream = _fake_stream(['{"title": "Única"}'])
+        events = [e async for e in processor.process_files_stream([], text_context="texto")]
+        assert [k for k, _ in events] == ["task", "summary"]
+
+    @pytest.mark.asyncio
+    async def test_stream_result_is_cached(self, processor):
+        processor.client.aio.models.generate_content_stream = _fake_stream(['[{"title": "A"}]'])
+        [e async for e in processor.process_files_stream([], text_context="texto")]
+        result = await processor.process_files([], text_context="texto")
+        assert result.cached is True
+        processor.client.aio.models.generate_content.assert_not_called()
+
+
+class TestStreamEndpoint:
+    def test_sse_events(self, processor, tmp_path):
+        from fastapi.testclient import TestClient
+        from app.core.security import get_current_user
+        from app.main import app
+        from app.models.auth_schemas import User
+        from app.services.history_manager import HistoryManager
+
+        processor.client.aio.models.generate_content_stream = _fake_stream(['[{"title": "A"}, {"title": "B"}]'])
+        history = HistoryManager()
+        history.HISTORY_DIR = tmp_path / "history"
+        app.dependency_overrides[get_current_user] = lambda: User(id="u1", username="alice", hashed_password="x")
+        try:
+            with patch("app.api.endpoints.batch.processor", processor), \
+                 patch("app.api.endpoints.batch.history_manager", history):
+                resp = TestClient(app).post(
+                    "/api/v1/analyze/stream",
+                    files={"files": ("ata.txt", "Carlos envia o relatório".encode("utf-8"), "text/plain")},
+                )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in resp.text.split("\n\n") if f]
+        events = [f.split("\n")[0].removeprefix("event: ") for f in frames]
+        assert events == ["task", "task", "summary"]
+        summary = json.loads(frames[-1].split("\n")[1].removeprefix("data: "))
+        assert summary["task_count"] == 2
+        assert summary["file_names"] == ["ata.txt"]
+        assert "processing_time" in summary and "token_count" in summary
+        assert len(list(history.iter_records())) == 1
+
+
+# ---------------------------------------------------------------------------
+# Tests — pre-compression stage
+# ---------------------------------------------------------------------------
+
+class TestCompressionStage:
+    @pytest.mark.asyncio
+    async def test_compressed_text_is_sent_and_reported(self, processor):
+        text = "Então, né, eu vou eu vou mandar o e-mail, né?\nAham.\nEntão, né, eu vou eu vou mandar o e-mail, né?"
+        result = await processor.process_files([], text_context=text, compress=True)
+
+        prompt = processor.client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "Então, eu vou mandar o e-mail?" in prompt
+        assert "né" not in prompt.split("TRANSCRICÃO:")[1]
+        assert result.compression.tokens_saved > 0
+        assert result.token_count == result.compression.tokens_after
+
+    @pytest.mark.asyncio
+    async def test_disabled_per_request(self, processor):
+        result = await processor.process_files([], text_context="né, aham", compress=False)
+        assert result.compression is None
+        prompt = processor.client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "né, aham" in prompt
+
+    @pytest.mark.asyncio
+    async def test_setting_default(self, processor):
+        with patch.object(settings, "TRANSCRIPT_COMPRESSION_ENABLED", False):
+            result = await processor.process_files([], text_context="né, texto")
+        assert result.compression is None
+
+
+# ---------------------------------------------------------------------------
+# Tests — local glossary normalization
+# ---------------------------------------------------------------------------
+
+class TestGlossaryStage:
+    @pytest.fixture(autouse=True)
+    def small_glossary(self, processor):
+        processor.glossary_manager.save({"Hankell": ["Rankel"], "Odoo": ["Odo"]})
+
+    @pytest.mark.asyncio
+    async def test_rewrite_and_matched_rules_only(self, processor):
+        with patch.object(settings, "GLOSSARY_LOCAL_NORMALIZATION", True), \
+             patch.object(settings, "GLOSSARY_MATCHED_RULES_ONLY", True):
+            await processor.process_files([], text_context="O Rankel vai configurar", compress=False)
+
+        prompt = processor.client.aio.models.generate_content.await_args.kwargs["contents"]
+        transcript = prompt.split("TRANSCRICÃO:")[1]
+        assert "O Hankell vai configurar" in transcript
+        assert "Escreva: Hankell" in prompt
+        assert "Escreva: Odoo" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_full_glossary_when_nothing_matched(self, processor):
+        with patch.object(settings, "GLOSSARY_MATCHED_RULES_ONLY", True):
+            await processor.process_files([], text_context="O Ranquel vai configurar", compress=False)
+
+        prompt = processor.client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "Escreva: Hankell" in prompt and "Escreva: Odoo" in prompt
+
+    def test_matched_rules_only_is_opt_in(self):
+        assert type(settings).model_fields["GLOSSARY_MATCHED_RULES_ONLY"].default is False
+
+    @pytest.mark.asyncio
+    async def test_full_glossary_when_both_disabled(self, processor):
+        with patch.object(settings, "GLOSSARY_LOCAL_NORMALIZATION", False), \
+             patch.object(settings, "GLOSSARY_MATCHED_RULES_ONLY", False):
+            await processor.process_files([], text_context="O Rankel vai configurar", compress=False)
+
+        prompt = processor.client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert "O Rankel vai configurar" in prompt
+        assert "Escreva: Hankell" in prompt and "Escreva: Odoo" in prompt
@@ -0,0 +1,116 @@
+"""
+Tests for the deterministic transcript pre-compression stage.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.transcript_compressor import TranscriptCompressor
+
+
+@pytest.fixture()
+def compressor():
+    return TranscriptCompressor()
+
+
+class TestFillers:
+    def test_fillers_and_their_commas_removed(self, compressor):
+        text, report = compressor.compress("Então, né, vamos fechar isso, né?")
+        assert text == "Então, vamos fechar isso?"
+        assert report.fillers_removed == 2
+
+    def test_whole_words_only(self, compressor):
+        text, _ = compressor.compress("O humor do cliente e a Nelly")
+        assert text == "O humor do cliente e a Nelly"
+
+    def test_filler_only_lines_dropped(self, compressor):
+        text, _ = compressor.compress("Primeira linha\nAham.\nHmm...\nSegunda linha")
+        assert text == "Primeira linha\n\nSegunda linha"
+
+    @pytest.mark.parametrize("line", [
+        "Migrar para a versão .NET 8",
+        "Mandar o arquivo .docx e o .pdf",
+        "Rodar o comando .gitignore ,depois",
+    ])
+    def test_leading_dot_tokens_kept(self, compressor, line):
+        assert compressor.compress(line)[0] == line
+
+    def test_space_before_closing_punctuation_removed(self, compressor):
+        assert compressor.compress("Vamos fechar isso , certo ?")[0] == "Vamos fechar isso, certo?"
+
+    def test_custom_filler_list(self):
+        text, _ = TranscriptCompressor(fillers=["tipo"]).compress("tipo, né, isso")
+        assert text == "né, isso"
+
+    def test_empty_filler_list_disables_filler_pass(self):
+        text, report = TranscriptCompressor(fillers=[]).compress("né, isso")
+        assert text == "né, isso"
+        assert report.fillers_removed == 0
+
+
+class TestRepetitions:
+    def test_repeated_fragment_collapsed(self, compressor):
+        text, report = compressor.compress("eu vou eu vou eu vou mandar o orçamento")
+        assert text == "eu vou mandar o orçamento"
+        assert report.fragments_collapsed == 1
+
+    def test_repeated_numbers_kept(self, compressor):
+        text, report = compressor.compress("O valor é 10 10 reais, entrega dia 5 5")
+        assert text == "O valor é 10 10 reais, entrega dia 5 5"
+        assert report.fragments_collapsed == 0
+
+    def test_consecutive_duplicate_lines(self, compressor):
+        line = "Carlos: vou mandar o relatório hoje"
+        text, report = compressor.compress(f"{line}\n{line}\nNão.")
+        assert text == f"{line}\nNão."
+        assert report.duplicate_lines_removed == 1
+
+    def test_short_consecutive_lines_kept(self, compressor):
+        text, report = compressor.compress("Carlos: Sim.\nCarlos: Sim.\nNão.")
+        assert text == "Carlos: Sim.\nCarlos: Sim.\nNão."
+        assert report.duplicate_lines_removed == 0
+
+    def test_indentation_kept(self, compressor):
+        text = "- Pendências\n  - Carlos envia o relatório\n    - até sexta, né\n> citação\n>   recuada"
+        assert compressor.compress(text)[0] == (
+            "- Pendências\n  - Carlos envia o relatório\n    - até sexta\n> citação\n>   recuada"
+        )
+
+    def test_indented_copy_counts_as_duplicate(self, compressor):
+        line = "Carlos envia o relatório até sexta"
+        text, report = compressor.compress(f"{line}\n    {line}")
+        assert text == line and report.duplicate_lines_removed == 1
+
+    def test_long_duplicate_lines_anywhere(self, compressor):
+        line = "Roque vai mandar a cotação dos rádios"
+        text, _ = compressor.compress(f"{line}\nOutra coisa\n{line}")
+        assert text == f"{line}\nOutra coisa"
+
+    def test_short_non_consecutive_lines_kept(self, compressor):
+        text, _ = compressor.compress("Sim.\nPode ser?\nSim.")
+        assert text == "Sim.\nPode ser?\nSim."
+
+    def test_subtitle_timestamps_ignored_for_duplicates(self, compressor):
+        text, _ = compressor.compress(
+            "[00:00:01] Roque: hum, vamos revisar o contrato amanhã\n[00:00:09] Roque: vamos revisar o contrato amanhã"
+        )
+        assert text == "[00:00:01] Roque: vamos revisar o contrato amanhã"
+
+
+class TestMarkersAndReport:
+    def test_file_markers_untouched(self, compressor):
+        marker = "--- INÍCIO DO ARQUIVO: hum né.txt ---"
+        text, _ = compressor.compress(f"{marker}\nné, texto\n--- FIM DO ARQUIVO: hum né.txt ---")
+        assert text.splitlines() == [marker, "texto", "--- FIM DO ARQUIVO: hum né.txt ---"]
+
+    def test_token_report(self, compressor):
+        raw = "né, " * 100 + "fim"
+        text, report = compressor.compress(raw)
+        assert text == "fim"
+        assert report.tokens_before == len(raw) // 4
+        assert report.tokens_after == 0
+        assert report.tokens_saved == report.tokens_before
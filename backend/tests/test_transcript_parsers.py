@@ -0,0 +1,208 @@
+"""
+Tests for in-memory upload parsing (no temp files on disk).
+"""
+
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import docx
+import pytest
+from fastapi import UploadFile
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.glossary_manager import GlossaryManager
+from app.services.task_processor import TaskProcessor
+from app.services.transcript_parsers import (
+    Cue,
+    extract_text,
+    format_offset,
+    iter_subtitle_cues,
+    iter_text_lines,
+    merge_speaker_turns,
+)
+
+
+VTT_SAMPLE = """WEBVTT
+
+NOTE gerado automaticamente
+
+00:00:01.000 --> 00:00:04.000
+Carlos vai enviar o relatório
+
+00:00:05.000 --> 00:00:07.000
+Ana revisa o contrato
+"""
+
+
+def _docx_bytes(paragraphs):
+    document = docx.Document()
+    for p in paragraphs:
+        document.add_paragraph(p)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def _spooled(data: bytes):
+    """Mimic FastAPI's upload backing store."""
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(data)
+    spool.seek(0)
+    return spool
+
+
+class TestExtractText:
+    def test_plain_text(self):
+        assert extract_text(io.BytesIO("linha 1\nlinha 2".encode("utf-8")), ".txt") == "linha 1\nlinha 2"
+
+    def test_markdown_crlf(self):
+        assert extract_text(io.BytesIO(b"# Ata\r\n- item"), ".MD") == "# Ata\n- item"
+
+    def test_docx_from_spooled_file(self):
+        spool = _spooled(_docx_bytes(["Primeiro", "Segundo"]))
+        assert extract_text(spool, ".docx") == "Primeiro\nSegundo"
+
+    def test_vtt_strips_cue_metadata(self):
+        assert extract_text(io.BytesIO(VTT_SAMPLE.encode("utf-8")), ".vtt") == (
+            "[00:00:01] Carlos vai enviar o relatório\n[00:00:05] Ana revisa o contrato"
+        )
+
+    def test_unsupported_extension(self):
+        assert extract_text(io.BytesIO(b"abc"), ".pdf") == ""
+
+    @pytest.mark.parametrize("suffix", [".txt", ".md", ".vtt", ".srt"])
+    def test_text_formats_from_spooled_file(self, suffix):
+        spool = _spooled(VTT_SAMPLE.encode("utf-8"))
+        assert "Carlos vai enviar o relatório" in extract_text(spool, suffix)
+
+    def test_stream_needs_only_read(self):
+        class ReadOnly:
+            """Like SpooledTemporaryFile on Python 3.10: no readable()/readinto()."""
+
+            def __init__(self, data):
+                self._buf = io.BytesIO(data)
+
+            def read(self, size=-1):
+                return self._buf.read(size)
+
+            def seek(self, offset):
+                return self._buf.seek(offset)
+
+        assert extract_text(ReadOnly("a\r\nb".encode("utf-8")), ".txt") == "a\nb"
+
+    @pytest.mark.parametrize("data, lines", [
+        (b"a\r\nb\rc\nd", ["a", "b", "c", "d"]),
+        (b"a\n\nb\n", ["a", "", "b"]),
+        (b"", []),
+        ("ação\r\nnão".encode("utf-8"), ["ação", "não"]),
+    ])
+    def test_universal_newlines_across_reads(self, data, lines):
+        with patch("app.services.transcript_parsers._READ_SIZE", 1):
+            assert list(iter_text_lines(io.BytesIO(data))) == lines
+
+    def test_stream_left_open(self):
+        stream = io.BytesIO(b"a\nb")
+        list(iter_text_lines(stream))
+        assert not stream.closed
+
+
+SPEAKER_VTT = """WEBVTT
+Kind: captions
+
+STYLE
+::cue { color: white }
+
+1
+00:00:01.000 --> 00:00:03.000 align:start
+<v Roque>Preciso da cotação</v>
+
+2
+00:00:03.500 --> 00:00:05.000
+<v Roque>dos rádios até sexta.</v>
+
+3
+00:01:05.000 --> 00:01:07.000
+<v.loud Hankell>Deixa que eu vejo isso.</v>
+"""
+
+SRT_SAMPLE = """1
+00:00:01,000 --> 00:00:02,500
+Cenize: Vou revisar o contrato
+
+2
+00:00:02,600 --> 00:00:04,000
+Cenize: ainda hoje.
+
+3
+01:02:03,000 --> 01:02:04,000
+Sem locutor identificado
+"""
+
+
+class TestSubtitleParsing:
+    def test_vtt_voice_tags_merged_per_speaker(self):
+        text = extract_text(io.BytesIO(SPEAKER_VTT.encode("utf-8")), ".vtt")
+        assert text.splitlines() == [
+            "[00:00:01] Roque: Preciso da cotação dos rádios até sexta.",
+            "[00:01:05] Hankell: Deixa que eu vejo isso.",
+        ]
+
+    def test_srt_with_inline_speakers(self):
+        text = extract_text(io.BytesIO(SRT_SAMPLE.encode("utf-8")), ".srt")
+        assert text.splitlines() == [
+            "[00:00:01] Cenize: Vou revisar o contrato ainda hoje.",
+            "[01:02:03] Sem locutor identificado",
+        ]
+
+    def test_cue_timing_kept(self):
+        cues = list(iter_subtitle_cues(SPEAKER_VTT.splitlines()))
+        assert cues[0] == Cue(1.0, 3.0, "Roque", "Preciso da cotação")
+        assert cues[2].start == 65.0
+        merged = list(merge_speaker_turns(cues))
+        assert (merged[0].start, merged[0].end) == (1.0, 5.0)
+
+    def test_multi_voice_cue_split(self):
+        lines = ["00:10.000 --> 00:12.000", "<v Ana>Sim.", "<v Carlos>Combinado.", ""]
+        cues = list(iter_subtitle_cues(lines))
+        assert [(c.speaker, c.text) for c in cues] == [("Ana", "Sim."), ("Carlos", "Combinado.")]
+        assert cues[0].start == cues[1].start == 10.0
+
+    def test_iter_cues_is_lazy(self):
+        def endless():
+            i = 0
+            while True:
+                yield f"00:00:{i % 60:02d}.000 --> 00:00:{i % 60:02d}.500"
+                yield f"<v S{i}>fala {i}"
+                yield ""
+                i += 1
+
+        gen = iter_subtitle_cues(endless())
+        assert next(gen).speaker == "S0"
+        assert next(gen).speaker == "S1"
+
+    def test_format_offset(self):
+        assert format_offset(3723.9) == "01:02:03"
+
+
+class TestUploadExtraction:
+    @pytest.mark.asyncio
+    async def test_no_temp_files_written(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        proc = TaskProcessor()
+        proc.glossary_manager = GlossaryManager(file_path=str(tmp_path / "g" / "glossary.json"))
+        files = [
+            UploadFile(file=_spooled(_docx_bytes(["Ata da reunião"])), filename="ata.docx"),
+            UploadFile(file=_spooled(b"notas soltas"), filename="notas.txt"),
+            UploadFile(file=_spooled(VTT_SAMPLE.encode("utf-8")), filename="call.vtt"),
+        ]
+
+        text, names = await proc._combine_inputs(files, None)
+
+        assert names == ["ata.docx", "notas.txt", "call.vtt"]
+        assert text.index("Ata da reunião") < text.index("notas soltas") < text.index("Carlos vai enviar")
+        assert sorted(os.listdir(tmp_path)) == ["g"]
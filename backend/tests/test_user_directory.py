@@ -0,0 +1,137 @@
+"""
+Tests for the Vikunja user directory: name normalization, the precomputed
+fuzzy UserIndex, the ResolutionCache memo and TTL / background refresh
+in UserDirectory.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.user_directory import ResolutionCache, UserDirectory, UserIndex, normalize_name
+
+
+USERS = [
+    {"id": 1, "username": "roque", "name": "Roquelina Araújo"},
+    {"id": 2, "username": "hankell", "name": "Hankell Souza"},
+    {"id": 3, "username": "joao.silva", "name": "João Silva"},
+]
+
+
+class TestNormalizeName:
+    def test_accents_case_and_punctuation(self):
+        assert normalize_name("  JOÃO  da-Silva! ") == "joao da silva"
+
+    def test_empty(self):
+        assert normalize_name("") == ""
+
+
+class TestUserIndex:
+    @pytest.fixture()
+    def index(self):
+        return UserIndex(USERS, version=1)
+
+    def test_exact_label_without_accents(self, index):
+        assert index.resolve("joao silva") == 3
+
+    def test_username_is_indexed(self, index):
+        assert index.resolve("hankell") == 2
+
+    def test_fuzzy_first_name(self, index):
+        assert index.resolve("Roquelina") == 1
+
+    def test_misspelling(self, index):
+        assert index.resolve("Hankel Souza") == 2
+
+    def test_unknown_name(self, index):
+        assert index.resolve("Zé Pequeno") is None
+
+    def test_blank_name(self, index):
+        assert index.resolve("") is None
+
+    def test_resolve_many_keeps_original_keys(self, index):
+        result = index.resolve_many(["João", "joao", "Ninguém"])
+        assert result == {"João": 3, "joao": 3, "Ninguém": None}
+
+    def test_users_without_name_use_username(self):
+        index = UserIndex([{"id": 9, "username": "maria"}])
+        assert index.resolve("Maria") == 9
+
+
+class CountingLoader:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        batch = self.batches[min(self.calls, len(self.batches)) - 1]
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+
+class TestUserDirectory:
+    @pytest.mark.asyncio
+    async def test_first_lookup_loads_once(self):
+        loader = CountingLoader([USERS])
+        directory = UserDirectory(loader, ttl_seconds=60)
+        await asyncio.gather(*[directory.index() for _ in range(5)])
+        assert loader.calls == 1
+        assert directory.version == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_directory_refreshes_in_background(self):
+        newcomer = {"id": 4, "username": "bia", "name": "Beatriz"}
+        loader = CountingLoader([USERS, USERS + [newcomer]])
+        directory = UserDirectory(loader, ttl_seconds=0)
+
+        first = await directory.index()
+        assert first.resolve("Beatriz") is None
+        # Stale: served from the old snapshot while the reload runs
+        stale = await directory.index()
+        assert stale is first
+        await directory._background
+        assert directory.version == 2
+        assert (await directory.index()).resolve("Beatriz") == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_keeps_snapshot(self):
+        loader = CountingLoader([USERS, RuntimeError("down")])
+        directory = UserDirectory(loader, ttl_seconds=0, retry_seconds=60)
+        await directory.index()
+        await directory.refresh()
+        assert directory.version == 1
+        assert (await directory.index()).resolve("hankell") == 2
+
+    @pytest.mark.asyncio
+    async def test_initial_failure_yields_empty_index(self):
+        directory = UserDirectory(CountingLoader([RuntimeError("down")]))
+        index = await directory.index()
+        assert len(index) == 0
+        assert index.resolve("Roque") is None
+
+
+class TestResolutionCache:
+    def test_lru_eviction_and_negative_entries(self):
+        cache = ResolutionCache(max_entries=2)
+        cache.store(1, "roque", 1)
+        cache.store(1, "ninguem", None)
+        assert cache.lookup(1, "ninguem") == (True, None)
+        cache.store(1, "hankell", 2)
+        assert cache.lookup(1, "roque") == (False, None)
+        assert len(cache) == 2
+
+    def test_version_is_part_of_key(self):
+        cache = ResolutionCache()
+        cache.store(1, "roque", 1)
+        assert cache.lookup(2, "roque") == (False, None)
+
+    def test_disabled(self):
+        cache = ResolutionCache(max_entries=0)
+        cache.store(1, "roque", 1)
+        assert len(cache) == 0
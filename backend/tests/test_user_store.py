@@ -0,0 +1,239 @@
+"""
+Tests for the pluggable user stores (users.json and SQLite), UserManager on
+top of each, concurrent admin writes, and the users.json -> SQLite importer.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import bcrypt
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.auth_schemas import UserCreate, UserUpdate
+from app.services.user_manager import UserManager
+from app.services.user_store import JsonUserStore, SqliteUserStore, import_json_users
+
+# Cheap hash so the concurrency tests measure the store, not bcrypt
+HASH = bcrypt.hashpw(b"T3stP@ss!", bcrypt.gensalt(rounds=4)).decode()
+
+
+def _raw(username, **fields):
+    return {
+        "id": str(uuid.uuid4()),
+        "username": username,
+        "hashed_password": HASH,
+        "role": "user",
+        "is_active": True,
+        "created_at": "2026-01-01T00:00:00",
+        "default_project_id": None,
+        **fields,
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, tmp_path):
+    mgr = UserManager(backend=request.param)
+    mgr.USERS_FILE = tmp_path / "users.json"
+    mgr.USERS_DB = tmp_path / "users.sqlite3"
+    yield mgr
+    mgr.close()
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = JsonUserStore(tmp_path / "users.json")
+    else:
+        store = SqliteUserStore(tmp_path / "users.sqlite3")
+    yield store
+    store.close()
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+class TestUserStore:
+    def test_crud(self, store):
+        alice = _raw("alice")
+        store.insert(alice)
+        store.insert(_raw("bob", role="admin", default_project_id=7))
+        assert [u["username"] for u in store.load()] == ["alice", "bob"]
+        assert store.load()[0] == alice
+
+        updated = store.update(alice["id"], {"is_active": False, "default_project_id": 3})
+        assert updated["is_active"] is False and updated["default_project_id"] == 3
+        assert store.update("missing", {"role": "admin"}) is None
+
+        assert store.delete(username="bob")["role"] == "admin"
+        assert store.delete(user_id=alice["id"])["username"] == "alice"
+        assert store.delete(user_id=alice["id"]) is None
+        assert store.load() == []
+
+    def test_duplicate_username_rejected(self, store):
+        store.insert(_raw("alice"))
+        with pytest.raises(ValueError, match="already exists"):
+            store.insert(_raw("alice"))
+        assert len(store.load()) == 1
+
+    def test_version_changes_on_write(self, store):
+        before = store.version()
+        store.insert(_raw("alice"))
+        after = store.version()
+        assert after != before
+        assert store.version() == after
+
+    def test_rejects_unknown_fields_and_taken_usernames(self, store):
+        raw = _raw("alice")
+        store.insert(raw)
+        store.insert(_raw("bob"))
+        with pytest.raises(ValueError):
+            store.update(raw["id"], {"id": "other"})
+        with pytest.raises(ValueError):
+            store.update(raw["id"], {"password": "x"})
+        with pytest.raises(ValueError, match="already exists"):
+            store.update(raw["id"], {"username": "bob"})
+        assert store.load()[0] == raw
+
+    def test_base_class_is_abstract(self):
+        from app.services.user_store import UserStore
+
+        with pytest.raises(TypeError):
+            UserStore()
+
+    def test_sqlite_sees_other_connections(self, tmp_path):
+        path = tmp_path / "users.sqlite3"
+        store = SqliteUserStore(path)
+        version = store.version()
+        other = sqlite3.connect(str(path))
+        other.execute(
+            "INSERT INTO users (id, username, hashed_password, created_at) VALUES ('x', 'carol', 'h', 'now')"
+        )
+        other.commit()
+        other.close()
+        assert store.version() != version
+        assert store.load()[0]["username"] == "carol"
+        store.close()
+
+
+# ---------------------------------------------------------------------------
+# UserManager on either backend
+# ---------------------------------------------------------------------------
+
+class TestUserManagerBackends:
+    def test_crud_through_manager(self, manager):
+        user = manager.create_user(UserCreate(username="alice", password="T3stP@ss!"), hashed_password=HASH)
+        with pytest.raises(ValueError):
+            manager.create_user(UserCreate(username="alice", password="T3stP@ss!"), hashed_password=HASH)
+        assert manager.update_user(user.id, UserUpdate(role="admin")).role == "admin"
+        assert manager.get_user("alice").role == "admin"
+        assert manager.reset_password(user.id, "N3wP@ssword", hashed_password="new-hash")
+        assert manager.get_user_by_id(user.id).hashed_password == "new-hash"
+        assert not manager.reset_password("missing", "N3wP@ssword")
+        assert manager.delete_user("alice")
+        assert manager.get_user("alice") is None and manager.list_users() == []
+
+    def test_default_project_can_be_cleared(self, manager):
+        user = manager.create_user(UserCreate(username="alice", password="T3stP@ss!"), hashed_password=HASH)
+        assert manager.update_user(user.id, UserUpdate(default_project_id=7)).default_project_id == 7
+        # Leaving the field out keeps it; an explicit null clears it
+        assert manager.update_user(user.id, UserUpdate(role="admin")).default_project_id == 7
+        cleared = manager.update_user(user.id, UserUpdate.model_validate({"default_project_id": None}))
+        assert cleared.default_project_id is None and cleared.role == "admin"
+        assert manager.get_user("alice").default_project_id is None
+
+    def test_writes_by_another_manager_are_picked_up(self, manager):
+        manager.create_user(UserCreate(username="alice", password="T3stP@ss!"), hashed_password=HASH)
+        other = UserManager(backend=manager.backend)
+        other.USERS_FILE, other.USERS_DB = manager.USERS_FILE, manager.USERS_DB
+        other.create_user(UserCreate(username="bob", password="T3stP@ss!"), hashed_password=HASH)
+        other.delete_user("alice")
+        other.close()
+        assert [u.username for u in manager.list_users()] == ["bob"]
+
+    def test_concurrent_creates_lose_nothing(self, manager):
+        errors = []
+
+        def create(i):
+            try:
+                manager.create_user(UserCreate(username=f"user{i:02d}", password="T3stP@ss!"), hashed_password=HASH)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=create, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(manager.list_users()) == 20
+
+    def test_concurrent_managers_on_sqlite_lose_nothing(self, tmp_path):
+        managers = []
+        for _ in range(4):
+            mgr = UserManager(backend="sqlite")
+            mgr.USERS_DB = tmp_path / "users.sqlite3"
+            managers.append(mgr)
+
+        def create(mgr, i):
+            mgr.create_user(UserCreate(username=f"user{i:02d}", password="T3stP@ss!"), hashed_password=HASH)
+
+        threads = [threading.Thread(target=create, args=(managers[i % 4], i)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert all(len(mgr.list_users()) == 20 for mgr in managers)
+        for mgr in managers:
+            mgr.close()
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            UserManager(backend="redis")
+
+
+# ---------------------------------------------------------------------------
+# users.json -> SQLite import
+# ---------------------------------------------------------------------------
+
+class TestImport:
+    def _write_json(self, path, users):
+        path.write_text(json.dumps(users), encoding="utf-8")
+
+    def test_import_is_idempotent(self, tmp_path):
+        source = tmp_path / "users.json"
+        self._write_json(source, [_raw("alice"), _raw("bob", is_active=False), {"username": "broken"}])
+        store = SqliteUserStore(tmp_path / "users.sqlite3")
+        assert tuple(import_json_users(source, store)) == (2, 0, 1)
+        assert tuple(import_json_users(source, store)) == (0, 2, 1)
+        assert {u["username"]: u["is_active"] for u in store.load()} == {"alice": True, "bob": False}
+        store.close()
+
+    def test_first_sqlite_start_imports_instead_of_bootstrapping(self, tmp_path):
+        self._write_json(tmp_path / "users.json", [_raw("alice", role="admin")])
+        mgr = UserManager(backend="sqlite")
+        mgr.USERS_FILE = tmp_path / "users.json"
+        mgr.USERS_DB = tmp_path / "users.sqlite3"
+        mgr.ensure_admin_exists()
+        assert [u.username for u in mgr.list_users()] == ["alice"]
+        mgr.close()
+
+    def test_cli_command(self, tmp_path, capsys):
+        from app import cli
+
+        source = tmp_path / "legacy.json"
+        self._write_json(source, [_raw("alice")])
+        with patch.object(UserManager, "USERS_DB", tmp_path / "users.sqlite3"):
+            assert cli.main(["import-users", "--from", str(source)]) == 0
+            assert cli.main(["import-users", "--from", str(tmp_path / "missing.json")]) == 1
+        assert "Imported 1 user(s)" in capsys.readouterr().out
+        store = SqliteUserStore(tmp_path / "users.sqlite3")
+        assert store.load()[0]["username"] == "alice"
+        store.close()
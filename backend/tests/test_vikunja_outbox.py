@@ -0,0 +1,311 @@
+"""
+Tests for the durable Vikunja outbox: SQLite queue semantics, backoff,
+idempotency keys, the background worker and the /sync + conversation
+producers.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.auth_schemas import User
+from app.models.schemas import (
+    ConversationTaskDraft,
+    ConversationTurn,
+    SaveConversationRequest,
+    TaskBase,
+)
+from app.services.conversation_manager import ConversationManager
+from app.services.vikunja_outbox import DEAD, DELIVERED, PENDING, SENDING, OutboxWorker, VikunjaOutbox
+from app.services.vikunja_service import SyncResult
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def outbox(tmp_path):
+    box = VikunjaOutbox(tmp_path / "outbox.sqlite3", max_attempts=3, backoff_base=0.0)
+    yield box
+    box.close()
+
+
+def _tasks(n):
+    return [TaskBase(title=f"Tarefa {i}") for i in range(n)]
+
+
+class FakeService:
+    """Stand-in for VikunjaService.create_tasks that records each batch."""
+
+    def __init__(self, fail_titles=(), status_code=None):
+        self.fail_titles = set(fail_titles)
+        self.status_code = status_code
+        self.batches = []
+
+    async def create_tasks(self, tasks, created_by=None, project_id=None):
+        self.batches.append((project_id, created_by, [t.title for t in tasks]))
+        return [
+            SyncResult(False, "boom", self.status_code) if t.title in self.fail_titles else SyncResult(True)
+            for t in tasks
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------------
+
+class TestVikunjaOutbox:
+    def test_enqueue_returns_ids_in_order(self, outbox):
+        ids = outbox.enqueue(_tasks(3), project_id=2, created_by="alice")
+        assert ids == sorted(ids) and len(set(ids)) == 3
+        assert outbox.stats()[PENDING] == 3
+
+    def test_idempotency_key_replay_is_noop(self, outbox):
+        first = outbox.enqueue(_tasks(2), project_id=2, idempotency_key="req-1")
+        again = outbox.enqueue(_tasks(2), project_id=2, idempotency_key="req-1")
+        assert first == again
+        assert outbox.stats()[PENDING] == 2
+
+    def test_claim_leases_entries(self, outbox):
+        outbox.enqueue(_tasks(3), project_id=2)
+        claimed = outbox.claim(2)
+        assert [e.status for e in claimed] == [SENDING, SENDING]
+        assert claimed[0].task.title == "Tarefa 0"
+        # Leased entries are not handed out twice
+        assert [e.task.title for e in outbox.claim(10)] == ["Tarefa 2"]
+
+    def test_expired_lease_is_reclaimed(self, outbox):
+        outbox.lease_seconds = 0
+        outbox.enqueue(_tasks(1), project_id=2)
+        assert len(outbox.claim(1)) == 1
+        assert len(outbox.claim(1)) == 1
+
+    def test_failures_back_off_then_die(self, outbox):
+        [entry_id] = outbox.enqueue(_tasks(1), project_id=2)
+        assert outbox.mark_failed(entry_id, "timeout") == PENDING
+        assert outbox.mark_failed(entry_id, "timeout") == PENDING
+        assert outbox.mark_failed(entry_id, "timeout") == DEAD
+        [entry] = outbox.get_many([entry_id])
+        assert entry.attempts == 3
+        assert entry.last_error == "timeout"
+
+    def test_backoff_grows_and_is_capped(self, tmp_path):
+        box = VikunjaOutbox(tmp_path / "o.sqlite3", backoff_base=2.0, backoff_max=10.0)
+        assert 1.6 <= box.backoff(1) <= 2.4
+        assert 6.4 <= box.backoff(3) <= 9.6
+        assert box.backoff(20) <= 12.0
+
+    def test_failed_entry_waits_for_backoff(self, outbox):
+        outbox.backoff_base = 60.0
+        [entry_id] = outbox.enqueue(_tasks(1), project_id=2)
+        outbox.claim(1)
+        outbox.mark_failed(entry_id, "503")
+        assert outbox.claim(1) == []
+
+    def test_survives_reopen(self, tmp_path):
+        path = tmp_path / "durable.sqlite3"
+        first = VikunjaOutbox(path)
+        first.enqueue(_tasks(2), project_id=2)
+        first.close()
+        assert VikunjaOutbox(path).stats()[PENDING] == 2
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class TestOutboxWorker:
+    @pytest.mark.asyncio
+    async def test_drain_batches_by_project_and_author(self, outbox):
+        outbox.enqueue(_tasks(2), project_id=2, created_by="alice")
+        outbox.enqueue([TaskBase(title="Outra")], project_id=7, created_by="bob")
+        service = FakeService()
+        worker = OutboxWorker(outbox, batch_size=10)
+
+        assert await worker.drain_once(service) == 3
+        assert sorted(service.batches) == [
+            (2, "alice", ["Tarefa 0", "Tarefa 1"]),
+            (7, "bob", ["Outra"]),
+        ]
+        assert outbox.stats()[DELIVERED] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_entries_are_retried(self, outbox):
+        outbox.enqueue(_tasks(2), project_id=2)
+        service = FakeService(fail_titles={"Tarefa 1"})
+        worker = OutboxWorker(outbox)
+
+        await worker.drain_once(service)
+        assert outbox.stats() == {PENDING: 1, SENDING: 0, DELIVERED: 1, DEAD: 0}
+        service.fail_titles.clear()
+        await worker.drain_once(service)
+        assert outbox.stats()[DELIVERED] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code, final", [
+        (None, False), (500, False), (503, False), (408, False), (429, False),
+        (400, True), (403, True), (404, True), (422, True),
+    ])
+    async def test_only_transient_failures_are_retried(self, outbox, status_code, final):
+        outcomes = []
+        worker = OutboxWorker(outbox)
+        worker.add_listener("conversation", lambda entry, ok, error: outcomes.append(ok))
+        outbox.enqueue([TaskBase(title="A")], project_id=2, source="conversation:c1")
+
+        await worker.drain_once(FakeService(fail_titles={"A"}, status_code=status_code))
+        if final:
+            assert outbox.stats()[DEAD] == 1 and outcomes == [False]
+        else:
+            assert outbox.stats()[PENDING] == 1 and outcomes == []
+
+    @pytest.mark.asyncio
+    async def test_listener_gets_final_outcomes(self, outbox):
+        outcomes = []
+        worker = OutboxWorker(outbox)
+        worker.add_listener("conversation", lambda entry, ok, error: outcomes.append((entry.source, ok, error)))
+        outbox.enqueue([TaskBase(title="A")], project_id=2, source="conversation:c1")
+        outbox.enqueue([TaskBase(title="B")], project_id=2, source="conversation:c2")
+        service = FakeService(fail_titles={"B"})
+
+        for _ in range(3):  # max_attempts=3, no backoff delay
+            await worker.drain_once(service)
+        assert sorted(outcomes) == [("conversation:c1", True, None), ("conversation:c2", False, "boom")]
+
+    @pytest.mark.asyncio
+    async def test_background_loop_delivers_on_enqueue(self, outbox):
+        import asyncio
+
+        service = FakeService()
+        worker = OutboxWorker(outbox, poll_seconds=30)
+        await worker.start(service)
+        try:
+            # Producers enqueue from a worker thread; the wakeup must still land
+            await asyncio.to_thread(outbox.enqueue, _tasks(1), project_id=2)
+            for _ in range(50):
+                if outbox.stats()[DELIVERED]:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await worker.stop()
+        assert outbox.stats()[DELIVERED] == 1
+
+    @pytest.mark.asyncio
+    async def test_outbox_writes_run_off_the_event_loop(self, outbox):
+        import threading
+
+        outbox.enqueue(_tasks(2), project_id=2)
+        outbox.enqueue([TaskBase(title="Falha")], project_id=2)
+        loop_thread = threading.current_thread()
+        threads = []
+
+        def record(method):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return method(*args, **kwargs)
+            return wrapper
+
+        for name in ("claim", "mark_delivered", "mark_failed"):
+            setattr(outbox, name, record(getattr(outbox, name)))
+        await OutboxWorker(outbox).drain_once(FakeService(fail_titles={"Falha"}))
+        assert len(threads) == 4
+        assert loop_thread not in threads
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ticks", [0, 1, 2, 3])
+    async def test_stop_right_after_wake_returns(self, outbox, ticks):
+        import asyncio
+
+        worker = OutboxWorker(outbox, poll_seconds=30)
+        await worker.start(FakeService())
+        await asyncio.sleep(0.01)  # let the loop reach its wait
+        worker.wake()
+        for _ in range(ticks):
+            await asyncio.sleep(0)
+        # asyncio.wait (unlike wait_for) does not cancel stop() on timeout,
+        # which would hide a worker that ignored the first cancel
+        stopping = asyncio.ensure_future(worker.stop())
+        done, _ = await asyncio.wait({stopping}, timeout=2)
+        if not done:
+            worker._stopping = True
+            worker._task.cancel()
+        assert done, "worker.stop() hung"
+
+
+# ---------------------------------------------------------------------------
+# Producers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def alice():
+    return User(id="u-alice", username="alice", hashed_password="x", role="user")
+
+
+@pytest.fixture()
+def sync_client(outbox, alice):
+    from app.core.security import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: alice
+    with patch("app.api.endpoints.batch.active_outbox", return_value=outbox):
+        yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestSyncEndpoint:
+    def test_sync_queues_and_returns_ids(self, sync_client, outbox):
+        resp = sync_client.post("/api/v1/sync", json={"tasks": [{"title": "A"}, {"title": "B"}]})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["queued"] == 2 and body["success"] == 0
+        assert [d["status"] for d in body["details"]] == ["queued", "queued"]
+        assert outbox.stats()[PENDING] == 2
+
+    def test_idempotency_key_prevents_double_queue(self, sync_client, outbox):
+        payload = {"tasks": [{"title": "A"}], "idempotency_key": "meeting-42"}
+        first = sync_client.post("/api/v1/sync", json=payload).json()
+        second = sync_client.post("/api/v1/sync", json=payload).json()
+        assert first["details"][0]["outbox_id"] == second["details"][0]["outbox_id"]
+        assert outbox.stats()[PENDING] == 1
+
+    def test_status_only_shows_own_entries(self, sync_client, outbox):
+        [mine] = sync_client.post("/api/v1/sync", json={"tasks": [{"title": "A"}]}).json()["details"]
+        [theirs] = outbox.enqueue([TaskBase(title="B")], project_id=2, created_by="bob")
+        resp = sync_client.get("/api/v1/sync/outbox", params={"ids": [mine["outbox_id"], theirs]})
+        assert [s["id"] for s in resp.json()] == [mine["outbox_id"]]
+        assert resp.json()[0]["status"] == PENDING
+
+
+class TestSaveConversationOutbox:
+    @pytest.mark.asyncio
+    async def test_conversation_sync_is_queued_then_reflected(self, outbox, tmp_path):
+        from app.services import persistence_service
+
+        request = SaveConversationRequest(
+            session_id="abcdef12-0000",
+            transcript=[ConversationTurn(role="user", content="Crie uma tarefa")],
+            task_draft=ConversationTaskDraft(title="Ligar para o fornecedor"),
+            sync_to_vikunja=True,
+        )
+        vs = MagicMock()
+        vs.create_task = AsyncMock(return_value=True)
+        with patch.object(ConversationManager, "CONVERSATIONS_DIR", tmp_path / "conversations"):
+            result = await persistence_service.save_conversation(
+                request, agent_type="live", agent_version="v1",
+                conversation_manager=ConversationManager(), vikunja_service=vs, outbox=outbox,
+            )
+            assert result.queued is True and result.synced is False
+            vs.create_task.assert_not_called()
+
+            worker = OutboxWorker(outbox)
+            worker.add_listener("conversation", persistence_service._on_outbox_result)
+            await worker.drain_once(FakeService())
+
+            record = ConversationManager().get_by_id(result.conversation_id)
+            assert record["synced_to_vikunja"] is True
+            assert record["sync_result"]["success"] is True
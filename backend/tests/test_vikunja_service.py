@@ -0,0 +1,397 @@
+"""
+Tests for VikunjaService against an in-process httpx.MockTransport.
+
+No network: every request is answered by a fake Vikunja API that records
+calls, so payloads, concurrency and rate limiting can be asserted.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.schemas import TaskBase
+from app.services.task_ledger import TaskLedger
+from app.services.vikunja_service import RateLimiter, SyncResult, VikunjaHttpPool, VikunjaService
+
+
+class FakeVikunja:
+    """Minimal Vikunja API: /user, /projects, /labels, members, task create + assign."""
+
+    def __init__(self, users=None, fail_titles=(), delay=0.0):
+        self.users = users if users is not None else [
+            {"id": 1, "username": "roque", "name": "Roquelina"},
+            {"id": 2, "username": "hankell", "name": "Hankell"},
+        ]
+        # Members of other projects; project 2 uses self.users
+        self.project_users = {7: [{"id": 5, "username": "carla", "name": "Carla Menezes"}]}
+        self.fail_titles = set(fail_titles)
+        # Titles whose PUT is applied server-side but times out for the client
+        self.timeout_titles = set()
+        # Titles whose PUT succeeds but the response carries no task id
+        self.no_id_titles = set()
+        self.created = []
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._next_id = 100
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append((request.method, request.url.path))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            path = request.url.path
+            if path.endswith("/user"):
+                return httpx.Response(200, json=self.users[0])
+            if path.endswith("/users"):
+                project_id = int(path.split("/")[-2])
+                return httpx.Response(200, json=self.project_users.get(project_id, self.users))
+            if path == "/projects":
+                return httpx.Response(200, json=[{"id": 2, "title": "Operação"}, {"id": 7, "title": "Comercial"}])
+            if path == "/labels":
+                return httpx.Response(200, json=[{"id": 1, "title": "urgente", "hex_color": "e8445a"}])
+            if path.endswith("/tasks") and request.method == "PUT":
+                body = json.loads(request.content)
+                if body["title"] in self.fail_titles:
+                    return httpx.Response(500, text="boom")
+                self._next_id += 1
+                project_id = int(path.split("/")[-2])
+                self.created.append({"id": self._next_id, "project_id": project_id, **body})
+                if body["title"] in self.timeout_titles:
+                    self.timeout_titles.discard(body["title"])
+                    raise httpx.ReadTimeout("timed out", request=request)
+                if body["title"] in self.no_id_titles:
+                    return httpx.Response(201, json=body)
+                return httpx.Response(201, json={"id": self._next_id, **body})
+            if path == "/tasks/all":
+                term = request.url.params.get("s", "")
+                return httpx.Response(200, json=[t for t in self.created if term in t["title"]])
+            if path.startswith("/tasks/") and request.method == "GET":
+                task_id = int(path.split("/")[2])
+                task = next((t for t in self.created if t["id"] == task_id), None)
+                return httpx.Response(200, json=task) if task else httpx.Response(404)
+            if path.endswith("/assignees"):
+                return httpx.Response(201, json={})
+            return httpx.Response(404)
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture()
+def fake_api(monkeypatch):
+    api = FakeVikunja()
+    transport = httpx.MockTransport(api.handler)
+    monkeypatch.setattr(
+        "app.services.vikunja_service.httpx.AsyncClient",
+        partial(httpx.AsyncClient, transport=transport),
+    )
+    return api
+
+
+@pytest.fixture()
+def service(tmp_path):
+    svc = VikunjaService(pool=VikunjaHttpPool(), ledger=TaskLedger(tmp_path / "ledger.sqlite3"))
+    svc.rate_limiter = RateLimiter(0)
+    return svc
+
+
+# ---------------------------------------------------------------------------
+# Single task creation
+# ---------------------------------------------------------------------------
+
+class TestCreateTask:
+    @pytest.mark.asyncio
+    async def test_create_and_assign(self, service, fake_api):
+        ok = await service.create_task(TaskBase(title="Enviar cotação", assignee_name="Roquelina"), created_by="alice")
+        assert ok is True
+        assert ("PUT", "/projects/2/tasks") in fake_api.calls
+        assert any(path.endswith("/assignees") for _, path in fake_api.calls)
+
+    @pytest.mark.asyncio
+    async def test_api_error_returns_false(self, service, fake_api):
+        fake_api.fail_titles.add("Quebrada")
+        assert await service.create_task(TaskBase(title="Quebrada")) is False
+
+
+# ---------------------------------------------------------------------------
+# Bulk sync
+# ---------------------------------------------------------------------------
+
+class TestCreateTasks:
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, service, fake_api):
+        fake_api.fail_titles.add("T2")
+        tasks = [TaskBase(title=f"T{i}") for i in range(5)]
+        results = await service.create_tasks(tasks)
+        assert [r.ok for r in results] == [True, True, False, True, True]
+        assert results[2] == SyncResult(False, "Failed to create task (HTTP 500)", 500)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, service, fake_api):
+        fake_api.delay = 0.01
+        service.sync_concurrency = 3
+        results = await service.create_tasks([TaskBase(title=f"T{i}") for i in range(10)])
+        assert all(r.ok for r in results)
+        assert 1 < fake_api.peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_users_fetched_once(self, service, fake_api):
+        tasks = [TaskBase(title=f"T{i}", assignee_name="Hankell") for i in range(6)]
+        await service.create_tasks(tasks)
+        assert sum(1 for _, path in fake_api.calls if path.endswith("/users")) == 1
+        assert sum(1 for _, path in fake_api.calls if path.endswith("/assignees")) == 6
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_spaces_requests(self):
+        limiter = RateLimiter(50)  # 20 ms apart
+        start = time.monotonic()
+        await asyncio.gather(*[limiter.acquire() for _ in range(4)])
+        assert time.monotonic() - start >= 0.055
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        limiter = RateLimiter(0)
+        with patch.object(asyncio, "sleep", AsyncMock()) as sleep:
+            await asyncio.gather(*[limiter.acquire() for _ in range(100)])
+        sleep.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP pool
+# ---------------------------------------------------------------------------
+
+class TestVikunjaHttpPool:
+    @pytest.mark.asyncio
+    async def test_open_pool_reuses_one_client(self, service, fake_api):
+        await service.pool.start()
+        try:
+            async with service.pool.session() as first:
+                pass
+            async with service.pool.session() as second:
+                pass
+            assert first is second
+            await service.create_tasks([TaskBase(title=f"T{i}") for i in range(3)])
+            stats = service.pool.stats()
+            assert stats.open is True
+            assert stats.ephemeral_clients == 0
+            assert stats.requests_total == 3
+            assert stats.requests_in_flight == 0
+        finally:
+            await service.pool.aclose()
+        assert service.pool.stats().open is False
+
+    @pytest.mark.asyncio
+    async def test_closed_pool_falls_back_to_ephemeral_client(self, service, fake_api):
+        assert await service.create_task(TaskBase(title="Avulsa")) is True
+        assert service.pool.stats().ephemeral_clients == 1
+
+    def test_limits_are_configurable(self):
+        pool = VikunjaHttpPool(max_connections=7, max_keepalive_connections=3)
+        stats = pool.stats()
+        assert stats.max_connections == 7
+        assert stats.max_keepalive_connections == 3
+
+
+# ---------------------------------------------------------------------------
+# Batch assignee resolution
+# ---------------------------------------------------------------------------
+
+class TestResolveAssignees:
+    @pytest.mark.asyncio
+    async def test_distinct_names_resolved_once(self, service, fake_api, monkeypatch):
+        from app.services.user_directory import UserIndex
+
+        scored = []
+        original = UserIndex.resolve
+        monkeypatch.setattr(UserIndex, "resolve", lambda self, name: scored.append(name) or original(self, name))
+
+        tasks = [TaskBase(title=f"T{i}", assignee_name=n) for i, n in enumerate(["Roque", "Hankell", "roque"] * 10)]
+        results = await service.create_tasks(tasks)
+
+        assert all(r.ok for r in results)
+        assert sorted(scored) == ["hankell", "roque"]
+        assert sum(1 for _, path in fake_api.calls if path.endswith("/assignees")) == 30
+
+    @pytest.mark.asyncio
+    async def test_memo_survives_across_syncs(self, service, fake_api):
+        first = await service.resolve_assignees(["Roquelina", "Fulano"])
+        assert first == {"Roquelina": 1, "Fulano": None}
+        hits_before = service.project().assignee_cache.hits
+        again = await service.resolve_assignees(["roquelina", "Fulano"])
+        assert again == {"roquelina": 1, "Fulano": None}
+        assert service.project().assignee_cache.hits == hits_before + 2
+
+    @pytest.mark.asyncio
+    async def test_directory_reload_invalidates_memo(self, service, fake_api):
+        assert (await service.resolve_assignees(["Beatriz"]))["Beatriz"] is None
+        fake_api.users.append({"id": 3, "username": "bia", "name": "Beatriz"})
+        service.project().user_directory.invalidate()
+        await service.project().user_directory.refresh()
+        assert (await service.resolve_assignees(["Beatriz"]))["Beatriz"] == 3
+
+
+# ---------------------------------------------------------------------------
+# Multi-project targeting
+# ---------------------------------------------------------------------------
+
+class TestMultiProject:
+    @pytest.mark.asyncio
+    async def test_tasks_go_to_requested_project(self, service, fake_api):
+        await service.create_tasks([TaskBase(title="Proposta")], project_id=7)
+        assert ("PUT", "/projects/7/tasks") in fake_api.calls
+
+    @pytest.mark.asyncio
+    async def test_members_are_partitioned_by_project(self, service, fake_api):
+        assert (await service.resolve_assignees(["Carla"], project_id=7))["Carla"] == 5
+        assert (await service.resolve_assignees(["Carla"], project_id=2))["Carla"] is None
+        assert service.project(7) is not service.project(2)
+
+    @pytest.mark.asyncio
+    async def test_self_user_fetched_once_across_projects(self, service, fake_api):
+        await service.resolve_assignees(["Roque"], project_id=2)
+        await service.resolve_assignees(["Roque"], project_id=7)
+        assert fake_api.calls.count(("GET", "/user")) == 1
+        assert fake_api.calls.count(("GET", "/projects/2/users")) == 1
+        assert fake_api.calls.count(("GET", "/projects/7/users")) == 1
+
+    @pytest.mark.asyncio
+    async def test_project_and_label_lists_are_cached(self, service, fake_api):
+        for _ in range(3):
+            projects = await service.list_projects()
+            labels = await service.list_labels()
+        assert [p["id"] for p in projects] == [2, 7]
+        assert labels[0]["title"] == "urgente"
+        assert fake_api.calls.count(("GET", "/projects")) == 1
+        assert fake_api.calls.count(("GET", "/labels")) == 1
+
+    def test_select_project_id_precedence(self):
+        from app.core.config import settings
+        from app.services.vikunja_service import select_project_id
+
+        assert select_project_id(9, 7) == 9
+        assert select_project_id(None, 7) == 7
+        assert select_project_id() == settings.VIKUNJA_DEFAULT_PROJECT_ID
+
+
+# ---------------------------------------------------------------------------
+# Idempotent creation
+# ---------------------------------------------------------------------------
+
+def _puts(api):
+    return [c for c in api.calls if c[0] == "PUT" and c[1].endswith("/tasks")]
+
+
+class TestIdempotentCreate:
+    @pytest.mark.asyncio
+    async def test_resync_skips_created_tasks(self, service, fake_api):
+        tasks = [TaskBase(title="Enviar cotação", assignee_name="Roque"), TaskBase(title="Revisar contrato")]
+        await service.create_tasks(tasks)
+        results = await service.create_tasks(tasks)
+        assert all(r.ok for r in results)
+        assert len(_puts(fake_api)) == 2
+        assert service.ledger.skipped == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicates_within_one_batch_create_once(self, service, fake_api):
+        fake_api.delay = 0.01
+        results = await service.create_tasks([TaskBase(title="Mesma tarefa")] * 4)
+        assert all(r.ok for r in results)
+        assert len(_puts(fake_api)) == 1
+
+    @pytest.mark.asyncio
+    async def test_other_project_is_a_different_task(self, service, fake_api):
+        task = TaskBase(title="Kickoff")
+        await service.create_task(task, project_id=2)
+        await service.create_task(task, project_id=7)
+        assert len(_puts(fake_api)) == 2
+
+    @pytest.mark.asyncio
+    async def test_definite_failure_is_retried(self, service, fake_api):
+        fake_api.fail_titles.add("Instável")
+        assert await service.create_task(TaskBase(title="Instável")) is False
+        fake_api.fail_titles.clear()
+        assert await service.create_task(TaskBase(title="Instável")) is True
+        assert len(_puts(fake_api)) == 2
+
+    @pytest.mark.asyncio
+    async def test_timed_out_put_is_reconciled_not_repeated(self, service, fake_api):
+        fake_api.timeout_titles.add("Lenta")
+        assert await service.create_task(TaskBase(title="Lenta")) is False
+        # The task exists server-side; the retry finds it instead of creating another
+        assert await service.create_task(TaskBase(title="Lenta")) is True
+        assert len(_puts(fake_api)) == 1
+        assert ("GET", "/tasks/all") in fake_api.calls
+
+    @pytest.mark.asyncio
+    async def test_same_task_from_another_author_is_created(self, service, fake_api):
+        task = TaskBase(title="Kickoff")
+        assert await service.create_task(task, created_by="alice")
+        assert await service.create_task(task, created_by="bob")
+        assert await service.create_task(task, created_by="alice")
+        assert len(_puts(fake_api)) == 2
+
+    @pytest.mark.asyncio
+    async def test_task_deleted_in_vikunja_is_created_again(self, service, fake_api):
+        task = TaskBase(title="Apagada")
+        assert await service.create_task(task)
+        fake_api.created.clear()
+        assert await service.create_task(task)
+        assert len(_puts(fake_api)) == 2
+        # And the new one is remembered again
+        assert await service.create_task(task)
+        assert len(_puts(fake_api)) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_task_id_releases_the_entry(self, service, fake_api):
+        fake_api.no_id_titles.add("Sem id")
+        assert await service.create_task(TaskBase(title="Sem id")) is False
+        fingerprint = TaskLedger.fingerprint(TaskBase(title="Sem id"), service.project_id)
+        assert service.ledger.get(fingerprint) is None
+
+    @pytest.mark.asyncio
+    async def test_ledger_runs_off_the_event_loop(self, service, fake_api):
+        import threading
+
+        threads = set()
+        original = service.ledger.get
+
+        def recording_get(fingerprint):
+            threads.add(threading.current_thread() is threading.main_thread())
+            return original(fingerprint)
+
+        service.ledger.get = recording_get
+        await service.create_task(TaskBase(title="Thread"))
+        assert threads == {False}
+
+    def test_entries_expire_after_ttl(self, tmp_path):
+        ledger = TaskLedger(tmp_path / "ledger.sqlite3", ttl_seconds=60)
+        ledger.mark_created("fp", 2, "Velha", 1)
+        assert ledger.get("fp") is not None
+        ledger._connect().execute("UPDATE task_fingerprints SET updated_at = updated_at - 120")
+        assert ledger.get("fp") is None
+        ledger.close()
+        # Pruned when the ledger is reopened
+        reopened = TaskLedger(tmp_path / "ledger.sqlite3", ttl_seconds=60)
+        assert reopened._connect().execute("SELECT COUNT(*) FROM task_fingerprints").fetchone()[0] == 0
+        reopened.close()
+
+    def test_fingerprint_ignores_whitespace_and_case(self):
+        a = TaskLedger.fingerprint(TaskBase(title="Enviar  Cotação", assignee_name="Roque"), 2)
+        b = TaskLedger.fingerprint(TaskBase(title="enviar cotação", assignee_name="roque", assignee_id=1), 2)
+        assert a == b
+        assert a != TaskLedger.fingerprint(TaskBase(title="Enviar Cotação", assignee_name="Roque"), 7)
+        assert a != TaskLedger.fingerprint(TaskBase(title="Enviar Cotação", assignee_name="Roque"), 2, "alice")
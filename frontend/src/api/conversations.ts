@@ -1,10 +1,10 @@
 import client from './client';
-import type { ConversationSummary, ConversationDetail } from '../types/schema';
+import type { ConversationSummary, ConversationDetail, ListParams, Page } from '../types/schema';
 
 export const conversationsApi = {
-    list: async (): Promise<ConversationSummary[]> => {
-        const response = await client.get<ConversationSummary[]>('/conversations');
-        return response.data;
+    list: async (params: ListParams = {}): Promise<Page<ConversationSummary>> => {
+        const response = await client.get<ConversationSummary[]>('/conversations', { params });
+        return { items: response.data, nextCursor: response.headers['x-next-cursor'] ?? null };
     },
 
     getById: async (id: string): Promise<ConversationDetail> => {
@@ -1,10 +1,10 @@
 import client from './client';
-import type { HistorySummary, HistoryDetail } from '../types/schema';
+import type { HistorySummary, HistoryDetail, ListParams, Page } from '../types/schema';
 
 export const historyApi = {
-    list: async (): Promise<HistorySummary[]> => {
-        const response = await client.get<HistorySummary[]>('/history');
-        return response.data;
+    list: async (params: ListParams = {}): Promise<Page<HistorySummary>> => {
+        const response = await client.get<HistorySummary[]>('/history', { params });
+        return { items: response.data, nextCursor: response.headers['x-next-cursor'] ?? null };
     },
     getById: async (id: string): Promise<HistoryDetail> => {
         const response = await client.get<HistoryDetail>(`/history/${id}`);
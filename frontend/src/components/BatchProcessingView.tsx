@@ -45,7 +45,9 @@ export function BatchProcessingView() {
                         <div className="space-y-2">
                             <h2 className="text-2xl font-bold">Sync Complete!</h2>
                             <p className="text-muted-foreground">
-                                Successfully synced {syncResult.success} tasks to Vikunja.
+                                {syncResult.queued
+                                    ? `Queued ${syncResult.queued} tasks for delivery to Vikunja.`
+                                    : `Successfully synced ${syncResult.success} tasks to Vikunja.`}
                             </p>
                         </div>
                         <Button onClick={() => reset()} className="mt-4">
@@ -1,4 +1,4 @@
-import { useEffect, useMemo } from 'react';
+import { useEffect } from 'react';
 import { useConversationStore } from '../../store/useConversationStore';
 import { ScrollArea } from '../ui/scroll-area';
 import { Badge } from '../ui/badge';
@@ -7,30 +7,19 @@ import { Button } from '../ui/button';
 import { cn } from '../../lib/utils';
 import { Search, MessageSquare, Mic, AudioWaveform, CheckCircle2, Loader2 } from 'lucide-react';
 
+const SEARCH_DEBOUNCE_MS = 300;
+
 export function ConversationList() {
     const {
-        items, status, error, searchQuery, filterAgent, selectedDetail,
-        fetchList, fetchDetail, setSearchQuery, setFilterAgent,
+        items, status, error, searchQuery, filterAgent, selectedDetail, nextCursor, loadingMore,
+        fetchList, loadMore, fetchDetail, setSearchQuery, setFilterAgent,
     } = useConversationStore();
 
+    // Search and agent filter run on the server; wait for a pause in typing before refetching
     useEffect(() => {
-        fetchList();
-    }, [fetchList]);
-
-    const filtered = useMemo(() => {
-        let result = items;
-        if (filterAgent !== 'all') {
-            result = result.filter(i => i.agent_type === filterAgent);
-        }
-        if (searchQuery.trim()) {
-            const q = searchQuery.toLowerCase();
-            result = result.filter(i =>
-                (i.task_title?.toLowerCase().includes(q)) ||
-                i.id.toLowerCase().includes(q)
-            );
-        }
-        return result;
-    }, [items, filterAgent, searchQuery]);
+        const timer = setTimeout(fetchList, searchQuery ? SEARCH_DEBOUNCE_MS : 0);
+        return () => clearTimeout(timer);
+    }, [fetchList, searchQuery, filterAgent]);
 
     const formatDate = (ts: string) => {
         try {
@@ -79,14 +68,14 @@ export function ConversationList() {
                     <div className="p-4 text-sm text-red-500">{error}</div>
                 )}
 
-                {status === 'idle' && filtered.length === 0 && (
+                {status === 'idle' && items.length === 0 && (
                     <div className="flex flex-col items-center justify-center py-16 text-gray-400 gap-2">
                         <MessageSquare className="w-8 h-8 opacity-40" />
                         <p className="text-sm">Nenhum diálogo encontrado.</p>
                     </div>
                 )}
 
-                {filtered.map((item) => (
+                {items.map((item) => (
                     <button
                         key={item.id}
                         onClick={() => fetchDetail(item.id)}
@@ -128,6 +117,15 @@ export function ConversationList() {
                         </p>
                     </button>
                 ))}
+
+                {status === 'idle' && nextCursor && (
+                    <div className="p-3 flex justify-center">
+                        <Button variant="ghost" size="sm" className="h-8 text-xs" onClick={loadMore} disabled={loadingMore}>
+                            {loadingMore && <Loader2 className="w-3.5 h-3.5 mr-1.5 animate-spin" />}
+                            Carregar mais
+                        </Button>
+                    </div>
+                )}
             </ScrollArea>
         </div>
     );
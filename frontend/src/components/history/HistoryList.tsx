@@ -3,10 +3,13 @@ import { useHistoryStore } from '../../store/useHistoryStore';
 import { Input } from '../ui/input';
 import { Badge } from '../ui/badge';
 import { ScrollArea } from '../ui/scroll-area';
+import { Button } from '../ui/button';
 import { cn } from '../../lib/utils';
 import { FileText, Files, Search, Loader2, AlertCircle } from 'lucide-react';
 import type { HistorySummary } from '../../types/schema';
 
+const SEARCH_DEBOUNCE_MS = 300;
+
 export function HistoryList() {
     const {
         items,
@@ -14,24 +17,19 @@ export function HistoryList() {
         error,
         searchQuery,
         selectedDetail,
+        nextCursor,
+        loadingMore,
         fetchList,
+        loadMore,
         fetchDetail,
         setSearchQuery,
     } = useHistoryStore();
 
+    // Search runs on the server; wait for a pause in typing before refetching
     useEffect(() => {
-        fetchList();
-    }, [fetchList]);
-
-    const filtered = items.filter((item) => {
-        if (!searchQuery.trim()) return true;
-        const q = searchQuery.toLowerCase();
-        return (
-            item.id.toLowerCase().includes(q) ||
-            item.source_files.some((f) => f.toLowerCase().includes(q)) ||
-            item.timestamp.toLowerCase().includes(q)
-        );
-    });
+        const timer = setTimeout(fetchList, searchQuery ? SEARCH_DEBOUNCE_MS : 0);
+        return () => clearTimeout(timer);
+    }, [fetchList, searchQuery]);
 
     const formatDate = (iso: string) => {
         try {
@@ -53,14 +51,6 @@ export function HistoryList() {
         return item.source_files[0] || 'Arquivo desconhecido';
     };
 
-    if (status === 'loading') {
-        return (
-            <div className="flex items-center justify-center h-full">
-                <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
-            </div>
-        );
-    }
-
     if (status === 'error') {
         return (
             <div className="flex flex-col items-center justify-center h-full gap-2 text-destructive px-4">
@@ -85,7 +75,11 @@ export function HistoryList() {
             </div>
 
             <ScrollArea className="flex-1">
-                {filtered.length === 0 ? (
+                {status === 'loading' ? (
+                    <div className="flex items-center justify-center py-16">
+                        <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
+                    </div>
+                ) : items.length === 0 ? (
                     <div className="flex flex-col items-center justify-center py-16 px-4 text-center">
                         <FileText className="h-10 w-10 text-muted-foreground/40 mb-3" />
                         <p className="text-sm text-muted-foreground">
@@ -96,7 +90,7 @@ export function HistoryList() {
                     </div>
                 ) : (
                     <div className="flex flex-col">
-                        {filtered.map((item) => {
+                        {items.map((item) => {
                             const isActive = selectedDetail?.id === item.id;
                             return (
                                 <button
@@ -141,6 +135,14 @@ export function HistoryList() {
                         })}
                     </div>
                 )}
+                {status === 'idle' && nextCursor && (
+                    <div className="p-3 flex justify-center">
+                        <Button variant="ghost" size="sm" onClick={loadMore} disabled={loadingMore}>
+                            {loadingMore && <Loader2 className="h-4 w-4 mr-2 animate-spin" />}
+                            Carregar mais
+                        </Button>
+                    </div>
+                )}
             </ScrollArea>
         </div>
     );
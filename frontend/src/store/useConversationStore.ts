@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import type { ConversationSummary, ConversationDetail } from '../types/schema';
+import type { ConversationSummary, ConversationDetail, ListParams } from '../types/schema';
 import { conversationsApi } from '../api/conversations';
 
 interface ConversationState {
@@ -9,29 +9,45 @@ interface ConversationState {
     detailLoading: boolean;
     error: string | null;
     searchQuery: string;
+    nextCursor: string | null;
+    loadingMore: boolean;
     filterAgent: 'all' | 'live' | 'standard';
 
     fetchList: () => Promise<void>;
+    loadMore: () => Promise<void>;
     fetchDetail: (id: string) => Promise<void>;
     setSearchQuery: (query: string) => void;
     setFilterAgent: (filter: 'all' | 'live' | 'standard') => void;
     clearSelection: () => void;
 }
 
-export const useConversationStore = create<ConversationState>((set) => ({
+// Server-side list filters; a response for older filters is dropped
+const listFilters = (state: ConversationState): ListParams => ({
+    q: state.searchQuery.trim() || undefined,
+    agent_type: state.filterAgent === 'all' ? undefined : state.filterAgent,
+});
+
+const sameFilters = (a: ListParams, b: ListParams) => a.q === b.q && a.agent_type === b.agent_type;
+
+export const useConversationStore = create<ConversationState>((set, get) => ({
     status: 'idle',
     items: [],
     selectedDetail: null,
     detailLoading: false,
     error: null,
     searchQuery: '',
+    nextCursor: null,
+    loadingMore: false,
     filterAgent: 'all',
 
     fetchList: async () => {
         set({ status: 'loading', error: null });
         try {
-            const items = await conversationsApi.list();
-            set({ items, status: 'idle' });
+            const filters = listFilters(get());
+            const page = await conversationsApi.list(filters);
+            // A newer search went out while this one was in flight
+            if (!sameFilters(listFilters(get()), filters)) return;
+            set({ items: page.items, nextCursor: page.nextCursor, status: 'idle' });
         } catch (err: any) {
             set({
                 status: 'error',
@@ -40,6 +56,30 @@ export const useConversationStore = create<ConversationState>((set) => ({
         }
     },
 
+    loadMore: async () => {
+        const { nextCursor, loadingMore } = get();
+        if (!nextCursor || loadingMore) return;
+        set({ loadingMore: true });
+        try {
+            const filters = listFilters(get());
+            const page = await conversationsApi.list({ ...filters, cursor: nextCursor });
+            if (!sameFilters(listFilters(get()), filters)) {
+                set({ loadingMore: false });
+                return;
+            }
+            set((state) => ({
+                items: [...state.items, ...page.items],
+                nextCursor: page.nextCursor,
+                loadingMore: false,
+            }));
+        } catch (err: any) {
+            set({
+                loadingMore: false,
+                error: err?.response?.data?.detail || err.message || 'Falha ao carregar diálogos',
+            });
+        }
+    },
+
     fetchDetail: async (id: string) => {
         set({ detailLoading: true, error: null });
         try {
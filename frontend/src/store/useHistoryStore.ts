@@ -9,26 +9,34 @@ interface HistoryState {
     detailLoading: boolean;
     error: string | null;
     searchQuery: string;
+    nextCursor: string | null;
+    loadingMore: boolean;
 
     fetchList: () => Promise<void>;
+    loadMore: () => Promise<void>;
     fetchDetail: (id: string) => Promise<void>;
     setSearchQuery: (query: string) => void;
     clearSelection: () => void;
 }
 
-export const useHistoryStore = create<HistoryState>((set) => ({
+export const useHistoryStore = create<HistoryState>((set, get) => ({
     status: 'idle',
     items: [],
     selectedDetail: null,
     detailLoading: false,
     error: null,
     searchQuery: '',
+    nextCursor: null,
+    loadingMore: false,
 
     fetchList: async () => {
         set({ status: 'loading', error: null });
         try {
-            const items = await historyApi.list();
-            set({ items, status: 'idle' });
+            const q = get().searchQuery.trim() || undefined;
+            const page = await historyApi.list({ q });
+            // A newer search went out while this one was in flight
+            if ((get().searchQuery.trim() || undefined) !== q) return;
+            set({ items: page.items, nextCursor: page.nextCursor, status: 'idle' });
         } catch (err: any) {
             set({
                 status: 'error',
@@ -37,6 +45,29 @@ export const useHistoryStore = create<HistoryState>((set) => ({
         }
     },
 
+    loadMore: async () => {
+        const { nextCursor, loadingMore, searchQuery } = get();
+        if (!nextCursor || loadingMore) return;
+        set({ loadingMore: true });
+        try {
+            const page = await historyApi.list({ cursor: nextCursor, q: searchQuery.trim() || undefined });
+            if (get().searchQuery !== searchQuery) {
+                set({ loadingMore: false });
+                return;
+            }
+            set((state) => ({
+                items: [...state.items, ...page.items],
+                nextCursor: page.nextCursor,
+                loadingMore: false,
+            }));
+        } catch (err: any) {
+            set({
+                loadingMore: false,
+                error: err?.response?.data?.detail || err.message || 'Failed to load history',
+            });
+        }
+    },
+
     fetchDetail: async (id: string) => {
         set({ detailLoading: true, error: null });
         try {
@@ -310,12 +310,14 @@ export const useLiveStore = create<LiveStoreState>((set, get) => ({
         const msg = syncToVikunja
           ? (result.synced
               ? 'Tarefa criada e diálogo salvo com sucesso!'
-              : `Diálogo salvo, mas erro ao sincronizar: ${result.sync_error}`)
+              : result.queued
+                ? 'Diálogo salvo; a tarefa foi enfileirada para o Vikunja.'
+                : `Diálogo salvo, mas erro ao sincronizar: ${result.sync_error}`)
           : 'Diálogo salvo com sucesso!';
         set((state) => ({
           messages: [...state.messages, { role: 'agent', content: msg }],
         }));
-        if (syncToVikunja && result.synced) {
+        if (syncToVikunja && (result.synced || result.queued)) {
           get().resetCurrentTask();
         }
       } else {
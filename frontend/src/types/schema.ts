@@ -6,6 +6,7 @@ export interface UserPublic {
     role: 'admin' | 'user';
     created_at: string;
     is_active: boolean;
+    default_project_id?: number | null;
 }
 
 export interface LoginResponse {
@@ -25,6 +26,7 @@ export interface UserCreate {
 export interface UserUpdate {
     role?: 'admin' | 'user';
     is_active?: boolean;
+    default_project_id?: number | null; // null clears it
 }
 
 export interface PasswordReset {
@@ -39,6 +41,25 @@ export interface Task {
     assignee_id: number | null;   // Resolved Vikunja User ID
     priority: number;             // 1-5
     due_date: string | null;      // ISO Date "YYYY-MM-DD"
+    source_timestamp?: string | null; // Transcript offset "HH:MM:SS" (subtitle uploads)
+}
+
+// Matches ChunkReport (map-reduce analysis of long transcripts)
+export interface ChunkReport {
+    index: number;
+    token_count: number;
+    processing_time: number;
+    task_count: number;
+}
+
+// Matches CompressionReport (deterministic pre-LLM transcript clean-up)
+export interface CompressionReport {
+    tokens_before: number;
+    tokens_after: number;
+    tokens_saved: number;
+    fillers_removed: number;
+    fragments_collapsed: number;
+    duplicate_lines_removed: number;
 }
 
 // Matches AnalysisResponse
@@ -48,13 +69,17 @@ export interface AnalysisResponse {
     processing_time: number;
     file_count?: number;
     file_names?: string[];
+    chunks?: ChunkReport[];
+    compression?: CompressionReport | null;
+    cached?: boolean;
 }
 
 // Matches Vikunja Sync Response
 export interface SyncDetail {
     title: string;
-    status: 'success' | 'error';
+    status: 'success' | 'error' | 'queued';
     error?: string;
+    outbox_id?: number | null;
 }
 
 export interface SyncResponse {
@@ -62,6 +87,28 @@ export interface SyncResponse {
     success: number;
     failed: number;
     details: SyncDetail[];
+    project_id?: number | null;
+    queued?: number;
+}
+
+export interface OutboxStatus {
+    id: number;
+    title: string;
+    status: 'pending' | 'sending' | 'delivered' | 'dead';
+    attempts: number;
+    last_error?: string | null;
+}
+
+export interface VikunjaProject {
+    id: number;
+    title: string;
+    description?: string | null;
+}
+
+export interface VikunjaLabel {
+    id: number;
+    title: string;
+    hex_color?: string | null;
 }
 
 export interface VoiceState {
@@ -93,6 +140,24 @@ export interface HistorySummary {
     model_used: string;
 }
 
+// --- Paginated listings (/history, /conversations) ---
+
+export interface ListParams {
+    limit?: number;
+    cursor?: string;
+    since?: string;
+    until?: string;
+    q?: string;
+    agent_type?: 'live' | 'standard'; // conversations only
+    order?: 'desc' | 'asc';
+    owner_id?: string;
+}
+
+export interface Page<T> {
+    items: T[];
+    nextCursor: string | null;  // from the X-Next-Cursor response header
+}
+
 // --- Save Conversation Models (shared by Standard + Live agents) ---
 
 export interface SaveConversationRequest {
@@ -106,6 +171,7 @@ export interface SaveConversationRequest {
         priority: number;
     };
     sync_to_vikunja: boolean;
+    project_id?: number | null;
 }
 
 export interface SaveConversationResponse {
@@ -113,6 +179,7 @@ export interface SaveConversationResponse {
     saved: boolean;
     synced: boolean;
     sync_error: string | null;
+    queued?: boolean;
 }
 
 // --- Conversation Viewer Models ---